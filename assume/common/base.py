@@ -9,7 +9,7 @@ from typing import TypedDict
 import numpy as np
 import pandas as pd
 
-from assume.common.fast_pandas import FastSeries, TensorFastSeries
+from assume.common.fast_pandas import FastIndex, FastSeries, TensorFastSeries
 from assume.common.forecasts import Forecaster
 from assume.common.market_objects import MarketConfig, Orderbook, Product
 
@@ -18,6 +18,63 @@ class BaseStrategy:
     pass
 
 
+class OutputBlock:
+    """
+    Preallocated storage of the output series of a group of units with the same index.
+
+    For every output name one array with a row per unit is allocated when the output
+    is used for the first time. The output series of the units are views on these rows,
+    which avoids allocating a separate array per unit and output.
+
+    Args:
+        index (FastIndex): The index shared by all units of the block.
+        size (int): The number of units in the block.
+    """
+
+    def __init__(self, index: FastIndex, size: int):
+        self.index = index
+        self.size = size
+        self.arrays: dict[str, np.ndarray] = {}
+
+    def series(self, name: str, row: int) -> FastSeries:
+        """
+        Returns the output series of a unit as view on the row of the block.
+
+        Args:
+            name (str): The name of the output.
+            row (int): The row of the unit in the block.
+
+        Returns:
+            FastSeries: The output series of the unit.
+        """
+        if name not in self.arrays:
+            self.arrays[name] = np.zeros((self.size, len(self.index)), dtype=np.float64)
+        return FastSeries.from_array(self.index, self.arrays[name][row], name)
+
+
+class UnitOutputs(dict):
+    """
+    The outputs of a unit, missing outputs are taken from the unit's row of an OutputBlock.
+
+    It behaves like the defaultdict of FastSeries which units create by default.
+
+    Args:
+        block (OutputBlock): The block containing the outputs of the unit.
+        row (int): The row of the unit in the block.
+        outputs (dict, optional): Outputs already created by the unit. Defaults to None.
+    """
+
+    def __init__(self, block: OutputBlock, row: int, outputs: dict | None = None):
+        super().__init__(outputs or {})
+        self.block = block
+        self.row = row
+
+    def __missing__(self, key: str) -> FastSeries:
+        series = self.block.series(key, self.row)
+        self[key] = series
+        return series
+
+
 class BaseUnit:
     """
     A base class for a unit. This class is used as a foundation for all units.
@@ -62,6 +119,12 @@ class BaseUnit:
         self.avg_op_time = 0
         self.total_op_time = 0
 
+        self.init_learning_outputs()
+
+    def init_learning_outputs(self) -> None:
+        """
+        Creates the outputs of the learning strategies if any bidding strategy is a learning strategy.
+        """
         # some data is stored as series to allow to store it in the outputs
         # check if any bidding strategy is using the RL strategy
         if any(
@@ -81,6 +144,25 @@ class BaseUnit:
             self.outputs["rl_actions"] = []
             self.outputs["rl_rewards"] = []
 
+    def reset(self) -> None:
+        """
+        Resets the unit to its initial state for a new episode of the same simulation.
+
+        The output series are zeroed in place, so that references to them stay valid.
+        The forecaster, the index and all technical parameters are reused as they are.
+        The outputs of learning strategies are created again for the current bidding strategies.
+        """
+        for output in self.outputs.values():
+            if isinstance(output, FastSeries) and not isinstance(
+                output, TensorFastSeries
+            ):
+                output.data[:] = 0.0
+
+        self.avg_op_time = 0
+        self.total_op_time = 0
+
+        self.init_learning_outputs()
+
     def calculate_bids(
         self,
         market_config: MarketConfig,
@@ -856,3 +938,5 @@ class LearningConfig(TypedDict):
     trained_policies_load_path: str
     early_stopping_steps: int
     early_stopping_threshold: float
+    parallel_environments: int
+    parallel_environments_seed: int
@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import heapq
+import logging
+
+from mango import sender_addr
+from mango.util.clock import ExternalClock
+from mango.util.distributed_clock import DistributedClockAgent, DistributedClockManager
+
+logger = logging.getLogger(__name__)
+
+
+class FastForwardClock(ExternalClock):
+    """
+    An external clock which skips timestamps nobody is waiting for anymore.
+
+    Futures of cancelled or already finished sleeps stay in the list of the ExternalClock
+    and would make the simulation step through timestamps without any scheduled task.
+    These are dropped, so that the clock jumps directly to the next timestamp at which
+    a task is still waiting.
+    """
+
+    def get_next_activity(self) -> float:
+        # the futures are a heap, popping anything else breaks the order of the wake ups
+        while self._futures and self._futures[0][1].done():
+            heapq.heappop(self._futures)
+        return super().get_next_activity()
+
+
+class AcknowledgingClockAgent(DistributedClockAgent):
+    """
+    A distributed clock agent which acknowledges every new time explicitly.
+
+    After the time is set, the agent waits until all tasks of its container are done
+    and answers with its next activity. The manager therefore knows when a step is
+    executed completely and does not need to sleep or request the next event separately.
+    """
+
+    def handle_message(self, content, meta):
+        if not isinstance(content, int | float) or isinstance(content, bool):
+            return super().handle_message(content, meta)
+
+        self.scheduler.clock.set_time(content)
+        sender = sender_addr(meta)
+
+        async def acknowledge():
+            # let the tasks woken up by the new time start before waiting for them
+            await asyncio.sleep(0)
+            await self.wait_all_done()
+            if self.stopped.done():
+                return
+            next_time = self.scheduler.clock.get_next_activity()
+            await self.send_message(next_time, sender)
+
+        self.schedule_instant_task(acknowledge())
+
+
+class AcknowledgingClockManager(DistributedClockManager):
+    """
+    A distributed clock manager which waits for the acknowledgements of the clock agents.
+
+    The new time is sent to all :class:`AcknowledgingClockAgent` which answer once their
+    step is done, together with their next activity. This replaces the separate request
+    for the next event and any fixed sleep between the steps.
+    """
+
+    async def distribute_time(self, time=None):
+        """
+        Sends the current time to all clock agents and waits for their acknowledgements.
+
+        Args:
+            time (number, optional): The time which is set. Defaults to the time of the clock.
+
+        Returns:
+            number: The time at which the next event happens.
+        """
+        await self.wait_all_done()
+        if time is not None:
+            await self.send_current_time(time)
+            return time
+
+        # acknowledgements of an earlier broadcast must not resolve the new futures
+        await self.wait_for_futures()
+        self.schedules = []
+        await self.broadcast(self.scheduler.clock.time)
+        await asyncio.sleep(0)
+        await self.wait_for_futures()
+
+        # wait for our container too
+        await self.wait_all_done()
+        next_activity = self.scheduler.clock.get_next_activity()
+        if next_activity is not None:
+            self.schedules.append(next_activity)
+
+        if not self.schedules:
+            logger.warning("%s: no new events, time stands still", self.aid)
+            return self.scheduler.clock.time
+
+        return max(min(self.schedules), self.scheduler.clock.time)
@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import atexit
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_executors: dict[tuple[str, int], Executor] = {}
+
+
+def get_executor(workers: int, kind: str = "process") -> Executor:
+    """
+    Returns the shared pool with the given kind and number of workers.
+
+    The pools are created on first use and reused by all callers, e.g. the markets and
+    bidding strategies of all simulations in this process. They are shut down with
+    :func:`shutdown_executors`, which is also called when the interpreter exits.
+    Process pools start their workers with spawn, as they are created from inside the
+    running event loop, which must not be forked.
+
+    Args:
+        workers (int): The number of workers of the pool.
+        kind (str, optional): Either "process" or "thread". Defaults to "process".
+
+    Returns:
+        concurrent.futures.Executor: The shared pool.
+    """
+    if kind not in ("process", "thread"):
+        raise ValueError(f"Invalid executor kind {kind}, use 'process' or 'thread'")
+
+    key = (kind, workers)
+    if key not in _executors:
+        if kind == "process":
+            _executors[key] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _executors[key] = ThreadPoolExecutor(max_workers=workers)
+    return _executors[key]
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """
+    Shuts down all shared pools, new pools are created when they are requested again.
+
+    Args:
+        wait (bool, optional): Whether to wait for the running tasks and the workers to finish. Defaults to True.
+    """
+    while _executors:
+        (kind, workers), executor = _executors.popitem()
+        logger.debug("shutting down %s pool with %d workers", kind, workers)
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+atexit.register(shutdown_executors)
@@ -900,6 +900,27 @@ class FastSeries:
             name=series.name or "",
         )
 
+    @staticmethod
+    def from_array(index: FastIndex, data: np.ndarray, name: str = ""):
+        """
+        Create a FastSeries which uses the given array as its data without copying it.
+
+        This allows several series to be views on one preallocated array.
+
+        Parameters:
+            index (FastIndex): The datetime index.
+            data (np.ndarray): The float64 data array, its length must match the index.
+            name (str, optional): Name of the series. Defaults to an empty string.
+
+        Returns:
+            FastSeries: The series backed by the given array.
+        """
+        series = FastSeries.__new__(FastSeries)
+        series._index = index
+        series._name = name
+        series.data = data
+        return series
+
     def __iter__(self):
         """
         Make FastSeries iterable by iterating over the stored data.
@@ -3,12 +3,26 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import pickle
-from datetime import datetime
+import struct
+from datetime import datetime, timedelta, timezone
 
+import numpy as np
 from mango.messages.codecs import JSON, GenericProtoMsg
 
 from assume.common.utils import datetime2timestamp, timestamp2datetime
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# msgpack extension type codes used by the binary codec
+NDARRAY_EXT = 1
+DATETIME_EXT = 2
+PICKLE_EXT = 3
+
+EPOCH = datetime(1970, 1, 1)
+
 
 def datetime_json_serializer():
     def __tostring__(dt: datetime):
@@ -45,7 +59,106 @@ def generic_pb_serializer():
     return object, __tostring__, __fromstring__
 
 
-def mango_codec_factory():
+def generic_msgpack_serializer():
+    def __tostring__(generic_obj):
+        return msgpack.ExtType(PICKLE_EXT, pickle.dumps(generic_obj))
+
+    def __fromstring__(data):
+        return data
+
+    return object, __tostring__, __fromstring__
+
+
+class MsgPack(JSON):
+    """
+    A binary codec based on msgpack, which is aware of NumPy arrays and datetimes.
+
+    Arrays are sent as their raw buffer together with dtype and shape, datetimes as int64
+    microseconds since the epoch. All mango message types known to the JSON codec are
+    supported, other objects are pickled into a binary extension instead of a hex string.
+    """
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError(
+                "The msgpack codec requires msgpack. Install it with `pip install msgpack`."
+            )
+        super().__init__()
+
+    def encode(self, data):
+        return msgpack.packb(data, default=self._default, use_bin_type=True)
+
+    def decode(self, data):
+        return msgpack.unpackb(
+            data,
+            ext_hook=self._ext_hook,
+            object_hook=self.deserialize_obj,
+            raw=False,
+            strict_map_key=False,
+        )
+
+    def _default(self, obj):
+        if isinstance(obj, np.ndarray) and obj.dtype != object:
+            obj = np.ascontiguousarray(obj)
+            dtype = obj.dtype.str.encode()
+            header = struct.pack(
+                f"<B{len(dtype)}sB{obj.ndim}q", len(dtype), dtype, obj.ndim, *obj.shape
+            )
+            return msgpack.ExtType(NDARRAY_EXT, header + obj.tobytes())
+        if isinstance(obj, datetime):
+            if obj.tzinfo is not None:
+                obj = obj.astimezone(timezone.utc).replace(tzinfo=None)
+            return msgpack.ExtType(
+                DATETIME_EXT,
+                struct.pack("<q", (obj - EPOCH) // timedelta(microseconds=1)),
+            )
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return self.serialize_obj(obj)
+
+    def _ext_hook(self, code: int, data: bytes):
+        if code == NDARRAY_EXT:
+            dtype_len = data[0]
+            dtype = np.dtype(data[1 : 1 + dtype_len].decode())
+            offset = 1 + dtype_len
+            ndim = data[offset]
+            shape = struct.unpack_from(f"<{ndim}q", data, offset + 1)
+            offset += 1 + 8 * ndim
+            # copy, so that the received array is writeable
+            return np.frombuffer(data, dtype=dtype, offset=offset).reshape(shape).copy()
+        if code == DATETIME_EXT:
+            return EPOCH + timedelta(microseconds=struct.unpack("<q", data)[0])
+        if code == PICKLE_EXT:
+            return pickle.loads(data)
+        return msgpack.ExtType(code, data)
+
+
+codecs = {
+    "json": JSON,
+    "msgpack": MsgPack,
+}
+
+
+def mango_codec_factory(codec: str = "json"):
+    """
+    Creates the codec used by the mango containers.
+
+    Args:
+        codec (str, optional): The name of the codec, either "json" or "msgpack". Defaults to "json".
+
+    Returns:
+        mango.messages.codecs.Codec: The codec with the ASSUME serializers registered.
+    """
+    if codec not in codecs:
+        raise ValueError(
+            f"Codec {codec} unknown. Supported codecs are {list(codecs.keys())}"
+        )
+
+    if codec == "msgpack":
+        codec = MsgPack()
+        codec.add_serializer(*generic_msgpack_serializer())
+        return codec
+
     codec = JSON()
     codec.add_serializer(*datetime_json_serializer())
     codec.add_serializer(*generic_json_serializer())
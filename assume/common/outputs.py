@@ -706,6 +706,13 @@ class WriteOutput(Role):
         """
         Retrieves the total reward for each learning unit.
 
+        The running sums of the current run are kept by the learning role, see
+        :meth:`assume.reinforcement_learning.learning_role.Learning.get_sum_reward`.
+
+        Args:
+            episode (int): The episode of which the rewards are summed.
+            evaluation_mode (bool, optional): Whether the episode is an evaluation episode. Defaults to True.
+
         Returns:
             np.array: The total reward for each learning unit.
         """
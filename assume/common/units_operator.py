@@ -26,10 +26,18 @@ from assume.common.utils import (
     timestamp2datetime,
 )
 from assume.strategies import BaseStrategy
-from assume.units import BaseUnit
+from assume.units import BaseUnit, PowerPlant, Storage
+from assume.units.powerplant import execute_powerplant_fleet_dispatch
+from assume.units.storage import execute_storage_fleet_dispatch
 
 logger = logging.getLogger(__name__)
 
+# dispatch functions handling many units at once, keyed by the dispatch method they replace
+FLEET_DISPATCH = {
+    Storage.execute_current_dispatch: execute_storage_fleet_dispatch,
+    PowerPlant.execute_current_dispatch: execute_powerplant_fleet_dispatch,
+}
+
 
 class UnitsOperator(Role):
     """
@@ -74,6 +82,17 @@ class UnitsOperator(Role):
         self.valid_orders = defaultdict(list)
         self.units: dict[str, BaseUnit] = {}
 
+    def reset(self) -> None:
+        """
+        Resets the operator and all of its units for a new episode of the same simulation.
+        """
+        self.registered_markets = {}
+        self.last_sent_dispatch = defaultdict(lambda: 0)
+        self.valid_orders = defaultdict(list)
+
+        for unit in self.units.values():
+            unit.reset()
+
     def setup(self):
         super().setup()
         self.context.subscribe_message(
@@ -368,9 +387,26 @@ class UnitsOperator(Role):
             groupby=["market_id", "unit_id"],
         )
 
+        # units of the same kind sharing an index are dispatched together in one kernel call
+        fleets = defaultdict(list)
+        for unit in self.units.values():
+            fleet_dispatch = FLEET_DISPATCH.get(type(unit).execute_current_dispatch)
+            if fleet_dispatch is not None:
+                fleets[(fleet_dispatch, id(unit.index))].append(unit)
+        for (fleet_dispatch, _), fleet_units in fleets.items():
+            fleet_dispatch(fleet_units, start, now)
+        fleet_dispatched = {
+            unit.id for fleet_units in fleets.values() for unit in fleet_units
+        }
+
         unit_dispatch = []
         for unit_id, unit in self.units.items():
-            current_dispatch = unit.execute_current_dispatch(start, now)
+            if unit_id in fleet_dispatched:
+                current_dispatch = unit.outputs["energy"].loc[
+                    max(start, unit.index[0]) : now
+                ]
+            else:
+                current_dispatch = unit.execute_current_dispatch(start, now)
             end = now
             dispatch = {"power": current_dispatch}
             unit.calculate_generation_cost(start, now, "energy")
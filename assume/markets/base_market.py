@@ -2,11 +2,14 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import bisect
 import logging
 import math
+import random
 from itertools import groupby
 from operator import itemgetter
 
+import numpy as np
 from mango import AgentAddress, Performatives, Role, create_acl, sender_addr
 
 from assume.common.market_objects import (
@@ -34,6 +37,125 @@ logger = logging.getLogger(__name__)
 process_time = 0
 
 
+class ProductOrderbook:
+    """
+    The orders of a single product, separated into supply and demand orders as they arrive.
+
+    Orders with a volume of zero or with a volume per hour (block orders) are kept apart.
+    If sort_by_price is set, supply orders are kept in ascending and demand orders in
+    descending price order. Orders with equal prices are shuffled when the sorted orders
+    are requested, so that the random generator of the clearing breaks the ties.
+
+    Args:
+        sort_by_price (bool, optional): Whether the orders are inserted sorted by price. Defaults to False.
+    """
+
+    def __init__(self, sort_by_price: bool = False):
+        self.sort_by_price = sort_by_price
+        self.supply: Orderbook = []
+        self.demand: Orderbook = []
+        self.other: Orderbook = []
+        self._supply_keys = []
+        self._demand_keys = []
+
+    def add(self, order: dict) -> None:
+        """
+        Adds an order to the book of the product.
+
+        Args:
+            order (dict): The order to add.
+        """
+        volume = order["volume"]
+        if isinstance(volume, dict) or not volume:
+            self.other.append(order)
+        elif volume > 0:
+            self._insert(self.supply, self._supply_keys, order, order["price"])
+        else:
+            self._insert(self.demand, self._demand_keys, order, -order["price"])
+
+    def _insert(self, orders: Orderbook, keys: list, order: dict, price: float):
+        if not self.sort_by_price:
+            orders.append(order)
+            return
+        position = bisect.bisect_right(keys, price)
+        keys.insert(position, price)
+        orders.insert(position, order)
+
+    @staticmethod
+    def _shuffle_ties(orders: Orderbook, keys: list, rng: random.Random) -> Orderbook:
+        # shuffle each run of orders with equal prices in the presorted orders
+        shuffled = list(orders)
+        start = 0
+        for end in range(1, len(keys) + 1):
+            if end == len(keys) or keys[end] != keys[start]:
+                if end - start > 1:
+                    run = shuffled[start:end]
+                    rng.shuffle(run)
+                    shuffled[start:end] = run
+                start = end
+        return shuffled
+
+    @property
+    def orders(self) -> Orderbook:
+        """
+        All orders of the product.
+        """
+        return self.supply + self.demand + self.other
+
+    def sorted_supply(self, rng: random.Random = random) -> Orderbook:
+        """
+        Returns the supply orders sorted by ascending price with random tie-breaking.
+
+        Args:
+            rng (random.Random, optional): The random generator used for tie-breaking. Defaults to the random module.
+        """
+        if self.sort_by_price:
+            return self._shuffle_ties(self.supply, self._supply_keys, rng)
+        return sorted(self.supply, key=lambda x: (x["price"], rng.random()))
+
+    def sorted_demand(self, rng: random.Random = random) -> Orderbook:
+        """
+        Returns the demand orders sorted by descending price with random tie-breaking.
+
+        Args:
+            rng (random.Random, optional): The random generator used for tie-breaking. Defaults to the random module.
+        """
+        if self.sort_by_price:
+            return self._shuffle_ties(self.demand, self._demand_keys, rng)
+        return sorted(
+            self.demand, key=lambda x: (x["price"], rng.random()), reverse=True
+        )
+
+    def __len__(self) -> int:
+        return len(self.supply) + len(self.demand) + len(self.other)
+
+
+def add_to_product_books(
+    product_books: dict[tuple, ProductOrderbook],
+    orderbook: Orderbook,
+    sort_by_price: bool = False,
+) -> dict[tuple, ProductOrderbook]:
+    """
+    Adds orders to the books of their products, missing books are created.
+
+    Args:
+        product_books (dict[tuple, ProductOrderbook]): The books per (start_time, end_time, only_hours).
+        orderbook (Orderbook): The orders to add.
+        sort_by_price (bool, optional): Whether new books keep their orders sorted by price. Defaults to False.
+
+    Returns:
+        dict[tuple, ProductOrderbook]: The updated product books.
+    """
+    market_getter = itemgetter("start_time", "end_time", "only_hours")
+    for order in orderbook:
+        product = market_getter(order)
+        book = product_books.get(product)
+        if book is None:
+            book = product_books[product] = ProductOrderbook(sort_by_price)
+        book.add(order)
+    return product_books
+
+
 class MarketMechanism:
     """
     This class represents a market mechanism.
@@ -93,12 +215,16 @@ class MarketRole(MarketMechanism, Role):
     marketconfig: MarketConfig
     registered_agents: dict[AgentAddress, dict]
     required_fields: list[str] = []
+    # whether the mechanism clears the products independently from the product books
+    use_product_books: bool = False
 
     def __init__(self, marketconfig: MarketConfig):
         super().__init__(marketconfig)
         self.registered_agents = {}
         self.open_auctions = set()
         self.all_orders = []
+        self.product_books: dict[tuple, ProductOrderbook] = {}
+        self.presort_orders = marketconfig.param_dict.get("presort_orders", False)
         self.results = []
         if marketconfig.price_tick:
             if marketconfig.maximum_bid_price % marketconfig.price_tick != 0:
@@ -316,6 +442,8 @@ class MarketRole(MarketMechanism, Role):
         Validates a given orderbook.
 
         This is needed to check if all required fields for this mechanism are present.
+        The price and volume limits are applied to all orders at once and violations are
+        logged as one warning per kind with the number of affected orders.
 
         Args:
             orderbook (Orderbook): The orderbook to be validated.
@@ -351,7 +479,16 @@ class MarketRole(MarketMechanism, Role):
                 raise ValueError(f"max_volume is unset for market '{market_id}'.")
             max_volume = math.floor(max_volume / self.marketconfig.volume_tick)
 
-        # Validate each order in the orderbook
+        if max_price is None:
+            max_price = math.inf
+        if min_price is None:
+            min_price = -math.inf
+        if max_volume is None:
+            max_volume = math.inf
+
+        # Validate each order in the orderbook, the fields are only checked once per schema
+        additional_fields = self.marketconfig.additional_fields
+        checked_schemas = set()
         for order in orderbook:
             order["agent_addr"] = agent_addr
 
@@ -360,54 +497,90 @@ class MarketRole(MarketMechanism, Role):
                 order["only_hours"] = None
 
             # Check for additional required fields
-            for field in self.marketconfig.additional_fields:
-                if field not in order:
-                    raise KeyError(
-                        f"Missing required field '{field}' for order {order} in market '{market_id}'."
-                    )
+            if additional_fields:
+                schema = tuple(order)
+                if schema in checked_schemas:
+                    continue
+                for field in additional_fields:
+                    if field not in order:
+                        raise KeyError(
+                            f"Missing required field '{field}' for order {order} in market '{market_id}'."
+                        )
+                checked_schemas.add(schema)
 
         # Process separated orders
         sep_orders = separate_orders(orderbook.copy())
-        for order in sep_orders:
-            # Adjust order price if it exceeds max_price or is below min_price
-            if order["price"] > max_price:
-                logger.warning(
-                    f"Order price {order['price']} exceeds maximum price {max_price} in market '{market_id}'. Setting to max_price."
-                )
-                order["price"] = max_price
-            elif order["price"] < min_price:
-                logger.warning(
-                    f"Order price {order['price']} is below minimum price {min_price} in market '{market_id}'. Setting to min_price."
-                )
-                order["price"] = min_price
+        if not sep_orders:
+            return
 
-            # Check that the product is part of an open auction
-            product = (order["start_time"], order["end_time"], order["only_hours"])
-            if product not in self.open_auctions:
-                logger.warning(
-                    f"Product {product} is not part of an open auction in market '{market_id}'. Skipping this order."
-                )
-                continue  # Skip to the next order
+        # Adjust order prices which exceed max_price or are below min_price
+        prices = np.array([order["price"] for order in sep_orders], dtype=float)
+        above_max = np.flatnonzero(prices > max_price)
+        below_min = np.flatnonzero(prices < min_price)
+        for i in above_max:
+            sep_orders[i]["price"] = max_price
+        for i in below_min:
+            sep_orders[i]["price"] = min_price
+
+        # Check that the products are part of an open auction, other orders are not adjusted further
+        in_auction = np.array(
+            [
+                (order["start_time"], order["end_time"], order["only_hours"])
+                in self.open_auctions
+                for order in sep_orders
+            ]
+        )
 
-            # Adjust order volume if it exceeds max_volume
-            if abs(order["volume"]) > max_volume:
-                logger.warning(
-                    f"Order volume {order['volume']} exceeds max_volume {max_volume} in market '{market_id}'. Adjusting volume."
-                )
-                order["volume"] = max_volume if order["volume"] > 0 else -max_volume
+        # Adjust order volumes which exceed max_volume
+        volumes = np.array([order["volume"] for order in sep_orders], dtype=float)
+        above_max_volume = np.flatnonzero(in_auction & (np.abs(volumes) > max_volume))
+        for i in above_max_volume:
+            sep_orders[i]["volume"] = max_volume if volumes[i] > 0 else -max_volume
 
-            # Ensure 'price' is an integer if price_tick is set
-            if self.marketconfig.price_tick:
-                if not isinstance(order["price"], int):
-                    raise TypeError(
-                        f"Order price {order['price']} must be an integer when price_tick is set in market '{market_id}'."
-                    )
+        # warnings are aggregated per orderbook, which is sent by a single agent
+        if len(above_max):
+            logger.warning(
+                "%d order prices of agent %s exceed maximum price %s in market '%s'. Setting to max_price.",
+                len(above_max),
+                agent_addr,
+                max_price,
+                market_id,
+            )
+        if len(below_min):
+            logger.warning(
+                "%d order prices of agent %s are below minimum price %s in market '%s'. Setting to min_price.",
+                len(below_min),
+                agent_addr,
+                min_price,
+                market_id,
+            )
+        if not in_auction.all():
+            logger.warning(
+                "%d orders of agent %s are not part of an open auction in market '%s'.",
+                len(in_auction) - in_auction.sum(),
+                agent_addr,
+                market_id,
+            )
+        if len(above_max_volume):
+            logger.warning(
+                "%d order volumes of agent %s exceed max_volume %s in market '%s'. Adjusting volume.",
+                len(above_max_volume),
+                agent_addr,
+                max_volume,
+                market_id,
+            )
 
-            # Ensure 'volume' is an integer if volume_tick is set
-            if self.marketconfig.volume_tick:
-                if not isinstance(order["volume"], int):
+        # Ensure 'price' and 'volume' are integers if price_tick and volume_tick are set
+        checked_fields = []
+        if self.marketconfig.price_tick:
+            checked_fields.append(("price", "price_tick"))
+        if self.marketconfig.volume_tick:
+            checked_fields.append(("volume", "volume_tick"))
+        for field, tick in checked_fields:
+            for i in np.flatnonzero(in_auction):
+                if not isinstance(sep_orders[i][field], int):
                     raise TypeError(
-                        f"Order volume {order['volume']} must be an integer when volume_tick is set in market '{market_id}'."
+                        f"Order {field} {sep_orders[i][field]} must be an integer when {tick} is set in market '{market_id}'."
                     )
 
     def handle_registration(self, content: RegistrationMessage, meta: MetaDict):
@@ -503,9 +676,12 @@ class MarketRole(MarketMechanism, Role):
             # Validate the order book
             self.validate_orderbook(orderbook, agent_addr)
 
-            # Add each validated order to 'all_orders'
-            for order in orderbook:
-                self.all_orders.append(order)
+            # Add the validated orders to 'all_orders' and the books of their products
+            self.all_orders.extend(orderbook)
+            if self.use_product_books:
+                add_to_product_books(
+                    self.product_books, orderbook, self.presort_orders
+                )
 
         except Exception as e:
             # Log the error with agent details for better traceability
@@ -590,7 +766,15 @@ class MarketRole(MarketMechanism, Role):
             order = content.get("order")
             agent_addr = sender_addr(meta)
 
-            if order:
+            if order and self.use_product_books:
+                product = (
+                    order.get("start_time"),
+                    order.get("end_time"),
+                    order.get("only_hours"),
+                )
+                book = self.product_books.get(product)
+                available_orders = book.orders if book else []
+            elif order:
 
                 def order_matches_req(o):
                     return (
@@ -616,6 +800,45 @@ class MarketRole(MarketMechanism, Role):
             logger.error(f"Missing key in meta data: {ke}")
             # Optionally, handle the missing key scenario here
 
+    def get_product_books(self, orderbook: Orderbook) -> dict[tuple, ProductOrderbook]:
+        """
+        Returns the orders of the orderbook bucketed by product.
+
+        The books collected while the orders arrived are used if the orderbook contains
+        the orders received by the market, otherwise the books are created.
+
+        Args:
+            orderbook (Orderbook): The orderbook to be cleared.
+
+        Returns:
+            dict[tuple, ProductOrderbook]: The books per (start_time, end_time, only_hours).
+        """
+        if self.use_product_books and orderbook is self.all_orders:
+            return self.product_books
+        return add_to_product_books({}, orderbook, self.presort_orders)
+
+    async def async_clear(
+        self,
+        orderbook: Orderbook,
+        market_products: list[MarketProduct],
+        product_books: dict[tuple, ProductOrderbook] | None = None,
+    ):
+        """
+        Clears the market from the event loop.
+
+        Mechanisms which can clear without blocking the event loop override this method,
+        by default the orderbook is cleared synchronously with :meth:`clear`.
+
+        Args:
+            orderbook (Orderbook): The orderbook to be cleared.
+            market_products (list[MarketProduct]): The products to be traded.
+            product_books (dict[tuple, ProductOrderbook], optional): The orders bucketed by product. Defaults to None.
+
+        Returns:
+            (Orderbook, Orderbook, list[dict], dict[tuple, float]): The accepted orderbook, the rejected orderbook, the market metadata and the flows.
+        """
+        return self.clear(orderbook, market_products)
+
     async def clear_market(self, market_products: list[MarketProduct]):
         """
         This method clears the market and sends the results to the database agent.
@@ -629,16 +852,23 @@ class MarketRole(MarketMechanism, Role):
             )
             return
 
+        # detach the orders, as new orders may arrive while the clearing is awaited
+        orderbook = self.all_orders
+        product_books = self.product_books if self.use_product_books else None
+        self.all_orders = []
+        self.product_books = {}
+
         try:
-            (accepted_orderbook, rejected_orderbook, market_meta, flows) = self.clear(
-                self.all_orders, market_products
-            )
+            (
+                accepted_orderbook,
+                rejected_orderbook,
+                market_meta,
+                flows,
+            ) = await self.async_clear(orderbook, market_products, product_books)
         except Exception as e:
             logger.error("clearing failed: %s", e)
             raise e
 
-        self.all_orders = []
-
         for order in rejected_orderbook:
             if "accepted_volume" not in order and "accepted_price" not in order:
                 if isinstance(order["volume"], dict):
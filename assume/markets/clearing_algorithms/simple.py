@@ -2,14 +2,16 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import asyncio
 import logging
 import random
+from collections import deque
 from datetime import timedelta
-from itertools import groupby
 from operator import itemgetter
 
+from assume.common.executors import get_executor
 from assume.common.market_objects import MarketConfig, MarketProduct, Orderbook
-from assume.markets.base_market import MarketRole
+from assume.markets.base_market import MarketRole, ProductOrderbook
 
 logger = logging.getLogger(__name__)
 
@@ -42,263 +44,427 @@ def calculate_meta(accepted_supply_orders, accepted_demand_orders, product):
     }
 
 
-class PayAsClearRole(MarketRole):
+def _clear_product_seeded(clear_product, product: tuple, book, seed: str):
+    """
+    Clears a product with its own random generator, so that the result does not
+    depend on the order or the worker in which the products are cleared.
+    """
+    return clear_product(product, book, random.Random(seed))
+
+
+def reject_remaining_orders(
+    book: ProductOrderbook, rejected_orders: Orderbook
+) -> Orderbook:
+    """
+    Adds all orders of the product which were not accepted to the rejected orders.
+
+    Args:
+        book (ProductOrderbook): The orders of the product.
+        rejected_orders (Orderbook): The orders which are already rejected.
+
+    Returns:
+        Orderbook: The rejected orders of the product.
+    """
+    rejected_ids = {id(order) for order in rejected_orders}
+    for order in book.orders:
+        # if the order was not accepted partially, it is rejected
+        if not order.get("accepted_volume") and id(order) not in rejected_ids:
+            rejected_orders.append(order)
+    return rejected_orders
+
+
+def clear_pay_as_clear_product(
+    product: tuple, book: ProductOrderbook, rng: random.Random = random
+) -> tuple[Orderbook, Orderbook, dict]:
+    """
+    Clears a single product with uniform pricing.
+
+    Args:
+        product (tuple): The (start_time, end_time, only_hours) of the product.
+        book (ProductOrderbook): The orders of the product.
+        rng (random.Random, optional): The random generator used for tie-breaking. Defaults to the random module.
+
+    Returns:
+        tuple[Orderbook, Orderbook, dict]: accepted orders, rejected orders and clearing meta data of the product
+    """
+    accepted_demand_orders: Orderbook = []
+    accepted_supply_orders: Orderbook = []
+    rejected_orders: Orderbook = []
+
+    # volume 0 is ignored/invalid
+    # supply orders are sorted by ascending and demand orders by descending price
+    supply_orders = deque(book.sorted_supply(rng))
+    demand_orders = book.sorted_demand(rng)
+
+    dem_vol, gen_vol = 0, 0
+    # the following algorithm is inspired by one bar for generation and one for demand
+    # add generation for currents demand price, until it matches demand
+    # generation above it has to be sold for the lower price (or not at all)
+    for demand_order in demand_orders:
+        if not supply_orders:
+            # if no more generation - continue
+            # reject left over demand at the end
+            continue
+
+        # assert dem_vol == gen_vol
+        # now add the next demand order
+        dem_vol += -demand_order["volume"]
+        demand_order["accepted_volume"] = demand_order["volume"]
+        # and add supply until the demand order is matched
+        while supply_orders and gen_vol < dem_vol:
+            supply_order = supply_orders.popleft()
+            if supply_order["price"] <= demand_order["price"]:
+                added = supply_order["volume"] - supply_order.get("accepted_volume", 0)
+                should_insert = not supply_order.get("accepted_volume")
+                supply_order["accepted_volume"] = supply_order["volume"]
+                if should_insert:
+                    accepted_supply_orders.append(supply_order)
+                gen_vol += added
+            # if supply is not partially accepted before, reject it
+            elif not supply_order.get("accepted_volume"):
+                rejected_orders.append(supply_order)
+        # now we know which orders we need
+        # we only need to see how to arrange it.
+
+        diff = gen_vol - dem_vol
+
+        if diff < 0:
+            # gen < dem
+            # generation is not enough - accept partially
+            demand_order["accepted_volume"] = demand_order["volume"] - diff
+        elif diff > 0:
+            # generation left over - accept generation bid partially
+            supply_order = accepted_supply_orders[-1]
+            supply_order["accepted_volume"] = supply_order["volume"] - diff
+
+            # changed supply_order is still part of to_commit and will be added
+            # only volume-diff can be sold for current price
+            gen_vol -= diff
+
+            # add left over to supply_orders again
+            supply_orders.appendleft(supply_order)
+            demand_order["accepted_volume"] = demand_order["volume"]
+        else:
+            demand_order["accepted_volume"] = demand_order["volume"]
+
+        if demand_order["accepted_volume"]:
+            accepted_demand_orders.append(demand_order)
+
+    # if demand is fulfilled, we do have some additional supply orders
+    # these will be rejected
+    reject_remaining_orders(book, rejected_orders)
+
+    # set clearing price - merit order - uniform pricing
+    if accepted_supply_orders:
+        clear_price = float(max(map(itemgetter("price"), accepted_supply_orders)))
+    else:
+        clear_price = 0
+
+    accepted_product_orders = accepted_demand_orders + accepted_supply_orders
+    for order in accepted_product_orders:
+        order["accepted_price"] = clear_price
+
+    # set accepted volume to 0 and price to clear price for rejected orders
+    for order in rejected_orders:
+        order["accepted_volume"] = 0
+        order["accepted_price"] = clear_price
+
+    meta = calculate_meta(accepted_supply_orders, accepted_demand_orders, product)
+    return accepted_product_orders, rejected_orders, meta
+
+
+def clear_pay_as_bid_product(
+    product: tuple, book: ProductOrderbook, rng: random.Random = random
+) -> tuple[Orderbook, Orderbook, dict]:
+    """
+    Clears a single product, every accepted supply order is paid its own price.
+
+    Args:
+        product (tuple): The (start_time, end_time, only_hours) of the product.
+        book (ProductOrderbook): The orders of the product.
+        rng (random.Random, optional): The random generator used for tie-breaking. Defaults to the random module.
+
+    Returns:
+        tuple[Orderbook, Orderbook, dict]: accepted orders, rejected orders and clearing meta data of the product
+    """
+    accepted_demand_orders: Orderbook = []
+    accepted_supply_orders: Orderbook = []
+    rejected_orders: Orderbook = []
+
+    # volume 0 is ignored/invalid
+    # supply orders are sorted by ascending and demand orders by descending price
+    supply_orders = deque(book.sorted_supply(rng))
+    demand_orders = book.sorted_demand(rng)
+
+    dem_vol, gen_vol = 0, 0
+    # the following algorithm is inspired by one bar for generation and one for demand
+    # add generation for currents demand price, until it matches demand
+    # generation above it has to be sold for the lower price (or not at all)
+    for demand_order in demand_orders:
+        if not supply_orders:
+            # if no more generation - continue
+            # reject left over demand at the end
+            continue
+
+        dem_vol += -demand_order["volume"]
+        to_commit: Orderbook = []
+
+        while supply_orders and gen_vol < dem_vol:
+            supply_order = supply_orders.popleft()
+            if supply_order["price"] <= demand_order["price"]:
+                supply_order["accepted_volume"] = supply_order["volume"]
+                to_commit.append(supply_order)
+                gen_vol += supply_order["volume"]
+            # if supply is not partially accepted before, reject it
+            elif not supply_order.get("accepted_volume"):
+                rejected_orders.append(supply_order)
+        # now we know which orders we need
+        # we only need to see how to arrange it.
+
+        diff = gen_vol - dem_vol
+
+        if diff < 0:
+            # gen < dem
+            demand_order["accepted_volume"] = demand_order["volume"] - diff
+        elif diff > 0:
+            # generation left over - split generation
+            supply_order = to_commit[-1]
+            split_supply_order = supply_order.copy()
+            split_supply_order["volume"] = diff
+            supply_order["accepted_volume"] = supply_order["volume"] - diff
+            # only volume-diff can be sold for current price
+            # add left over to supply_orders again
+            gen_vol -= diff
+
+            supply_orders.appendleft(split_supply_order)
+            demand_order["accepted_volume"] = demand_order["volume"]
+        else:
+            # diff == 0 perfect match
+            demand_order["accepted_volume"] = demand_order["volume"]
+
+        if demand_order["accepted_volume"]:
+            accepted_demand_orders.append(demand_order)
+        # pay as bid
+        for supply_order in to_commit:
+            supply_order["accepted_price"] = supply_order["price"]
+
+            demand_order["accepted_price"] = supply_order["price"]
+        accepted_supply_orders.extend(to_commit)
+
+    # if demand is fulfilled, we do have some additional supply orders
+    # these will be rejected
+    reject_remaining_orders(book, rejected_orders)
+
+    accepted_product_orders = accepted_demand_orders + accepted_supply_orders
+    meta = calculate_meta(accepted_supply_orders, accepted_demand_orders, product)
+    return accepted_product_orders, rejected_orders, meta
+
+
+class ProductClearingRole(MarketRole):
+    """
+    Base class of market roles which clear each product independently of the others.
+
+    The orders are bucketed by product when they arrive, see :class:`ProductOrderbook`.
+    Every product is cleared with its own random generator, which is seeded from the
+    ``clearing_seed`` in the param_dict or the global random state and the product.
+
+    By default the products are cleared one after another. They can be cleared
+    concurrently by setting ``clearing_workers`` and ``clearing_executor`` in the
+    param_dict, which selects a "process" or "thread" pool from
+    :mod:`assume.common.executors`. The clearing is then awaited in :meth:`async_clear`
+    without blocking the event loop. The merged results are identical to clearing the
+    products one after another.
+
+    The process pool is started with spawn and each product book is pickled to a worker
+    and back, so it only pays off for large books. The clearing of a product is pure
+    Python and holds the GIL, so the thread pool brings no speedup on its own.
+    """
+
+    use_product_books = True
+    # the function clearing a single product, e.g. clear_pay_as_clear_product
+    clear_product = None
+
     def __init__(self, marketconfig: MarketConfig):
         super().__init__(marketconfig)
+        self.clearing_seed = marketconfig.param_dict.get("clearing_seed")
+        self.clearing_workers = int(marketconfig.param_dict.get("clearing_workers", 0))
+        self.clearing_executor = marketconfig.param_dict.get("clearing_executor")
+        if self.clearing_executor not in (None, "process", "thread"):
+            raise ValueError(
+                f"Invalid clearing_executor {self.clearing_executor} for market {marketconfig.market_id}, use 'process' or 'thread'"
+            )
+        if self.clearing_workers > 1 and self.clearing_executor is None:
+            logger.warning(
+                "clearing_workers is set for market %s without a clearing_executor, the products are cleared serially",
+                marketconfig.market_id,
+            )
 
-    def clear(
-        self, orderbook: Orderbook, market_products
-    ) -> (Orderbook, Orderbook, list[dict]):
+    def prepare_products(
+        self,
+        orderbook: Orderbook,
+        market_products,
+        product_books: dict[tuple, ProductOrderbook] | None = None,
+    ) -> tuple[list[tuple], Orderbook]:
         """
-        Performs electricity market clearing using a pay-as-clear mechanism. This means that the clearing price is the
-        highest price that is still accepted. The clearing price is the same for all accepted orders.
+        Selects the products to clear and seeds their random generators.
 
         Args:
             orderbook (Orderbook): the orders to be cleared as an orderbook
             market_products (list[MarketProduct]): the list of products which are cleared in this clearing
+            product_books (dict[tuple, ProductOrderbook], optional): the books of the orderbook. Defaults to None.
 
         Returns:
-            tuple: accepted orderbook, rejected orderbook and clearing meta data
+            tuple[list[tuple], Orderbook]: the (product, book, seed) of every product to clear and the rejected orders of other products
         """
-        market_getter = itemgetter("start_time", "end_time", "only_hours")
-        accepted_orders: Orderbook = []
+        if product_books is None:
+            product_books = self.get_product_books(orderbook)
+        base_seed = self.clearing_seed
+        if base_seed is None:
+            base_seed = random.getrandbits(64)
+
+        cleared_products = []
         rejected_orders: Orderbook = []
-        clear_price = 0
-        meta = []
-        orderbook.sort(key=market_getter)
-        for product, product_orders in groupby(orderbook, market_getter):
-            accepted_demand_orders: Orderbook = []
-            accepted_supply_orders: Orderbook = []
-            product_orders = list(product_orders)
+        for product in sorted(product_books):
+            book = product_books[product]
             if product not in market_products:
-                rejected_orders.extend(product_orders)
+                rejected_orders.extend(book.orders)
                 # logger.debug(f'found unwanted bids for {product} should be {market_products}')
                 continue
+            cleared_products.append((product, book, f"{base_seed}-{product}"))
 
-            supply_orders = [x for x in product_orders if x["volume"] > 0]
-            demand_orders = [x for x in product_orders if x["volume"] < 0]
-            # volume 0 is ignored/invalid
+        return cleared_products, rejected_orders
 
-            # Sort supply orders by price with randomness for tie-breaking
-            supply_orders.sort(key=lambda x: (x["price"], random.random()))
+    @staticmethod
+    def merge_results(results: list[tuple], rejected_orders: Orderbook):
+        """
+        Merges the results of the products in the order of the products.
 
-            # Sort demand orders by price in descending order with randomness for tie-breaking
-            demand_orders.sort(
-                key=lambda x: (x["price"], random.random()), reverse=True
-            )
+        Args:
+            results (list[tuple]): the accepted orders, rejected orders and meta data of each product
+            rejected_orders (Orderbook): the orders rejected before the clearing
 
-            dem_vol, gen_vol = 0, 0
-            # the following algorithm is inspired by one bar for generation and one for demand
-            # add generation for currents demand price, until it matches demand
-            # generation above it has to be sold for the lower price (or not at all)
-            for demand_order in demand_orders:
-                if not supply_orders:
-                    # if no more generation - continue
-                    # reject left over demand at the end
-                    continue
-
-                # assert dem_vol == gen_vol
-                # now add the next demand order
-                dem_vol += -demand_order["volume"]
-                demand_order["accepted_volume"] = demand_order["volume"]
-                # and add supply until the demand order is matched
-                while supply_orders and gen_vol < dem_vol:
-                    supply_order = supply_orders.pop(0)
-                    if supply_order["price"] <= demand_order["price"]:
-                        added = supply_order["volume"] - supply_order.get(
-                            "accepted_volume", 0
-                        )
-                        should_insert = not supply_order.get("accepted_volume")
-                        supply_order["accepted_volume"] = supply_order["volume"]
-                        if should_insert:
-                            accepted_supply_orders.append(supply_order)
-                        gen_vol += added
-                    # if supply is not partially accepted before, reject it
-                    elif not supply_order.get("accepted_volume"):
-                        rejected_orders.append(supply_order)
-                # now we know which orders we need
-                # we only need to see how to arrange it.
-
-                diff = gen_vol - dem_vol
-
-                if diff < 0:
-                    # gen < dem
-                    # generation is not enough - accept partially
-                    demand_order["accepted_volume"] = demand_order["volume"] - diff
-                elif diff > 0:
-                    # generation left over - accept generation bid partially
-                    supply_order = accepted_supply_orders[-1]
-                    supply_order["accepted_volume"] = supply_order["volume"] - diff
-
-                    # changed supply_order is still part of to_commit and will be added
-                    # only volume-diff can be sold for current price
-                    gen_vol -= diff
-
-                    # add left over to supply_orders again
-                    supply_orders.insert(0, supply_order)
-                    demand_order["accepted_volume"] = demand_order["volume"]
-                else:
-                    demand_order["accepted_volume"] = demand_order["volume"]
-
-                if demand_order["accepted_volume"]:
-                    accepted_demand_orders.append(demand_order)
-
-            # if demand is fulfilled, we do have some additional supply orders
-            # these will be rejected
-            for order in product_orders:
-                # if the order was not accepted partially, it is rejected
-                if not order.get("accepted_volume") and order not in rejected_orders:
-                    rejected_orders.append(order)
-
-            # set clearing price - merit order - uniform pricing
-            if accepted_supply_orders:
-                clear_price = float(
-                    max(map(itemgetter("price"), accepted_supply_orders))
-                )
-            else:
-                clear_price = 0
-
-            accepted_product_orders = accepted_demand_orders + accepted_supply_orders
-            for order in accepted_product_orders:
-                order["accepted_price"] = clear_price
-            accepted_orders.extend(accepted_product_orders)
-
-            # set accepted volume to 0 and price to clear price for rejected orders
-            for order in rejected_orders:
-                order["accepted_volume"] = 0
-                order["accepted_price"] = clear_price
-
-            meta.append(
-                calculate_meta(
-                    accepted_supply_orders,
-                    accepted_demand_orders,
-                    product,
-                )
-            )
+        Returns:
+            tuple: accepted orderbook, rejected orderbook, clearing meta data and flows
+        """
+        accepted_orders: Orderbook = []
+        meta = []
+        for accepted, rejected, product_meta in results:
+            accepted_orders.extend(accepted)
+            rejected_orders.extend(rejected)
+            meta.append(product_meta)
 
         # write network flows here if applicable
         flows = []
 
         return accepted_orders, rejected_orders, meta, flows
 
+    def clear_products(
+        self,
+        orderbook: Orderbook,
+        market_products,
+        product_books: dict[tuple, ProductOrderbook] | None = None,
+    ):
+        """
+        Clears the products of the orderbook one after another with :attr:`clear_product`.
+
+        Args:
+            orderbook (Orderbook): the orders to be cleared as an orderbook
+            market_products (list[MarketProduct]): the list of products which are cleared in this clearing
+            product_books (dict[tuple, ProductOrderbook], optional): the books of the orderbook. Defaults to None.
+
+        Returns:
+            tuple: accepted orderbook, rejected orderbook, clearing meta data and flows
+        """
+        cleared_products, rejected_orders = self.prepare_products(
+            orderbook, market_products, product_books
+        )
+        results = [
+            _clear_product_seeded(self.clear_product, *args)
+            for args in cleared_products
+        ]
+        return self.merge_results(results, rejected_orders)
+
+    async def async_clear(
+        self,
+        orderbook: Orderbook,
+        market_products,
+        product_books: dict[tuple, ProductOrderbook] | None = None,
+    ):
+        """
+        Clears the products concurrently in the pool if ``clearing_workers`` and
+        ``clearing_executor`` are set.
+
+        Args:
+            orderbook (Orderbook): the orders to be cleared as an orderbook
+            market_products (list[MarketProduct]): the list of products which are cleared in this clearing
+            product_books (dict[tuple, ProductOrderbook], optional): the books of the orderbook. Defaults to None.
+
+        Returns:
+            tuple: accepted orderbook, rejected orderbook, clearing meta data and flows
+        """
+        if self.clearing_workers <= 1 or self.clearing_executor is None:
+            return self.clear_products(orderbook, market_products, product_books)
+
+        cleared_products, rejected_orders = self.prepare_products(
+            orderbook, market_products, product_books
+        )
+        loop = asyncio.get_running_loop()
+        executor = get_executor(self.clearing_workers, self.clearing_executor)
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor, _clear_product_seeded, self.clear_product, *args
+                )
+                for args in cleared_products
+            )
+        )
+        return self.merge_results(results, rejected_orders)
+
+
+class PayAsClearRole(ProductClearingRole):
+    clear_product = staticmethod(clear_pay_as_clear_product)
 
-class PayAsBidRole(MarketRole):
     def __init__(self, marketconfig: MarketConfig):
         super().__init__(marketconfig)
 
     def clear(
-        self, orderbook: Orderbook, market_products: list[MarketProduct]
+        self, orderbook: Orderbook, market_products
     ) -> (Orderbook, Orderbook, list[dict]):
         """
-        Simulates electricity market clearing using a pay-as-bid mechanism.
+        Performs electricity market clearing using a pay-as-clear mechanism. This means that the clearing price is the
+        highest price that is still accepted. The clearing price is the same for all accepted orders.
+
+        The products are cleared one after another from the books of the products, see :func:`clear_pay_as_clear_product`.
 
         Args:
             orderbook (Orderbook): the orders to be cleared as an orderbook
             market_products (list[MarketProduct]): the list of products which are cleared in this clearing
 
         Returns:
-            tuple[Orderbook, Orderbook, list[dict]]: accepted orderbook, rejected orderbook and clearing meta data
+            tuple: accepted orderbook, rejected orderbook and clearing meta data
         """
+        return self.clear_products(orderbook, market_products)
 
-        market_getter = itemgetter("start_time", "end_time", "only_hours")
-        accepted_orders: Orderbook = []
-        rejected_orders: Orderbook = []
-        meta = []
-        orderbook.sort(key=market_getter)
-        for product, product_orders in groupby(orderbook, market_getter):
-            accepted_demand_orders: Orderbook = []
-            accepted_supply_orders: Orderbook = []
-            if product not in market_products:
-                rejected_orders.extend(product_orders)
-                # logger.debug(f'found unwanted bids for {product} should be {market_products}')
-                continue
 
-            product_orders = list(product_orders)
-            supply_orders = [x for x in product_orders if x["volume"] > 0]
-            demand_orders = [x for x in product_orders if x["volume"] < 0]
-            # volume 0 is ignored/invalid
+class PayAsBidRole(ProductClearingRole):
+    clear_product = staticmethod(clear_pay_as_bid_product)
 
-            # Sort supply orders by price with randomness for tie-breaking
-            supply_orders.sort(key=lambda i: (i["price"], random.random()))
-            # Sort demand orders by price in descending order with randomness for tie-breaking
-            demand_orders.sort(
-                key=lambda i: (i["price"], random.random()), reverse=True
-            )
+    def __init__(self, marketconfig: MarketConfig):
+        super().__init__(marketconfig)
 
-            dem_vol, gen_vol = 0, 0
-            # the following algorithm is inspired by one bar for generation and one for demand
-            # add generation for currents demand price, until it matches demand
-            # generation above it has to be sold for the lower price (or not at all)
-            for demand_order in demand_orders:
-                if not supply_orders:
-                    # if no more generation - continue
-                    # reject left over demand at the end
-                    continue
-
-                dem_vol += -demand_order["volume"]
-                to_commit: Orderbook = []
-
-                while supply_orders and gen_vol < dem_vol:
-                    supply_order = supply_orders.pop(0)
-                    if supply_order["price"] <= demand_order["price"]:
-                        supply_order["accepted_volume"] = supply_order["volume"]
-                        to_commit.append(supply_order)
-                        gen_vol += supply_order["volume"]
-                    # if supply is not partially accepted before, reject it
-                    elif not supply_order.get("accepted_volume"):
-                        rejected_orders.append(supply_order)
-                # now we know which orders we need
-                # we only need to see how to arrange it.
-
-                diff = gen_vol - dem_vol
-
-                if diff < 0:
-                    # gen < dem
-                    demand_order["accepted_volume"] = demand_order["volume"] - diff
-                elif diff > 0:
-                    # generation left over - split generation
-                    supply_order = to_commit[-1]
-                    split_supply_order = supply_order.copy()
-                    split_supply_order["volume"] = diff
-                    supply_order["accepted_volume"] = supply_order["volume"] - diff
-                    # only volume-diff can be sold for current price
-                    # add left over to supply_orders again
-                    gen_vol -= diff
-
-                    supply_orders.insert(0, split_supply_order)
-                    demand_order["accepted_volume"] = demand_order["volume"]
-                else:
-                    # diff == 0 perfect match
-                    demand_order["accepted_volume"] = demand_order["volume"]
-
-                if demand_order["accepted_volume"]:
-                    accepted_demand_orders.append(demand_order)
-                # pay as bid
-                for supply_order in to_commit:
-                    supply_order["accepted_price"] = supply_order["price"]
-
-                    demand_order["accepted_price"] = supply_order["price"]
-                accepted_supply_orders.extend(to_commit)
-
-            # if demand is fulfilled, we do have some additional supply orders
-            # these will be rejected
-            for order in product_orders:
-                # if the order was not accepted partially, it is rejected
-                if not order.get("accepted_volume") and order not in rejected_orders:
-                    rejected_orders.append(order)
-
-            accepted_product_orders = accepted_demand_orders + accepted_supply_orders
-
-            accepted_orders.extend(accepted_product_orders)
-            meta.append(
-                calculate_meta(
-                    accepted_supply_orders,
-                    accepted_demand_orders,
-                    product,
-                )
-            )
+    def clear(
+        self, orderbook: Orderbook, market_products: list[MarketProduct]
+    ) -> (Orderbook, Orderbook, list[dict]):
+        """
+        Simulates electricity market clearing using a pay-as-bid mechanism.
 
-        # write network flows here if applicable
-        flows = []
+        The products are cleared one after another from the books of the products, see :func:`clear_pay_as_bid_product`.
 
-        return accepted_orders, rejected_orders, meta, flows
+        Args:
+            orderbook (Orderbook): the orders to be cleared as an orderbook
+            market_products (list[MarketProduct]): the list of products which are cleared in this clearing
+
+        Returns:
+            tuple[Orderbook, Orderbook, list[dict]]: accepted orderbook, rejected orderbook and clearing meta data
+        """
+        return self.clear_products(orderbook, market_products)
@@ -2,5 +2,5 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from assume.reinforcement_learning.buffer import ReplayBuffer
+from assume.reinforcement_learning.buffer import ReplayBuffer, SharedReplayBuffer
 from assume.reinforcement_learning.learning_role import Learning
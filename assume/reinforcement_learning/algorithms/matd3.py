@@ -550,6 +550,7 @@ class TD3(RLAlgorithm):
                 strategy.critics.optimizer.zero_grad(set_to_none=True)
 
             total_critic_loss = 0.0
+            td_errors = 0.0
 
             # Loop over all agents and accumulate critic loss
             for i, strategy in enumerate(strategies):
@@ -600,10 +601,21 @@ class TD3(RLAlgorithm):
                 current_Q_values = critic(all_states, all_actions)
 
                 # Accumulate critic loss for this agent
-                critic_loss = sum(
-                    F.mse_loss(current_q, target_Q_values)
-                    for current_q in current_Q_values
-                )
+                if transitions.weights is None:
+                    critic_loss = sum(
+                        F.mse_loss(current_q, target_Q_values)
+                        for current_q in current_Q_values
+                    )
+                else:
+                    # importance sampling weights correct the bias of prioritized sampling
+                    weights = transitions.weights.unsqueeze(1)
+                    critic_loss = sum(
+                        (weights * (current_q - target_Q_values) ** 2).mean()
+                        for current_q in current_Q_values
+                    )
+                    td_errors += (
+                        (current_Q_values[0] - target_Q_values).abs().detach().squeeze(1)
+                    )
 
                 # Store the critic loss for this unit ID
                 unit_params[step][strategy.unit_id]["loss"] = critic_loss.item()
@@ -612,6 +624,12 @@ class TD3(RLAlgorithm):
             # Single backward pass for all agents' critics
             total_critic_loss.backward()
 
+            # prioritize transitions by the mean temporal difference error over all agents
+            if transitions.weights is not None:
+                self.learning_role.buffer.update_priorities(
+                    transitions.indices, (td_errors / n_rl_agents).numpy(force=True)
+                )
+
             # Clip the gradients and step each critic optimizer
             for strategy in strategies:
                 parameters = list(strategy.critics.parameters())
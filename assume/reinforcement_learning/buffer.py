@@ -3,6 +3,10 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import warnings
+import weakref
+from collections import deque
+from contextlib import nullcontext
+from multiprocessing import shared_memory
 from typing import NamedTuple
 
 import numpy as np
@@ -20,6 +24,8 @@ class ReplayBufferSamples(NamedTuple):
     actions: th.Tensor
     next_observations: th.Tensor
     rewards: th.Tensor
+    weights: th.Tensor | None = None
+    indices: np.ndarray | None = None
 
 
 class ReplayBuffer:
@@ -172,3 +178,393 @@ class ReplayBuffer:
         )
 
         return ReplayBufferSamples(*tuple(map(self.to_torch, data)))
+
+
+class SharedReplayBuffer(ReplayBuffer):
+    def __init__(
+        self,
+        buffer_size: int,
+        obs_dim: int,
+        act_dim: int,
+        n_rl_units: int,
+        device: str,
+        float_type,
+        prioritized: bool = False,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        shm_name: str | None = None,
+    ):
+        """
+        A replay buffer whose arrays live in one shared memory block.
+
+        Units operators write their transitions directly into the arrays by index, so that no
+        data has to be stacked, pickled and copied on the way to the learning role. The buffer
+        can be attached from other processes by name, pickling it only transfers the name of the
+        shared memory block. Sampling gathers into preallocated (and on CUDA pinned) tensors, and
+        transitions can optionally be sampled proportional to their priority.
+
+        Args:
+            buffer_size (int): The maximum size of the buffer.
+            obs_dim (int): The dimension of the observation space.
+            act_dim (int): The dimension of the action space.
+            n_rl_units (int): The number of reinforcement learning units.
+            device (str): The device to use for the sampled data (e.g., 'cpu' or 'cuda').
+            float_type (torch.dtype): The data type to use for the stored data.
+            prioritized (bool, optional): Whether to use prioritized sampling. Defaults to False.
+            alpha (float, optional): How much prioritization is used, 0 is uniform sampling. Defaults to 0.6.
+            beta (float, optional): The exponent of the importance sampling weights. Defaults to 0.4.
+            shm_name (str, optional): Name of an existing shared memory block to attach to. Defaults to None.
+        """
+
+        self.buffer_size = buffer_size
+        self.obs_dim = obs_dim
+        self.act_dim = act_dim
+        self.n_rl_units = n_rl_units
+        self.device = device
+
+        self.np_float_type = np.float16 if float_type == th.float16 else np.float32
+        self.th_float_type = float_type
+
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.beta = beta
+
+        # layout of the shared memory block: name -> (shape, dtype)
+        self._layout = {
+            "observations": ((buffer_size, n_rl_units, obs_dim), self.np_float_type),
+            "actions": ((buffer_size, n_rl_units, act_dim), self.np_float_type),
+            "rewards": ((buffer_size, n_rl_units), self.np_float_type),
+            "priorities": ((buffer_size,), np.float64),
+            # running maximum of the priorities, used for new transitions of all writers
+            "max_priorities": ((1,), np.float64),
+            # committed position, full flag, reserved position and number of open
+            # reservations, shared so that all processes see the same state
+            "state": ((4,), np.int64),
+        }
+        nbytes = sum(
+            int(np.prod(shape)) * np.dtype(dtype).itemsize
+            for shape, dtype in self._layout.values()
+        )
+
+        self.owner = shm_name is None
+        if self.owner:
+            if psutil is not None and nbytes > psutil.virtual_memory().available:
+                warnings.warn(
+                    "This system apparently does not have enough memory to store the complete "
+                    f"replay buffer {nbytes / 1e9:.2f}GB"
+                )
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            # free the shared memory block when the creating buffer is garbage collected
+            self._finalizer = weakref.finalize(self, _release_shared_memory, self.shm)
+        else:
+            self.shm = shared_memory.SharedMemory(name=shm_name)
+            self._finalizer = weakref.finalize(self, self.shm.close)
+
+        offset = 0
+        for name, (shape, dtype) in self._layout.items():
+            array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            setattr(self, name, array)
+            offset += array.nbytes
+
+        if self.owner:
+            self.observations.fill(0)
+            self.actions.fill(0)
+            self.rewards.fill(0)
+            self.priorities.fill(0)
+            self.max_priorities.fill(1.0)
+            self.state.fill(0)
+
+        # zero-copy torch views on the shared arrays used for sampling
+        self._th_views = {
+            "observations": th.from_numpy(self.observations),
+            "actions": th.from_numpy(self.actions),
+            "rewards": th.from_numpy(self.rewards),
+        }
+        self._sample_buffers = {}
+
+        # lock shared by all processes writing into the buffer, see reserve
+        self.lock = None
+
+    def __getstate__(self):
+        return {
+            "buffer_size": self.buffer_size,
+            "obs_dim": self.obs_dim,
+            "act_dim": self.act_dim,
+            "n_rl_units": self.n_rl_units,
+            "device": self.device,
+            "float_type": self.th_float_type,
+            "prioritized": self.prioritized,
+            "alpha": self.alpha,
+            "beta": self.beta,
+            "shm_name": self.shm.name,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def pos(self) -> int:
+        return int(self.state[0])
+
+    @pos.setter
+    def pos(self, value: int):
+        self.state[0] = value
+
+    @property
+    def max_priority(self) -> float:
+        return float(self.max_priorities[0])
+
+    @max_priority.setter
+    def max_priority(self, value: float):
+        self.max_priorities[0] = value
+
+    @property
+    def full(self) -> bool:
+        return bool(self.state[1])
+
+    @full.setter
+    def full(self, value: bool):
+        self.state[1] = int(value)
+
+    def size(self) -> int:
+        """
+        Return the number of committed transitions which can be sampled.
+
+        Returns:
+            int: The current size of the buffer
+        """
+        with self.lock or nullcontext():
+            return self._valid_range()[1]
+
+    def _valid_range(self) -> tuple[int, int]:
+        """
+        Returns the start and the number of committed transitions of the ring buffer.
+
+        The positions which are reserved but not committed yet are excluded, as they may
+        still hold zeros or the older transitions which are overwritten.
+        """
+        pos, full, reserved_pos = self.state[:3]
+        if not full:
+            return 0, int(pos)
+        in_flight = (reserved_pos - pos) % self.buffer_size
+        return int(reserved_pos), int(self.buffer_size - in_flight)
+
+    def reserve(self, n_transitions: int) -> np.ndarray:
+        """
+        Reserves the positions for the next transitions in the circular buffer.
+
+        The reserved positions are not sampled until :meth:`commit` is called after
+        they are written. If several processes write into the buffer, a multiprocessing
+        lock has to be assigned to :attr:`lock` in each of them, so that the
+        reservations do not overlap.
+
+        Args:
+            n_transitions (int): The number of transitions to reserve.
+
+        Returns:
+            numpy.ndarray: The positions the transitions have to be written to.
+        """
+        with self.lock or nullcontext():
+            reserved_pos = int(self.state[2])
+            positions = (reserved_pos + np.arange(n_transitions)) % self.buffer_size
+
+            new_pos = reserved_pos + n_transitions
+            if new_pos >= self.buffer_size:
+                self.full = True
+            self.state[2] = new_pos % self.buffer_size
+            self.state[3] += 1
+
+            # new transitions are sampled at least once with the highest priority
+            self.priorities[positions] = self.max_priority
+
+        return positions
+
+    def commit(self):
+        """
+        Marks a reservation of :meth:`reserve` as written.
+
+        The committed position is only moved forward once all open reservations are
+        committed, so that the sampling never sees positions which are still written.
+        """
+        with self.lock or nullcontext():
+            self.state[3] -= 1
+            if self.state[3] == 0:
+                self.pos = int(self.state[2])
+
+    def write(
+        self,
+        positions: np.ndarray,
+        unit_index: int,
+        obs: th.Tensor | np.ndarray,
+        actions: th.Tensor | np.ndarray,
+        rewards: list[float] | np.ndarray,
+    ):
+        """
+        Writes the transitions of one unit directly into the reserved positions.
+
+        Once all units are written, the reservation has to be committed with
+        :meth:`commit`.
+
+        Args:
+            positions (numpy.ndarray): The positions returned by :meth:`reserve`.
+            unit_index (int): The index of the unit in the buffer.
+            obs (torch.Tensor | numpy.ndarray): The observations of shape (n_transitions, obs_dim).
+            actions (torch.Tensor | numpy.ndarray): The actions of shape (n_transitions, act_dim).
+            rewards (list[float] | numpy.ndarray): The rewards of the transitions.
+        """
+        if isinstance(obs, th.Tensor):
+            obs = obs.numpy(force=True)
+        if isinstance(actions, th.Tensor):
+            actions = actions.numpy(force=True)
+
+        self.observations[positions, unit_index] = obs
+        self.actions[positions, unit_index] = actions
+        self.rewards[positions, unit_index] = rewards
+
+    def add(
+        self,
+        obs: np.array,
+        actions: np.array,
+        reward: np.array,
+    ):
+        """
+        Adds an observation, action, and reward of all agents to the replay buffer.
+
+        The arrays are written into the shared memory block without an additional copy.
+
+        Args:
+            obs (numpy.ndarray): The observation to add.
+            actions (numpy.ndarray): The actions to add.
+            reward (numpy.ndarray): The reward to add.
+        """
+        positions = self.reserve(obs.shape[0])
+        try:
+            self.observations[positions] = obs
+            self.actions[positions] = actions
+            self.rewards[positions] = reward
+        finally:
+            self.commit()
+
+    def _get_sample_buffer(
+        self, name: str, batch_size: int
+    ) -> tuple[th.Tensor, th.cuda.Event | None]:
+        """
+        Returns a preallocated tensor the sampled entries are gathered into.
+
+        On CUDA devices the tensors are pinned, so that the transfer is asynchronous.
+        Two tensors are used in turns there, each with an event marking the end of
+        its last transfer, which is waited for before the tensor is overwritten.
+        """
+        key = (name, batch_size)
+        if key not in self._sample_buffers:
+            source = self._th_views[name]
+            cuda = th.device(self.device).type == "cuda"
+            self._sample_buffers[key] = deque(
+                (
+                    th.empty(
+                        (batch_size, *source.shape[1:]),
+                        dtype=source.dtype,
+                        pin_memory=cuda,
+                    ),
+                    th.cuda.Event() if cuda else None,
+                )
+                for _ in range(2 if cuda else 1)
+            )
+        buffers = self._sample_buffers[key]
+        buffers.rotate(1)
+        out, event = buffers[0]
+        if event is not None:
+            event.synchronize()
+        return out, event
+
+    def _gather(self, name: str, indices: th.Tensor, slot: str) -> th.Tensor:
+        out, event = self._get_sample_buffer(slot, len(indices))
+        th.index_select(self._th_views[name], 0, indices, out=out)
+        result = out.to(self.device, dtype=self.th_float_type, non_blocking=True)
+        if event is not None:
+            event.record()
+        return result
+
+    def sample(self, batch_size: int) -> ReplayBufferSamples:
+        """
+        Samples a batch of experiences from the replay buffer.
+
+        Without prioritization the transitions are sampled uniformly. With prioritization they are
+        sampled proportional to ``priority ** alpha`` and the importance sampling weights and
+        sampled indices are returned as well. Only committed transitions are sampled,
+        see :meth:`commit`. On the CPU the returned tensors are the preallocated
+        sampling buffers, which are overwritten by the next call.
+
+        Args:
+            batch_size (int): The number of experiences to sample.
+
+        Returns:
+            ReplayBufferSamples: A named tuple containing the sampled observations, actions, and rewards.
+
+        Raises:
+            Exception: If there are less than two entries in the buffer.
+        """
+        with self.lock or nullcontext():
+            start, n_valid = self._valid_range()
+        if n_valid < 2:
+            raise Exception("at least two entries needed to sample")
+
+        # the last committed transition has no next observation yet
+        valid_inds = (start + np.arange(n_valid - 1)) % self.buffer_size
+
+        weights = None
+        if self.prioritized:
+            scaled = self.priorities[valid_inds] ** self.alpha
+            probabilities = scaled / scaled.sum()
+            sampled = np.random.choice(n_valid - 1, size=batch_size, p=probabilities)
+            batch_inds = valid_inds[sampled]
+            weights = (n_valid * probabilities[sampled]) ** (-self.beta)
+            weights = th.as_tensor(
+                weights / weights.max(), dtype=self.th_float_type, device=self.device
+            )
+        else:
+            batch_inds = valid_inds[np.random.randint(0, n_valid - 1, size=batch_size)]
+
+        indices = th.from_numpy(batch_inds)
+        next_indices = th.from_numpy((batch_inds + 1) % self.buffer_size)
+
+        return ReplayBufferSamples(
+            observations=self._gather("observations", indices, "observations"),
+            actions=self._gather("actions", indices, "actions"),
+            next_observations=self._gather(
+                "observations", next_indices, "next_observations"
+            ),
+            rewards=self._gather("rewards", indices, "rewards"),
+            weights=weights,
+            indices=batch_inds,
+        )
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray):
+        """
+        Updates the priorities of sampled transitions with their temporal difference errors.
+
+        Args:
+            indices (numpy.ndarray): The indices returned in the sampled batch.
+            td_errors (numpy.ndarray): The absolute temporal difference errors of the transitions.
+        """
+        priorities = np.abs(td_errors) + 1e-6
+        self.priorities[indices] = priorities
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+    def close(self):
+        """
+        Detaches from the shared memory block and frees it if this buffer created it.
+        """
+        self._th_views.clear()
+        for name in self._layout:
+            setattr(self, name, None)
+        self._finalizer()
+
+
+def _release_shared_memory(shm: shared_memory.SharedMemory):
+    try:
+        shm.close()
+    except BufferError:
+        # arrays still referencing the block keep the mapping alive until they are freed
+        pass
+    shm.unlink()
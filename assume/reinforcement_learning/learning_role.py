@@ -7,6 +7,7 @@ from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import torch as th
 from mango import Role
@@ -129,6 +130,9 @@ class Learning(Role):
 
         self.eval_episodes_done = 0
 
+        # only collect experience without updating the policy, used by parallel collection workers
+        self.collect_only = False
+
         # function that initializes learning, needs to be an extra function so that it can be called after buffer is given to Role
         self.create_learning_algorithm(self.rl_algorithm)
 
@@ -137,6 +141,8 @@ class Learning(Role):
         self.rl_eval = defaultdict(list)
         # list of avg_changes
         self.avg_rewards = []
+        # running sums of reward, regret and profit per learning unit of this run
+        self.rl_sums = defaultdict(lambda: defaultdict(float))
 
         self.tensor_board_logger = None
         self.db_addr = None
@@ -245,7 +251,10 @@ class Learning(Role):
 
         """
         total_duration = self.end - self.start
-        elapsed_duration = self.context.current_timestamp - self.start
+        # the learner of a parallel training does not run a simulation itself
+        elapsed_duration = min(
+            max(self.context.current_timestamp - self.start, 0), total_duration
+        )
 
         learning_episodes = (
             self.training_episodes - self.episodes_collecting_initial_experience
@@ -319,9 +328,37 @@ class Learning(Role):
         Notes:
             This method is typically scheduled to run periodically during training to continuously improve the agent's policy.
         """
+        if self.collect_only:
+            return
+
         if self.episodes_done >= self.episodes_collecting_initial_experience:
             self.rl_algorithm.update_policy()
 
+    def add_rl_params(self, rl_params: list[dict]) -> None:
+        """
+        Adds the reward, regret and profit of the learning units to the running sums of this run.
+
+        Args:
+            rl_params (list[dict]): The RL parameters of the learning units, as written to the output.
+        """
+        for record in rl_params:
+            unit_sums = self.rl_sums[record["unit"]]
+            for key in ("reward", "regret", "profit"):
+                value = record.get(key)
+                if value is not None and not np.isnan(value):
+                    unit_sums[key] += float(value)
+
+    def get_sum_reward(self) -> np.ndarray:
+        """
+        Returns the total reward of each learning unit in this run.
+
+        Returns:
+            numpy.ndarray: The total reward for each learning unit, ordered by unit id.
+        """
+        return np.array(
+            [self.rl_sums[unit]["reward"] for unit in sorted(self.rl_sums)]
+        )
+
     def compare_and_save_policies(self, metrics: dict) -> bool:
         """
         Compare evaluation metrics and save policies based on the best achieved performance according to the metrics calculated.
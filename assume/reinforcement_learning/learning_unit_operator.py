@@ -13,6 +13,7 @@ from assume.common.market_objects import (
     Orderbook,
 )
 from assume.common.utils import convert_tensors, create_rrule, get_products_index
+from assume.reinforcement_learning.observation_engine import ObservationEngine
 from assume.strategies import BaseStrategy, LearningStrategy
 from assume.units import BaseUnit
 
@@ -34,6 +35,9 @@ class RLUnitsOperator(UnitsOperator):
             "device": "cpu",
         }
 
+        # observation engines shared by all learning strategies with the same foresight
+        self.observation_engines: dict[int, ObservationEngine] = {}
+
     def on_ready(self):
         super().on_ready()
 
@@ -72,10 +76,34 @@ class RLUnitsOperator(UnitsOperator):
                         "device": strategy.device,
                     }
                 )
+                self.share_observation_engine(strategy)
 
                 self.rl_units.append(unit)
                 break
 
+    def share_observation_engine(self, strategy: LearningStrategy) -> None:
+        """
+        Assigns the observation engine matching the foresight of the strategy.
+
+        Strategies sharing an engine have their observations gathered in one operation
+        per market opening in :meth:`formulate_bids`.
+
+        Args:
+            strategy (LearningStrategy): The learning strategy of a unit.
+        """
+        foresight = getattr(strategy, "foresight", None)
+        if foresight is None or not hasattr(strategy, "observation_engine"):
+            return
+
+        if foresight not in self.observation_engines:
+            self.observation_engines[foresight] = ObservationEngine(
+                foresight=foresight,
+                float_type=strategy.float_type,
+                device=strategy.device,
+            )
+
+        strategy.observation_engine = self.observation_engines[foresight]
+
     def write_learning_to_output(self, orderbook: Orderbook, market_id: str) -> None:
         """
         Sends the current rl_strategy update to the output agent.
@@ -122,6 +150,11 @@ class RLUnitsOperator(UnitsOperator):
 
                 output_agent_list.append(output_dict)
 
+        # keep the running reward sums in the learning role, which works without an output agent
+        learning_role = self.context.data.get("learning_role")
+        if learning_role is not None and output_agent_list:
+            learning_role.add_rl_params(output_agent_list)
+
         db_addr = self.context.data.get("learning_output_agent_addr")
 
         if db_addr and output_agent_list:
@@ -171,6 +204,40 @@ class RLUnitsOperator(UnitsOperator):
         if values_len == 0:
             return
 
+        learning_role_addr = self.context.data.get("learning_agent_addr")
+        learning_role = self.context.data.get("learning_role")
+        buffer = getattr(learning_role, "buffer", None)
+
+        # write directly into the shared replay buffer if the learning role provides one
+        if hasattr(buffer, "reserve"):
+            positions = buffer.reserve(values_len)
+            try:
+                for i, unit in enumerate(self.rl_units):
+                    buffer.write(
+                        positions,
+                        i,
+                        obs=th.stack(
+                            unit.outputs["rl_observations"][:values_len], dim=0
+                        ),
+                        actions=th.stack(
+                            unit.outputs["rl_actions"][:values_len], dim=0
+                        ),
+                        rewards=unit.outputs["rl_rewards"][:values_len],
+                    )
+                    unit.reset_saved_rl_data()
+            finally:
+                buffer.commit()
+
+            if learning_role_addr:
+                self.context.schedule_instant_message(
+                    content={
+                        "context": "rl_training",
+                        "type": "update",
+                    },
+                    receiver_addr=learning_role_addr,
+                )
+            return
+
         all_observations = th.zeros(
             (values_len, learning_unit_count, obs_dim), device=device
         )
@@ -200,8 +267,6 @@ class RLUnitsOperator(UnitsOperator):
 
         rl_agent_data = (all_observations, all_actions, all_rewards)
 
-        learning_role_addr = self.context.data.get("learning_agent_addr")
-
         if learning_role_addr:
             self.context.schedule_instant_message(
                 content={
@@ -228,6 +293,13 @@ class RLUnitsOperator(UnitsOperator):
 
         orderbook: Orderbook = []
 
+        # gather the time series observations of all registered units at once,
+        # the strategies then only look up their row
+        start = products[0][0]
+        for engine in self.observation_engines.values():
+            if engine.slots:
+                engine.gather(engine.timestep(0, start))
+
         for unit_id, unit in self.units.items():
             product_bids = unit.calculate_bids(
                 market,
@@ -245,5 +317,8 @@ class RLUnitsOperator(UnitsOperator):
                 order["unit_id"] = unit_id
                 orderbook.append(order)
 
+        for engine in self.observation_engines.values():
+            engine.invalidate()
+
         # Convert all CUDA tensors to CPU in one pass
         return convert_tensors(orderbook)
@@ -0,0 +1,280 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import logging
+from datetime import datetime
+
+import numpy as np
+import torch as th
+
+from assume.common.fast_pandas import FastIndex, FastSeries
+from assume.common.utils import min_max_scale
+
+logger = logging.getLogger(__name__)
+
+
+class ObservationEngine:
+    """
+    Precomputes the time series part of the observations of learning strategies.
+
+    Forecast windows are built once per forecast series as a strided (T x foresight) view
+    on a padded copy of the scaled forecast, so that the window for a timestep is a plain
+    integer lookup. The history of accepted prices of every registered unit is kept in a
+    ring buffer, which is only updated with the values that changed since the last call.
+    All units sharing an engine can be gathered in a single array operation per market opening.
+
+    Args:
+        foresight (int): The number of timesteps contained in each window.
+        float_type (torch.dtype, optional): The data type of the created tensors. Defaults to th.float.
+        device (str | torch.device, optional): The device of the created tensors. Defaults to "cpu".
+    """
+
+    def __init__(
+        self,
+        foresight: int,
+        float_type=th.float,
+        device: str | th.device = "cpu",
+    ):
+        self.foresight = foresight
+        self.float_type = float_type
+        self.device = device
+
+        # scaled and padded forecasts, keyed by the id of the source series
+        # the source series are kept alive, so that their ids cannot be reused
+        self._series: dict[int, FastSeries] = {}
+        self._padded: dict[int, np.ndarray] = {}
+        self._windows: dict[int, np.ndarray] = {}
+
+        # per slot information, a slot is one (unit, market) combination
+        self.slots: dict[tuple[str, str], int] = {}
+        self._index: list[FastIndex] = []
+        self._res_load_key: list[int] = []
+        self._price_key: list[int] = []
+        self._accepted_price: list[FastSeries] = []
+        self._history_scale: list[float] = []
+        self._last_synced: list[int] = []
+
+        self._history = np.zeros((0, foresight), dtype=np.float64)
+
+        # cache of the last gathered batch
+        self._batch_timestep = None
+        self._batch = None
+
+    def _register_forecast(self, series: FastSeries) -> int:
+        """
+        Scales a forecast series and creates the sliding window view on it.
+
+        The series is padded with its first ``foresight - 1`` values, which reproduces
+        the wrap-around used at the end of the simulation horizon. A reference to the
+        series is kept, as forecasters may return a new series on every access and the
+        id of a collected series could be reused by another one.
+
+        Args:
+            series (FastSeries): The forecast series.
+
+        Returns:
+            int: The key under which the windows are stored.
+        """
+        key = id(series)
+        if key in self._windows:
+            return key
+
+        values = np.asarray(series.data, dtype=np.float64)
+        scaled = min_max_scale(values, values.min(), values.max())
+        padded = np.concatenate([scaled, scaled[: self.foresight - 1]])
+
+        self._series[key] = series
+        self._padded[key] = padded
+        # read-only view of shape (T, foresight) without copying the data
+        self._windows[key] = np.lib.stride_tricks.sliding_window_view(
+            padded, self.foresight
+        )
+        return key
+
+    def register(
+        self,
+        unit_id: str,
+        market_id: str,
+        index: FastIndex,
+        residual_load: FastSeries,
+        price: FastSeries,
+        accepted_price: FastSeries,
+        max_bid_price: float,
+    ) -> int:
+        """
+        Registers a unit for a market and returns its slot.
+
+        Args:
+            unit_id (str): The id of the unit.
+            market_id (str): The id of the market.
+            index (FastIndex): The index of the unit.
+            residual_load (FastSeries): The residual load forecast of the market.
+            price (FastSeries): The price forecast of the market.
+            accepted_price (FastSeries): The accepted prices of the unit, used as price history.
+            max_bid_price (float): The price used to scale the price history.
+
+        Returns:
+            int: The slot of the unit.
+        """
+        key = (unit_id, market_id)
+        if key in self.slots:
+            return self.slots[key]
+
+        slot = len(self._index)
+        self.slots[key] = slot
+
+        self._index.append(index)
+        self._res_load_key.append(self._register_forecast(residual_load))
+        self._price_key.append(self._register_forecast(price))
+        self._accepted_price.append(accepted_price)
+        self._history_scale.append(1 / max_bid_price)
+        self._last_synced.append(-1)
+
+        self._history = np.vstack(
+            [self._history, np.zeros((1, self.foresight), dtype=np.float64)]
+        )
+        self._batch_timestep = None
+
+        return slot
+
+    def timestep(self, slot: int, start: datetime) -> int:
+        """
+        Converts a datetime into the integer timestep of a slot.
+
+        Args:
+            slot (int): The slot of the unit.
+            start (datetime): The datetime to convert.
+
+        Returns:
+            int: The integer position in the index of the unit.
+        """
+        return self._index[slot]._get_idx_from_date(start)
+
+    def _sync_history(self, slot: int, t: int) -> None:
+        """
+        Writes the accepted prices up to timestep t into the ring buffer of a slot.
+
+        Only timesteps since the last synchronisation are written. The last synchronised
+        timestep is written again, as its accepted price is only known after the clearing.
+        """
+        last = self._last_synced[slot]
+        first = max(t - self.foresight + 1, 0)
+        if t >= last:
+            first = max(first, last)
+
+        data = self._accepted_price[slot].data
+        positions = np.arange(first, t + 1)
+        self._history[slot, positions % self.foresight] = (
+            data[first : t + 1] * self._history_scale[slot]
+        )
+        self._last_synced[slot] = t
+
+    def _history_window(self, slot: int, t: int) -> np.ndarray:
+        """
+        Returns the price history of a slot ending at timestep t in chronological order.
+
+        If less than ``foresight`` timesteps are available, the missing values are filled
+        with the beginning of the scaled price forecast.
+        """
+        if t < self.foresight - 1:
+            missing = self.foresight - 1 - t
+            return np.concatenate(
+                [
+                    self._padded[self._price_key[slot]][:missing],
+                    self._history[slot, : t + 1],
+                ]
+            )
+
+        order = (t + 1 + np.arange(self.foresight)) % self.foresight
+        return self._history[slot, order]
+
+    def window(self, slot: int, t: int) -> np.ndarray:
+        """
+        Returns the time series observations of one slot.
+
+        Args:
+            slot (int): The slot of the unit.
+            t (int): The integer timestep of the observation.
+
+        Returns:
+            numpy.ndarray: Residual load forecast, price forecast and price history concatenated.
+        """
+        if self._batch_timestep == t:
+            return self._batch[slot]
+
+        self._sync_history(slot, t)
+        return np.concatenate(
+            [
+                self._windows[self._res_load_key[slot]][t],
+                self._windows[self._price_key[slot]][t],
+                self._history_window(slot, t),
+            ]
+        )
+
+    def observation(
+        self, slot: int, t: int, unique_observations: list[float]
+    ) -> th.Tensor:
+        """
+        Creates the observation tensor of one slot.
+
+        Args:
+            slot (int): The slot of the unit.
+            t (int): The integer timestep of the observation.
+            unique_observations (list[float]): The unit specific observations appended at the end.
+
+        Returns:
+            torch.Tensor: The flat observation tensor.
+        """
+        observation = np.concatenate(
+            [self.window(slot, t), np.asarray(unique_observations, dtype=np.float64)]
+        )
+        return th.as_tensor(observation, dtype=self.float_type, device=self.device)
+
+    def gather(self, t: int) -> th.Tensor:
+        """
+        Gathers the time series observations of all registered slots for a timestep.
+
+        The forecast windows of all slots are gathered with a single fancy indexing
+        operation on the stacked window views. The result is cached, so that subsequent
+        calls of :meth:`window` for the same timestep are plain row lookups.
+
+        Args:
+            t (int): The integer timestep of the observations.
+
+        Returns:
+            torch.Tensor: Tensor of shape (slots, 3 * foresight).
+        """
+        n_slots = len(self._index)
+        if n_slots == 0:
+            return th.zeros((0, 3 * self.foresight), dtype=self.float_type)
+
+        for slot in range(n_slots):
+            self._sync_history(slot, t)
+
+        keys = list(self._windows.keys())
+        key_pos = {key: i for i, key in enumerate(keys)}
+        stacked = np.stack([self._windows[key][t] for key in keys])
+
+        res_load = stacked[[key_pos[key] for key in self._res_load_key]]
+        prices = stacked[[key_pos[key] for key in self._price_key]]
+
+        if t < self.foresight - 1:
+            history = np.stack(
+                [self._history_window(slot, t) for slot in range(n_slots)]
+            )
+        else:
+            order = (t + 1 + np.arange(self.foresight)) % self.foresight
+            history = self._history[:, order]
+
+        self._batch = np.concatenate([res_load, prices, history], axis=1)
+        self._batch_timestep = t
+
+        return th.as_tensor(self._batch, dtype=self.float_type, device=self.device)
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached batch, e.g. after new accepted prices were written.
+        """
+        self._batch_timestep = None
+        self._batch = None
@@ -0,0 +1,312 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import logging
+import multiprocessing as mp
+import queue
+import random
+import time
+import traceback
+from collections import defaultdict
+
+import numpy as np
+import torch as th
+
+from assume.common.base import LearningStrategy
+from assume.reinforcement_learning.buffer import SharedReplayBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class EpisodeCollector:
+    """
+    Collects the transitions of one episode in a collection worker.
+
+    It replaces the replay buffer of the learning role in the worker. The transitions
+    are written to the shared replay buffer in one block at the end of the episode,
+    so that the transitions of an episode stay consecutive in the buffer, which is
+    required as the next observation is taken from the following position.
+    """
+
+    def __init__(self):
+        self.observations = []
+        self.actions = []
+        self.rewards = []
+
+    def add(self, obs: np.ndarray, actions: np.ndarray, reward: np.ndarray) -> None:
+        """
+        Adds the transitions of all agents sent by the units operator.
+
+        Args:
+            obs (numpy.ndarray): The observations to add.
+            actions (numpy.ndarray): The actions to add.
+            reward (numpy.ndarray): The rewards to add.
+        """
+        self.observations.append(obs)
+        self.actions.append(actions)
+        self.rewards.append(reward)
+
+    def size(self) -> int:
+        return sum(len(obs) for obs in self.observations)
+
+    def flush(self, buffer: SharedReplayBuffer) -> int:
+        """
+        Writes the collected transitions to the shared replay buffer and clears them.
+
+        Args:
+            buffer (SharedReplayBuffer): The shared replay buffer of the learner.
+
+        Returns:
+            int: The number of written transitions.
+        """
+        n_transitions = self.size()
+        if n_transitions:
+            buffer.add(
+                obs=np.concatenate(self.observations),
+                actions=np.concatenate(self.actions),
+                reward=np.concatenate(self.rewards),
+            )
+
+        self.observations = []
+        self.actions = []
+        self.rewards = []
+
+        return n_transitions
+
+
+def get_actor_weights(rl_strats: dict[str, LearningStrategy]) -> dict[str, dict]:
+    """
+    Returns the actor weights of all learning strategies as CPU tensors.
+
+    Args:
+        rl_strats (dict[str, LearningStrategy]): The learning strategies of the learning role.
+
+    Returns:
+        dict[str, dict]: The state dicts of the actors per unit id.
+    """
+    return {
+        u_id: {
+            key: value.detach().cpu()
+            for key, value in strategy.actor.state_dict().items()
+        }
+        for u_id, strategy in rl_strats.items()
+    }
+
+
+def _collection_worker(
+    worker_id: int,
+    scenario_data: dict,
+    buffer_state: dict,
+    lock,
+    tasks,
+    results,
+    seed: int,
+) -> None:
+    """
+    Runs training episodes in its own world and writes the experience to the shared buffer.
+
+    Each task consists of the episode number and the current actor weights. The policy
+    is not updated in the worker, this is done by the learner only.
+    """
+    # imported here, as the loader depends on the reinforcement learning package
+    from assume.scenario.loader_csv import setup_world
+    from assume.world import World
+
+    random.seed(seed)
+    np.random.seed(seed)
+    th.manual_seed(seed)
+
+    buffer = SharedReplayBuffer(**buffer_state)
+    buffer.lock = lock
+    collector = EpisodeCollector()
+
+    world = World(export_csv_path="", log_level="WARNING")
+    world.scenario_data = scenario_data
+    actors_and_critics = None
+
+    try:
+        while (task := tasks.get()) is not None:
+            episode, actor_weights = task
+            start = time.perf_counter()
+
+            setup_world(world=world, episode=episode)
+            world.learning_role.collect_only = True
+            world.learning_role.load_inter_episodic_data(
+                {
+                    "buffer": collector,
+                    "actors_and_critics": actors_and_critics,
+                    "max_eval": defaultdict(lambda: -1e9),
+                    "all_eval": defaultdict(list),
+                    "avg_all_eval": [],
+                    "episodes_done": episode - 1,
+                    "eval_episodes_done": 0,
+                }
+            )
+            for u_id, strategy in world.learning_role.rl_strats.items():
+                strategy.actor.load_state_dict(actor_weights[u_id])
+
+            world.run()
+
+            actors_and_critics = world.learning_role.rl_algorithm.extract_policy()
+            n_transitions = collector.flush(buffer)
+            world.reset_episode()
+
+            results.put(
+                {
+                    "worker": worker_id,
+                    "episode": episode,
+                    "transitions": n_transitions,
+                    "duration": time.perf_counter() - start,
+                }
+            )
+    except Exception:
+        results.put({"worker": worker_id, "error": traceback.format_exc()})
+    finally:
+        buffer.close()
+
+
+class ParallelExperienceCollector:
+    """
+    Collects experience with several independent simulation worlds in worker processes.
+
+    Every worker runs complete training episodes of the scenario with its own random seed
+    and the actor weights it received together with the episode. The transitions are
+    written into the shared replay buffer of the learner, which keeps updating the policy
+    while the workers simulate.
+
+    Args:
+        scenario_data (dict): The scenario data of the world.
+        buffer (SharedReplayBuffer): The replay buffer of the learner.
+        n_workers (int): The number of worker processes.
+        seed (int, optional): The seed of the first worker, the others use the following ones. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        scenario_data: dict,
+        buffer: SharedReplayBuffer,
+        n_workers: int,
+        seed: int = 0,
+    ):
+        # forking a process with torch and a running event loop can deadlock
+        ctx = mp.get_context("spawn")
+
+        self.buffer = buffer
+        self.n_workers = n_workers
+        self.lock = ctx.Lock()
+        self.tasks = ctx.Queue()
+        self.results = ctx.Queue()
+
+        # the learner writes evaluation data into the same buffer
+        self.buffer.lock = self.lock
+
+        self.workers = [
+            ctx.Process(
+                target=_collection_worker,
+                args=(
+                    worker_id,
+                    scenario_data,
+                    buffer.__getstate__(),
+                    self.lock,
+                    self.tasks,
+                    self.results,
+                    seed + worker_id,
+                ),
+                name=f"experience_collector_{worker_id}",
+            )
+            for worker_id in range(n_workers)
+        ]
+
+        self.pending = 0
+        self.transitions = 0
+        self.start_time = None
+
+    def start(self) -> None:
+        """
+        Starts the worker processes.
+        """
+        self.start_time = time.perf_counter()
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, episode: int, rl_strats: dict[str, LearningStrategy]) -> None:
+        """
+        Submits an episode to the next free worker with the current actor weights.
+
+        Args:
+            episode (int): The number of the training episode.
+            rl_strats (dict[str, LearningStrategy]): The learning strategies of the learner.
+        """
+        self.tasks.put((episode, get_actor_weights(rl_strats)))
+        self.pending += 1
+
+    def get_finished(self, timeout: float | None = None) -> list[dict]:
+        """
+        Returns the results of all finished episodes.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait for the first result, None waits until one is available. Defaults to None.
+
+        Returns:
+            list[dict]: The worker, episode, number of transitions and duration of each finished episode.
+
+        Raises:
+            RuntimeError: If a worker failed.
+        """
+        finished = []
+        try:
+            if timeout is None:
+                # wait in intervals to notice workers which exited without a result
+                while not finished:
+                    try:
+                        finished.append(self.results.get(timeout=5))
+                    except queue.Empty:
+                        if not all(worker.is_alive() for worker in self.workers):
+                            raise RuntimeError(
+                                "an experience collection worker exited unexpectedly"
+                            )
+            else:
+                finished.append(self.results.get(timeout=timeout))
+            while True:
+                finished.append(self.results.get_nowait())
+        except queue.Empty:
+            pass
+
+        for result in finished:
+            if "error" in result:
+                raise RuntimeError(
+                    f"experience collection worker {result['worker']} failed:\n{result['error']}"
+                )
+            self.pending -= 1
+            self.transitions += result["transitions"]
+
+        return finished
+
+    @property
+    def throughput(self) -> float:
+        """
+        The collected transitions per second since the start of the workers.
+        """
+        if self.start_time is None:
+            return 0.0
+        return self.transitions / (time.perf_counter() - self.start_time)
+
+    def close(self) -> None:
+        """
+        Stops the workers after their current episode and waits for them.
+        """
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join(timeout=60)
+            if worker.is_alive():
+                worker.terminate()
+
+        self.buffer.lock = None
+        logger.info(
+            "collected %d transitions with %d workers (%.1f transitions/s)",
+            self.transitions,
+            self.n_workers,
+            self.throughput,
+        )
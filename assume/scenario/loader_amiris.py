@@ -4,7 +4,9 @@
 
 import calendar
 import logging
+import pickle
 from datetime import timedelta
+from pathlib import Path
 
 import dateutil.rrule as rr
 import pandas as pd
@@ -51,19 +53,69 @@ def read_csv(base_path, filename):
     )["load"]
 
 
-def get_send_receive_msgs_per_id(agent_id: int, contracts_config: list[dict]):
+class TimeSeriesStore:
+    """
+    Keeps the AMIRIS time series of a scenario, so that every file is only read once.
+
+    The returned series are shared between all agents and must not be modified in place.
+
+    Args:
+        base_path (str): base path to load profile csv files from
+    """
+
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        self.series: dict[str, pd.Series] = {}
+
+    def get(self, filename: str) -> pd.Series:
+        if filename not in self.series:
+            self.series[filename] = read_csv(self.base_path, filename)
+        return self.series[filename]
+
+
+def build_contract_index(contracts_config: list[dict]) -> dict[int, tuple[list, list]]:
+    """
+    Finds the sending and receiving contracts of all agents in one pass over the contracts.
+
+    Args:
+        contracts_config (list[dict]): whole contracts dict read from yaml
+
+    Returns:
+        dict[int, tuple[list, list]]: The sending and receiving contracts per agent id,
+        in the same order as returned by get_send_receive_msgs_per_id.
+    """
+    contract_index = {}
+    for contracts in contracts_config:
+        for contract in contracts["Contracts"]:
+            for position, key in enumerate(["SenderId", "ReceiverId"]):
+                agent_ids = contract[key]
+                if not isinstance(agent_ids, list):
+                    agent_ids = [agent_ids]
+                for agent_id in dict.fromkeys(agent_ids):
+                    contract_index.setdefault(agent_id, ([], []))[position].append(
+                        contract
+                    )
+    return contract_index
+
+
+def get_send_receive_msgs_per_id(
+    agent_id: int, contracts_config: list[dict] | dict[int, tuple[list, list]]
+):
     """
     AMIRIS contract conversion function which finds the list of ids which receive or send a message from/to the agent with agent_id.
 
     Args:
         agent_id (int): the agent id to which the contracts are found
-        contracts_config (list[dict]): whole contracts dict read from yaml
+        contracts_config (list[dict] | dict): whole contracts dict read from yaml or the index created by build_contract_index
 
     Returns:
         tuple: A tuple containing the following:
             - list: A list containing the ids of sending agents.
             - list: A list containing the ids of receiving agents
     """
+    if isinstance(contracts_config, dict):
+        sends, receives = contracts_config.get(agent_id, ([], []))
+        return list(sends), list(receives)
 
     sends = []
     receives = []
@@ -136,6 +188,7 @@ def add_agent_to_world(
     markups: dict = {},
     supports: dict = {},
     index: pd.DatetimeIndex = None,
+    series_store: TimeSeriesStore | None = None,
 ):
     """
     Adds an agent from a amiris agent definition to the ASSUME world.
@@ -145,10 +198,13 @@ def add_agent_to_world(
         agent (dict): AMIRIS agent dict
         world (World): ASSUME world to add the agent to
         prices (dict): prices read from amiris scenario beforehand
-        contracts (list): contracts read from the amiris scenario beforehand
+        contracts (list | dict): contracts read from the amiris scenario beforehand or their index created by build_contract_index
         base_path (str): base path to load profile csv files from
         markups (dict, optional): markups read from former agents. Defaults to {}.
+        series_store (TimeSeriesStore, optional): store of the already read time series. Defaults to None.
     """
+    if series_store is None:
+        series_store = TimeSeriesStore(base_path)
     strategies = {m: "flexable_eom" for m in list(world.markets.keys())}
     storage_strategies = {m: "flexable_eom_storage" for m in list(world.markets.keys())}
     demand_strategies = {m: "naive_eom" for m in list(world.markets.keys())}
@@ -223,7 +279,7 @@ def add_agent_to_world(
         case "CarbonMarket":
             co2_price = agent["Attributes"]["Co2Prices"]
             if isinstance(co2_price, str):
-                price_series = read_csv(base_path, co2_price)
+                price_series = series_store.get(co2_price)
                 co2_price = price_series.reindex(index).ffill().fillna(0)
             prices["co2"] = co2_price
         case "FuelsMarket":
@@ -232,8 +288,8 @@ def add_agent_to_world(
                 fuel_type = translate_fuel_type[fuel["FuelType"]]
                 price = fuel["Price"]
                 if isinstance(fuel["Price"], str):
-                    price_series = read_csv(base_path, fuel["Price"])
-                    price_series.index = price_series.index.round("h")
+                    price_series = series_store.get(fuel["Price"])
+                    price_series = price_series.set_axis(price_series.index.round("h"))
                     if not price_series.index.is_unique:
                         price_series = price_series.groupby(level=0).last()
                     price = price_series.reindex(index).ffill()
@@ -242,7 +298,7 @@ def add_agent_to_world(
             world.add_unit_operator(agent["Id"])
 
             for i, load in enumerate(agent["Attributes"]["Loads"]):
-                demand_series = -read_csv(base_path, load["DemandSeries"])
+                demand_series = -series_store.get(load["DemandSeries"])
                 world.add_unit(
                     f"demand_{agent['Id']}_{i}",
                     "demand",
@@ -337,7 +393,7 @@ def add_agent_to_world(
             # costs due to plant start up
             availability = prototype["PlannedAvailability"]
             if isinstance(availability, str):
-                availability = read_csv(base_path, availability)
+                availability = series_store.get(availability)
                 availability = availability.reindex(index).ffill()
             availability *= prototype.get("UnplannedAvailabilityFactor", 1)
 
@@ -388,7 +444,7 @@ def add_agent_to_world(
             availability = attr.get("YieldProfile", attr.get("DispatchTimeSeries"))
             max_power = attr["InstalledPowerInMW"]
             if isinstance(availability, str):
-                dispatch_profile = read_csv(base_path, availability)
+                dispatch_profile = series_store.get(availability)
                 availability = dispatch_profile.reindex(index).ffill().fillna(0)
 
                 if availability.max() > 1:
@@ -451,23 +507,135 @@ def read_amiris_yaml(base_path):
     return amiris_scenario
 
 
+class RecordingWorld:
+    """
+    Forwards all calls to the world and records the calls which add the scenario to it.
+
+    The arguments are pickled when the call is made, so that they can be replayed on
+    another world even if the world modifies them afterwards.
+
+    Args:
+        world (World): the ASSUME world
+    """
+
+    recorded_methods = [
+        "add_market_operator",
+        "add_market",
+        "add_unit_operator",
+        "add_unit",
+    ]
+
+    def __init__(self, world: World):
+        self.world = world
+        self.calls: list[bytes] = []
+
+    def __getattr__(self, name):
+        attribute = getattr(self.world, name)
+        if name not in self.recorded_methods:
+            return attribute
+
+        def record(*args, **kwargs):
+            self.calls.append(
+                pickle.dumps((name, args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            return attribute(*args, **kwargs)
+
+        return record
+
+
+def get_scenario_signature(base_path: str, snapshot_path: str) -> list[tuple]:
+    """
+    Returns the relative path, size and modification time of all files of a scenario.
+
+    Args:
+        base_path (str): base path of the amiris scenario
+        snapshot_path (str): path of the snapshot, which is excluded if it is stored in the scenario
+
+    Returns:
+        list[tuple]: the sorted file information, used to detect changes of the scenario
+    """
+    base = Path(base_path)
+    snapshot_file = Path(snapshot_path).resolve()
+    return sorted(
+        (str(path.relative_to(base)), path.stat().st_size, path.stat().st_mtime_ns)
+        for path in base.rglob("*")
+        if path.is_file() and path.resolve() != snapshot_file
+    )
+
+
+def load_amiris_snapshot(
+    world: World,
+    snapshot_path: str,
+    base_path: str,
+    scenario: str,
+    study_case: str,
+) -> bool:
+    """
+    Loads a converted amiris scenario from a snapshot created by load_amiris.
+
+    Args:
+        world (World): the ASSUME world
+        snapshot_path (str): path of the snapshot file
+        base_path (str): base path of the amiris scenario
+        scenario (str): the scenario name
+        study_case (str): the study case
+
+    Returns:
+        bool: True if the snapshot matches the scenario, study case and files and was loaded.
+    """
+    snapshot_file = Path(snapshot_path)
+    if not snapshot_file.is_file():
+        return False
+
+    with open(snapshot_file, "rb") as f:
+        snapshot = pickle.load(f)
+    if snapshot.get("case") != (scenario, study_case):
+        logger.info(
+            "amiris snapshot was created for another scenario or study case: %s",
+            snapshot.get("case"),
+        )
+        return False
+    if snapshot["signature"] != get_scenario_signature(base_path, snapshot_path):
+        logger.info("amiris scenario changed since the snapshot was created")
+        return False
+
+    world.bidding_strategies["support"] = SupportStrategy
+    world.setup(**snapshot["setup"])
+    for call in snapshot["calls"]:
+        name, args, kwargs = pickle.loads(call)
+        getattr(world, name)(*args, **kwargs)
+    return True
+
+
 def load_amiris(
     world: World,
     scenario: str,
     study_case: str,
     base_path: str,
+    snapshot_path: str | None = None,
 ):
     """
     Loads an Amiris scenario.
     Markups and markdowns are handled by linearly interpolating the agents volume.
     This mimics the behavior of the way it is done in AMIRIS.
 
+    If a snapshot path is given, the converted scenario is stored there and loaded
+    from it on later runs of the same scenario and study case, as long as the files of
+    the scenario do not change.
+
     Args:
         world (World): the ASSUME world
         scenario (str): the scenario name
         study_case (str): study case to define
         base_path (str): base path from where to load the amrisi scenario
+        snapshot_path (str, optional): path of the binary snapshot of the converted scenario. Defaults to None.
     """
+    if snapshot_path and load_amiris_snapshot(
+        world, snapshot_path, base_path, scenario, study_case
+    ):
+        logger.info("loaded amiris scenario from snapshot %s", snapshot_path)
+        return
+
     amiris_scenario = read_amiris_yaml(base_path)
     # DeliveryIntervalInSteps = 3600
     # In practice - this seems to be a fixed number in AMIRIS
@@ -484,11 +652,12 @@ def load_amiris(
     prices = {}
     index = pd.date_range(start=start, end=end, freq="1h", inclusive="left")
     world.bidding_strategies["support"] = SupportStrategy
-    world.setup(
-        start=start,
-        end=end,
-        simulation_id=simulation_id,
-    )
+    setup_params = {
+        "start": start,
+        "end": end,
+        "simulation_id": simulation_id,
+    }
+    world.setup(**setup_params)
     # helper dict to map trader markups/markdowns to powerplants
     markups = {}
     supports = {}
@@ -513,19 +682,32 @@ def load_amiris(
     agents_sorted = sorted(
         amiris_scenario["Agents"], key=lambda agent: keyorder.index(agent["Type"])
     )
+    contract_index = build_contract_index(amiris_scenario["Contracts"])
+    series_store = TimeSeriesStore(base_path)
+    scenario_world = RecordingWorld(world) if snapshot_path else world
     for agent in agents_sorted:
         add_agent_to_world(
             agent,
-            world,
+            scenario_world,
             prices,
-            amiris_scenario["Contracts"],
+            contract_index,
             base_path,
             markups,
             supports,
             index,
+            series_store,
         )
-    # calculate market price before simulation
-    world
+
+    if snapshot_path:
+        snapshot = {
+            "case": (scenario, study_case),
+            "signature": get_scenario_signature(base_path, snapshot_path),
+            "setup": setup_params,
+            "calls": scenario_world.calls,
+        }
+        Path(snapshot_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(snapshot_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 if __name__ == "__main__":
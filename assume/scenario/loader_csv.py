@@ -26,6 +26,7 @@ from assume.common.utils import (
     normalize_availability,
 )
 from assume.strategies import BaseStrategy
+from assume.units.dsm_load_shift import DSMFlex, presolve_dsm_units
 from assume.world import World
 
 logger = logging.getLogger(__name__)
@@ -364,23 +365,28 @@ def add_units(
     logger.info(f"Adding {unit_type} units")
 
     units_df = units_df.fillna(0)
-    for unit_name, unit_params in units_df.iterrows():
-        bidding_strategies = {
-            key.split("bidding_")[1]: unit_params[key]
-            for key in unit_params.keys()
-            if key.startswith("bidding_")
+    bidding_columns = [
+        column for column in units_df.columns if column.startswith("bidding_")
+    ]
+    units = []
+    for unit_name, unit_params in units_df.to_dict("index").items():
+        unit_params["bidding_strategies"] = {
+            column.split("bidding_")[1]: unit_params[column]
+            for column in bidding_columns
         }
-        unit_params["bidding_strategies"] = bidding_strategies
-        operator_id = unit_params["unit_operator"]
-        del unit_params["unit_operator"]
-        world.add_unit(
-            id=unit_name,
-            unit_type=unit_type,
-            unit_operator_id=operator_id,
-            unit_params=unit_params,
-            forecaster=forecaster,
+        operator_id = unit_params.pop("unit_operator")
+        units.append(
+            dict(
+                id=unit_name,
+                unit_type=unit_type,
+                unit_operator_id=operator_id,
+                unit_params=unit_params,
+                forecaster=forecaster,
+            )
         )
 
+    world.add_units_bulk(units)
+
 
 def read_units(
     units_df: pd.DataFrame,
@@ -407,11 +413,14 @@ def read_units(
     units_dict = defaultdict(list)
 
     units_df = units_df.fillna(0)
-    for unit_name, unit_params in units_df.iterrows():
+    bidding_columns = [
+        column for column in units_df.columns if column.startswith("bidding_")
+    ]
+    for unit_name, unit_params in units_df.to_dict("index").items():
         bidding_strategies = {
-            key.split("bidding_")[1]: unit_params[key]
-            for key in unit_params.keys()
-            if key.startswith("bidding_") and unit_params[key]
+            column.split("bidding_")[1]: unit_params[column]
+            for column in bidding_columns
+            if unit_params[column]
         }
         unit_params["bidding_strategies"] = bidding_strategies
 
@@ -425,14 +434,15 @@ def read_units(
         else:
             operator_id = unit_params["unit_operator"]
 
-        del unit_params["unit_operator"]
+        configured_operator_id = unit_params.pop("unit_operator")
         units_dict[operator_id].append(
             dict(
                 id=unit_name,
                 unit_type=unit_type,
                 unit_operator_id=operator_id,
-                unit_params=unit_params.to_dict(),
+                unit_params=unit_params,
                 forecaster=forecaster,
+                configured_operator_id=configured_operator_id,
             )
         )
     return units_dict
@@ -591,6 +601,137 @@ def load_config_and_create_forecaster(
     }
 
 
+def create_scenario_units(
+    world: World,
+    config: dict,
+    learning_config: LearningConfig,
+    forecaster: Forecaster,
+    powerplant_units: pd.DataFrame,
+    storage_units: pd.DataFrame,
+    demand_units: pd.DataFrame,
+    exchange_units: pd.DataFrame,
+    dsm_units: dict[str, pd.DataFrame] | None,
+) -> None:
+    """
+    Create the unit operators and units of a scenario and add them to the world.
+
+    Args:
+        world (World): An instance of the World class representing the simulation environment.
+        config (dict): The config of the study case.
+        learning_config (LearningConfig): The learning config of the current episode.
+        forecaster (Forecaster): The forecaster of the scenario.
+        powerplant_units (pandas.DataFrame): The power plant units.
+        storage_units (pandas.DataFrame): The storage units.
+        demand_units (pandas.DataFrame): The demand units.
+        exchange_units (pandas.DataFrame): The exchange units.
+        dsm_units (dict[str, pandas.DataFrame] | None): The DSM units per unit type.
+    """
+    # create list of units from dataframes before adding actual operators
+    logger.info("Read units from file")
+
+    units = defaultdict(list)
+    powerplant_units = read_units(
+        units_df=powerplant_units,
+        unit_type="power_plant",
+        forecaster=forecaster,
+        world_bidding_strategies=world.bidding_strategies,
+        learning_mode=learning_config["learning_mode"],
+    )
+
+    storage_units = read_units(
+        units_df=storage_units,
+        unit_type="storage",
+        forecaster=forecaster,
+        world_bidding_strategies=world.bidding_strategies,
+        learning_mode=learning_config["learning_mode"],
+    )
+
+    demand_units = read_units(
+        units_df=demand_units,
+        unit_type="demand",
+        forecaster=forecaster,
+        world_bidding_strategies=world.bidding_strategies,
+        learning_mode=learning_config["learning_mode"],
+    )
+
+    exchange_units = read_units(
+        units_df=exchange_units,
+        unit_type="exchange",
+        forecaster=forecaster,
+        world_bidding_strategies=world.bidding_strategies,
+    )
+
+    if dsm_units is not None:
+        for unit_type, units_df in dsm_units.items():
+            dsm_units = read_units(
+                units_df=units_df,
+                unit_type=unit_type,
+                forecaster=forecaster,
+                world_bidding_strategies=world.bidding_strategies,
+                learning_mode=learning_config["learning_mode"],
+            )
+        for op, op_units in dsm_units.items():
+            units[op].extend(op_units)
+
+    for op, op_units in powerplant_units.items():
+        units[op].extend(op_units)
+    for op, op_units in storage_units.items():
+        units[op].extend(op_units)
+    for op, op_units in demand_units.items():
+        units[op].extend(op_units)
+    for op, op_units in exchange_units.items():
+        units[op].extend(op_units)
+
+    # scenario wide settings of the DSM optimisation, unit specific columns take precedence
+    dsm_settings = {
+        "cache_path": config.get("dsm_cache_path"),
+        "horizon_window": config.get("dsm_horizon_window"),
+        "horizon_overlap": config.get("dsm_horizon_overlap"),
+    }
+    dsm_settings = {key: value for key, value in dsm_settings.items() if value}
+    if dsm_settings:
+        for op_units in units.values():
+            for unit in op_units:
+                unit_class = world.unit_types.get(unit["unit_type"], object)
+                if issubclass(unit_class, DSMFlex):
+                    for key, value in dsm_settings.items():
+                        if not unit["unit_params"].get(key):
+                            unit["unit_params"][key] = value
+
+    # solve the independent DSM optimisations in parallel before the units are created
+    # "auto" uses one worker per CPU, 0 solves each unit when it is created
+    # dsm_presolve_flex solves the operation with flexibility in the workers as well
+    dsm_presolve_workers = config.get("dsm_presolve_workers", 0)
+    if dsm_presolve_workers:
+        presolve_dsm_units(
+            units=[unit for op_units in units.values() for unit in op_units],
+            unit_types=world.unit_types,
+            max_workers=None
+            if dsm_presolve_workers == "auto"
+            else int(dsm_presolve_workers),
+            with_flex=config.get("dsm_presolve_flex", False),
+        )
+
+    # if distributed_role is true - there is a manager available
+    # and we can add each units_operator as a separate process
+    if world.distributed_role is True:
+        logger.info("Adding unit operators and units - with subprocesses")
+        for op, op_units in units.items():
+            world.add_units_with_operator_subprocess(op, op_units)
+    else:
+        logger.info("Adding unit operators and units")
+        for company_name in set(units.keys()):
+            if company_name == "Operator-RL" and world.learning_mode:
+                world.add_rl_unit_operator(id="Operator-RL")
+            else:
+                world.add_unit_operator(id=str(company_name))
+
+        # add the units to corresponding unit operators
+        world.add_units_bulk(
+            [unit for op_units in units.values() for unit in op_units]
+        )
+
+
 def setup_world(
     world: World,
     evaluation_mode: bool = False,
@@ -615,8 +756,14 @@ def setup_world(
         ValueError: If the specified scenario or study case is not found in the provided inputs.
 
     """
-    # make a deep copy of the scenario data to avoid changing the original data
-    scenario_data = copy.deepcopy(world.scenario_data)
+    if world.episode_units:
+        # the units of the previous episode are reused with their inputs,
+        # so only the config is copied as it is changed below
+        scenario_data = copy.copy(world.scenario_data)
+        scenario_data["config"] = copy.deepcopy(world.scenario_data["config"])
+    else:
+        # make a deep copy of the scenario data to avoid changing the original data
+        scenario_data = copy.deepcopy(world.scenario_data)
 
     simulation_id = scenario_data["simulation_id"]
     config = scenario_data["config"]
@@ -715,80 +862,21 @@ def setup_world(
             market_config=market_config,
         )
 
-    # create list of units from dataframes before adding actual operators
-    logger.info("Read units from file")
-
-    units = defaultdict(list)
-    powerplant_units = read_units(
-        units_df=powerplant_units,
-        unit_type="power_plant",
-        forecaster=forecaster,
-        world_bidding_strategies=world.bidding_strategies,
-        learning_mode=learning_config["learning_mode"],
-    )
-
-    storage_units = read_units(
-        units_df=storage_units,
-        unit_type="storage",
-        forecaster=forecaster,
-        world_bidding_strategies=world.bidding_strategies,
-        learning_mode=learning_config["learning_mode"],
-    )
-
-    demand_units = read_units(
-        units_df=demand_units,
-        unit_type="demand",
-        forecaster=forecaster,
-        world_bidding_strategies=world.bidding_strategies,
-        learning_mode=learning_config["learning_mode"],
-    )
-
-    exchange_units = read_units(
-        units_df=exchange_units,
-        unit_type="exchange",
-        forecaster=forecaster,
-        world_bidding_strategies=world.bidding_strategies,
-    )
-
-    if dsm_units is not None:
-        for unit_type, units_df in dsm_units.items():
-            dsm_units = read_units(
-                units_df=units_df,
-                unit_type=unit_type,
-                forecaster=forecaster,
-                world_bidding_strategies=world.bidding_strategies,
-                learning_mode=learning_config["learning_mode"],
-            )
-        for op, op_units in dsm_units.items():
-            units[op].extend(op_units)
-
-    for op, op_units in powerplant_units.items():
-        units[op].extend(op_units)
-    for op, op_units in storage_units.items():
-        units[op].extend(op_units)
-    for op, op_units in demand_units.items():
-        units[op].extend(op_units)
-    for op, op_units in exchange_units.items():
-        units[op].extend(op_units)
-
-    # if distributed_role is true - there is a manager available
-    # and we can add each units_operator as a separate process
-    if world.distributed_role is True:
-        logger.info("Adding unit operators and units - with subprocesses")
-        for op, op_units in units.items():
-            world.add_units_with_operator_subprocess(op, op_units)
+    if world.episode_units:
+        logger.info("Reusing units of the previous episode")
+        world.add_episode_units()
     else:
-        logger.info("Adding unit operators and units")
-        for company_name in set(units.keys()):
-            if company_name == "Operator-RL" and world.learning_mode:
-                world.add_rl_unit_operator(id="Operator-RL")
-            else:
-                world.add_unit_operator(id=str(company_name))
-
-        # add the units to corresponding unit operators
-        for op, op_units in units.items():
-            for unit in op_units:
-                world.add_unit(**unit)
+        create_scenario_units(
+            world=world,
+            config=config,
+            learning_config=learning_config,
+            forecaster=forecaster,
+            powerplant_units=powerplant_units,
+            storage_units=storage_units,
+            demand_units=demand_units,
+            exchange_units=exchange_units,
+            dsm_units=dsm_units,
+        )
 
     if world.learning_mode or world.evaluation_mode:
         world.add_learning_strategies_to_learning_role()
@@ -893,6 +981,136 @@ def load_custom_units(
     )
 
 
+def run_parallel_learning_episodes(
+    world: World,
+    inter_episodic_data: dict,
+    validation_interval: int,
+    n_workers: int,
+) -> None:
+    """
+    Run the training episodes with several simulation worlds collecting experience in parallel.
+
+    The workers run the training episodes with the latest actor weights and write their
+    transitions into the shared replay buffer, while this process keeps updating the policy.
+    The number of policy updates per collected episode is the same as in the sequential
+    training. The evaluation runs are done in this process while the workers keep collecting.
+
+    Args:
+        world (World): An instance of the World class representing the simulation environment.
+        inter_episodic_data (dict): The information stored across episodes, including the shared buffer.
+        validation_interval (int): The number of training episodes between two evaluation runs.
+        n_workers (int): The number of worker processes.
+    """
+    from assume.reinforcement_learning.parallel_collection import (
+        ParallelExperienceCollector,
+    )
+
+    learning_role = world.learning_role
+    training_episodes = learning_role.training_episodes
+    initial_episodes = learning_role.episodes_collecting_initial_experience
+    # the sequential training updates the policy once per train_freq of an episode
+    updates_per_episode = max(
+        int((world.end - world.start) / pd.Timedelta(learning_role.train_freq)), 1
+    )
+
+    collector = ParallelExperienceCollector(
+        scenario_data=world.scenario_data,
+        buffer=inter_episodic_data["buffer"],
+        n_workers=n_workers,
+        seed=world.learning_config.get("parallel_environments_seed", 0),
+    )
+    collector.start()
+
+    # the learner does not run a simulation, so the critic parameters are not written
+    world.learning_role.db_addr = None
+
+    next_episode = 1
+    episodes_done = 0
+    updates_done = 0
+    eval_episode = 1
+
+    pbar = tqdm(total=training_episodes, desc="Training Episodes")
+    try:
+        while next_episode <= min(n_workers, training_episodes):
+            collector.submit(next_episode, world.learning_role.rl_strats)
+            next_episode += 1
+
+        while episodes_done < training_episodes:
+            updates_allowed = (
+                max(episodes_done - initial_episodes, 0) * updates_per_episode
+            )
+            if updates_done < updates_allowed:
+                world.learning_role.update_policy()
+                updates_done += 1
+                finished = collector.get_finished(timeout=0)
+            else:
+                finished = collector.get_finished()
+
+            if not finished:
+                continue
+
+            previous_episodes_done = episodes_done
+            episodes_done += len(finished)
+            world.learning_role.episodes_done = episodes_done
+            pbar.update(len(finished))
+            pbar.set_description(
+                f"Training Episodes ({collector.throughput:.1f} transitions/s)"
+            )
+
+            while next_episode <= training_episodes and collector.pending < n_workers:
+                collector.submit(next_episode, world.learning_role.rl_strats)
+                next_episode += 1
+
+            # evaluation run once the next multiple of the validation interval is reached
+            if (
+                episodes_done // validation_interval
+                == previous_episodes_done // validation_interval
+                or episodes_done < initial_episodes + validation_interval
+            ):
+                continue
+
+            inter_episodic_data = world.learning_role.get_inter_episodic_data()
+            inter_episodic_data["episodes_done"] = episodes_done
+            inter_episodic_data["eval_episodes_done"] = eval_episode - 1
+
+            world.reset_episode()
+            setup_world(
+                world=world,
+                evaluation_mode=True,
+                episode=episodes_done,
+                eval_episode=eval_episode,
+            )
+            world.learning_role.load_inter_episodic_data(inter_episodic_data)
+            world.run()
+            world.learning_role.tensor_board_logger.update_tensorboard()
+
+            total_rewards = world.learning_role.get_sum_reward()
+            if len(total_rewards) == 0:
+                raise AssumeException("No rewards were collected during evaluation run")
+
+            terminate = world.learning_role.compare_and_save_policies(
+                {"avg_reward": np.mean(total_rewards)}
+            )
+            inter_episodic_data["eval_episodes_done"] = eval_episode
+            world.learning_role.rl_algorithm.save_params(
+                directory=f"{world.learning_role.trained_policies_save_path}/last_policies"
+            )
+
+            if terminate:
+                break
+
+            eval_episode += 1
+
+            # continue updating the policy with a learning role in training mode
+            world.reset_episode()
+            setup_world(world=world, episode=episodes_done + 1)
+            world.learning_role.load_inter_episodic_data(inter_episodic_data)
+            world.learning_role.db_addr = None
+    finally:
+        pbar.close()
+        collector.close()
+
+
 def run_learning(
     world: World,
     verbose: bool = False,
@@ -915,7 +1133,7 @@ def run_learning(
         - Upon completion of training, the function performs an evaluation run using the best policy learned during training.
         - The best policies are chosen based on the average reward obtained during the evaluation runs, and they are saved for future use.
     """
-    from assume.reinforcement_learning.buffer import ReplayBuffer
+    from assume.reinforcement_learning.buffer import ReplayBuffer, SharedReplayBuffer
 
     if not verbose:
         logger.setLevel(logging.WARNING)
@@ -967,17 +1185,35 @@ def run_learning(
     if os.path.exists(tensorboard_path):
         shutil.rmtree(tensorboard_path, ignore_errors=True)
 
+    buffer_kwargs = dict(
+        buffer_size=int(world.learning_config.get("replay_buffer_size", 5e5)),
+        obs_dim=world.learning_role.rl_algorithm.obs_dim,
+        act_dim=world.learning_role.rl_algorithm.act_dim,
+        n_rl_units=len(world.learning_role.rl_strats),
+        device=world.learning_role.device,
+        float_type=world.learning_role.float_type,
+    )
+    prioritized_replay = world.learning_config.get("prioritized_replay", False)
+    parallel_environments = world.learning_config.get("parallel_environments", 1)
+    if (
+        world.learning_config.get("shared_replay_buffer", False)
+        or prioritized_replay
+        or parallel_environments > 1
+    ):
+        # units operators write into the buffer directly instead of sending their data
+        buffer = SharedReplayBuffer(
+            **buffer_kwargs,
+            prioritized=prioritized_replay,
+            alpha=world.learning_config.get("prioritized_replay_alpha", 0.6),
+            beta=world.learning_config.get("prioritized_replay_beta", 0.4),
+        )
+    else:
+        buffer = ReplayBuffer(**buffer_kwargs)
+
     # -----------------------------------------
     # Information that needs to be stored across episodes, aka one simulation run
     inter_episodic_data = {
-        "buffer": ReplayBuffer(
-            buffer_size=int(world.learning_config.get("replay_buffer_size", 5e5)),
-            obs_dim=world.learning_role.rl_algorithm.obs_dim,
-            act_dim=world.learning_role.rl_algorithm.act_dim,
-            n_rl_units=len(world.learning_role.rl_strats),
-            device=world.learning_role.device,
-            float_type=world.learning_role.float_type,
-        ),
+        "buffer": buffer,
         "actors_and_critics": None,
         "max_eval": defaultdict(lambda: -1e9),
         "all_eval": defaultdict(list),
@@ -1005,92 +1241,100 @@ def run_learning(
             f"Training episodes ({world.learning_role.training_episodes}) must be greater than the sum of initial experience episodes ({world.learning_role.episodes_collecting_initial_experience}) and evaluation interval ({validation_interval})."
         )
 
-    eval_episode = 1
-
-    for episode in tqdm(
-        range(1, world.learning_role.training_episodes + 1),
-        desc="Training Episodes",
-    ):
-        # -----------------------------------------
-        # Give the newly initialized learning role the needed information across episodes
-        if episode != 1:
-            setup_world(
-                world=world,
-                episode=episode,
-            )
-            world.learning_role.load_inter_episodic_data(inter_episodic_data)
-
-        world.run()
+    if parallel_environments > 1:
+        run_parallel_learning_episodes(
+            world=world,
+            inter_episodic_data=inter_episodic_data,
+            validation_interval=validation_interval,
+            n_workers=parallel_environments,
+        )
+    else:
+        eval_episode = 1
 
-        world.learning_role.tensor_board_logger.update_tensorboard()
+        for episode in tqdm(
+            range(1, world.learning_role.training_episodes + 1),
+            desc="Training Episodes",
+        ):
+            # -----------------------------------------
+            # Give the newly initialized learning role the needed information across episodes
+            if episode != 1:
+                setup_world(
+                    world=world,
+                    episode=episode,
+                )
+                world.learning_role.load_inter_episodic_data(inter_episodic_data)
 
-        # -----------------------------------------
-        # Store updated information across episodes
-        inter_episodic_data = world.learning_role.get_inter_episodic_data()
-        inter_episodic_data["episodes_done"] = episode
+            world.run()
 
-        # evaluation run:
-        if (
-            episode % validation_interval == 0
-            and episode
-            >= world.learning_role.episodes_collecting_initial_experience
-            + validation_interval
-        ):
-            world.reset()
+            world.learning_role.tensor_board_logger.update_tensorboard()
 
-            # load evaluation run
-            setup_world(
-                world=world,
-                evaluation_mode=True,
-                episode=episode,
-                eval_episode=eval_episode,
-            )
+            # -----------------------------------------
+            # Store updated information across episodes
+            inter_episodic_data = world.learning_role.get_inter_episodic_data()
+            inter_episodic_data["episodes_done"] = episode
+
+            # evaluation run:
+            if (
+                episode % validation_interval == 0
+                and episode
+                >= world.learning_role.episodes_collecting_initial_experience
+                + validation_interval
+            ):
+                world.reset_episode()
+
+                # load evaluation run
+                setup_world(
+                    world=world,
+                    evaluation_mode=True,
+                    episode=episode,
+                    eval_episode=eval_episode,
+                )
 
-            world.learning_role.load_inter_episodic_data(inter_episodic_data)
+                world.learning_role.load_inter_episodic_data(inter_episodic_data)
 
-            world.run()
+                world.run()
 
-            world.learning_role.tensor_board_logger.update_tensorboard()
+                world.learning_role.tensor_board_logger.update_tensorboard()
 
-            total_rewards = world.output_role.get_sum_reward(episode=eval_episode)
+                total_rewards = world.learning_role.get_sum_reward()
 
-            if len(total_rewards) == 0:
-                raise AssumeException("No rewards were collected during evaluation run")
+                if len(total_rewards) == 0:
+                    raise AssumeException("No rewards were collected during evaluation run")
 
-            avg_reward = np.mean(total_rewards)
+                avg_reward = np.mean(total_rewards)
 
-            # check reward improvement in evaluation run
-            # and store best run in eval folder
-            terminate = world.learning_role.compare_and_save_policies(
-                {"avg_reward": avg_reward}
-            )
+                # check reward improvement in evaluation run
+                # and store best run in eval folder
+                terminate = world.learning_role.compare_and_save_policies(
+                    {"avg_reward": avg_reward}
+                )
 
-            inter_episodic_data["eval_episodes_done"] = eval_episode
+                inter_episodic_data["eval_episodes_done"] = eval_episode
 
-            # if we have not improved in the last x evaluations, we stop loop
-            if terminate:
-                break
+                # if we have not improved in the last x evaluations, we stop loop
+                if terminate:
+                    break
 
-            eval_episode += 1
+                eval_episode += 1
 
-        world.reset()
+            world.reset_episode()
 
-        # save the policies after each episode in case the simulation is stopped or crashes
-        if (
-            episode
-            >= world.learning_role.episodes_collecting_initial_experience
-            + validation_interval
-        ):
-            world.learning_role.rl_algorithm.save_params(
-                directory=f"{world.learning_role.trained_policies_save_path}/last_policies"
-            )
+            # save the policies after each episode in case the simulation is stopped or crashes
+            if (
+                episode
+                >= world.learning_role.episodes_collecting_initial_experience
+                + validation_interval
+            ):
+                world.learning_role.rl_algorithm.save_params(
+                    directory=f"{world.learning_role.trained_policies_save_path}/last_policies"
+                )
 
     # container shutdown implicitly with new initialisation
     logger.info("################")
     logger.info("Training finished, Start evaluation run")
     world.export_csv_path = temp_csv_path
 
-    world.reset()
+    world.reset_episode()
 
     # Set 'trained_policies_load_path' to None in order to load the most recent policies,
     # especially if previous strategies were loaded from an external source.
@@ -33,6 +33,7 @@ def load_oeds(
     nuts_config: list[str] = [],
     random=True,
     entsoe_demand=True,
+    cache_path: str | Path | None = None,
 ):
     """
     This initializes a scenario using the open-energy-data-server
@@ -47,6 +48,7 @@ def load_oeds(
         infra_uri (str): database uri to connect to the OEDS
         marketdesign (list[MarketConfig]): description of the market design which will be used with the scenario
         nuts_config (list[str], optional): list of NUTS areas from which the simulation data is taken. Defaults to [].
+        cache_path (str | Path, optional): directory of the cached database queries. Defaults to ~/.assume/oeds/<year>.
     """
     index = pd.date_range(
         start=start,
@@ -56,7 +58,9 @@ def load_oeds(
     simulation_id = f"{scenario}_{study_case}"
     year = start.year
     logger.info(f"loading scenario {simulation_id} with {nuts_config}")
-    infra_interface = InfrastructureInterface("test", infra_uri)
+    if cache_path is None:
+        cache_path = Path.home() / ".assume" / "oeds" / str(year)
+    infra_interface = InfrastructureInterface("test", infra_uri, cache_path=cache_path)
 
     if not nuts_config or nuts_config == "nuts3":
         nuts_config = list(infra_interface.plz_nuts["nuts3"].unique())
@@ -67,6 +71,9 @@ def load_oeds(
     elif nuts_config == "nuts2":
         nuts_config = list(infra_interface.plz_nuts["nuts2"].unique())
 
+    # query the units, demand and weather of all areas at once
+    infra_interface.set_bulk_areas(nuts_config)
+
     world.setup(
         start=start,
         end=end,
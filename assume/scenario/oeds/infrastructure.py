@@ -2,20 +2,20 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import hashlib
 import logging
 import math
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import holidays
 import numpy as np
 import pandas as pd
 from demandlib.bdew import ElecSlp
-from pvlib.irradiance import erbs
+from pvlib.irradiance import erbs, get_extra_radiation, get_total_irradiance
 from pvlib.location import Location
-from pvlib.pvsystem import PVSystem
 from sqlalchemy import create_engine
-from tqdm import tqdm
-from windpowerlib import ModelChain, WindTurbine
+from windpowerlib import WindTurbine
 
 from assume.scenario.oeds.static import (
     fuel_translation,
@@ -39,6 +39,16 @@ class InfrastructureInterface:
     The infrastructure interface abstracts access to the open-energy-data-server database.
     The database contains different schemas to access the MaStR, ENTSO-E or ECMWF weather.
     It allows the construction of a simulation solely from public data.
+
+    Query results can be stored in a local cache directory, so that repeated scenario
+    builds do not need the database. With :meth:`set_bulk_areas`, the units, demand and
+    weather of many areas are queried once for all areas and split locally.
+
+    Args:
+        name (str): The application name used for the database connections.
+        db_server_uri (str): The uri of the database server. A sqlite uri uses the same database for all schemas.
+        structure_databases (tuple[str], optional): The schemas of the database server.
+        cache_path (str | Path, optional): The directory of the query cache. Defaults to None, which disables the cache.
     """
 
     def __init__(
@@ -56,9 +66,16 @@ class InfrastructureInterface:
             "instrat_pl",
             "entsoe",
         ),
+        cache_path: str | Path | None = None,
     ):
         self.databases = {}
+        if db_server_uri.startswith("sqlite"):
+            # a local stand-in contains the tables of all schemas
+            engine = create_engine(db_server_uri)
+            self.databases = {db: engine for db in structure_databases}
         for db in structure_databases:
+            if db in self.databases:
+                continue
             schema_name = db
             if db == "nuts":
                 schema_name = "public"
@@ -67,19 +84,126 @@ class InfrastructureInterface:
                 connect_args={"application_name": name},
                 pool_pre_ping=True,
             )
+        self.cache_path = Path(cache_path) if cache_path else None
+
+        self.bulk_areas = None
+        self.bulk_plz_codes = []
+        self._bulk_results = {}
         self.setup()
 
-    def setup(self):
-        with self.databases["nuts"].connect() as conn:
-            self.plz_nuts = pd.read_sql_query(
-                "select code, nuts1, nuts2, nuts3, longitude, latitude from plz",
-                conn,
-                index_col="code",
+    def read_sql(
+        self, database: str, query: str, index_col: str | None = None
+    ) -> pd.DataFrame:
+        """
+        Reads the result of a query from one of the databases.
+
+        If a cache path is set, the result is stored in a pickle file named after the
+        hash of the database uri, query and index column, and read from it on later
+        calls. Results of different servers are therefore cached separately.
+
+        Args:
+            database (str): The name of the database (schema).
+            query (str): The SQL query.
+            index_col (str, optional): The column used as index. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The result of the query.
+        """
+        cache_file = None
+        if self.cache_path is not None:
+            # the uri without the password tells apart the servers and stand-ins
+            uri = self.databases[database].url.render_as_string(hide_password=True)
+            key = hashlib.sha256(f"{uri}|{database}|{index_col}|{query}".encode())
+            cache_file = self.cache_path / f"{database}_{key.hexdigest()[:32]}.pkl"
+            if cache_file.is_file():
+                return pd.read_pickle(cache_file)
+
+        with self.databases[database].connect() as conn:
+            df = pd.read_sql_query(query, conn, index_col=index_col)
+
+        if cache_file is not None:
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            df.to_pickle(cache_file)
+        return df
+
+    def set_bulk_areas(self, areas: list | None) -> None:
+        """
+        Sets the areas whose units, demand and weather are queried together.
+
+        Each area query of one of these areas is run once for all of them, and the
+        result is split locally for every area.
+
+        Args:
+            areas (list | None): The NUTS areas or postal codes, None disables the bulk queries.
+        """
+        self._bulk_results = {}
+        if not areas:
+            self.bulk_areas = None
+            self.bulk_plz_codes = []
+            return
+
+        self.bulk_areas = set(areas)
+        self.bulk_plz_codes = sorted(
+            {plz for area in self.bulk_areas for plz in self.get_area_plz_codes(area)}
+        )
+
+    def _bulk_nuts_filter(self, column: str) -> str:
+        nuts_areas = sorted(
+            area.upper() for area in self.bulk_areas if isinstance(area, str)
+        )
+        return " OR ".join(f"{column} LIKE '{area}%%'" for area in nuts_areas)
+
+    def read_area_sql(self, database: str, query: str, area) -> pd.DataFrame:
+        """
+        Reads the units of an area.
+
+        The query selects the postal code as "plz" and filters the postal codes with
+        the placeholder ``{plz_codes}``. For a bulk area, the query is run once with the
+        postal codes of all bulk areas and the rows of the area are selected locally.
+        Missing coordinates are set to the center of the area.
+
+        Args:
+            database (str): The name of the database (schema).
+            query (str): The SQL query with the placeholder for the postal codes.
+            area (str | int): The NUTS area or postal code.
+
+        Returns:
+            pd.DataFrame: The units of the area.
+        """
+        plz_codes = self.get_area_plz_codes(area)
+        filters_plz = "{plz_codes}" in query
+
+        if self.bulk_areas and area in self.bulk_areas:
+            if query not in self._bulk_results:
+                bulk_query = query.replace(
+                    "{plz_codes}", _sql_list(self.bulk_plz_codes)
+                )
+                self._bulk_results[query] = self.read_sql(database, bulk_query)
+            df = self._bulk_results[query]
+            if filters_plz:
+                # compare as text like the query of a single area
+                df = df[df["plz"].astype(str).isin(set(map(str, plz_codes)))]
+            df = df.reset_index(drop=True)
+        else:
+            df = self.read_sql(
+                database, query.replace("{plz_codes}", _sql_list(plz_codes))
             )
 
+        df = df.drop(columns="plz")
+        latitude, longitude = self.get_lat_lon_area(area)
+        df["lon"] = df["lon"].fillna(longitude)
+        df["lat"] = df["lat"].fillna(latitude)
+        return df
+
+    def setup(self):
+        self.plz_nuts = self.read_sql(
+            "nuts",
+            "select code, nuts1, nuts2, nuts3, longitude, latitude from plz",
+            index_col="code",
+        )
+
         query = 'select kw."Id", "Wert", "Name" from "Katalogwerte" kw join "Katalogkategorien" kk on kw."KatalogKategorieId"=kk."Id"'
-        with self.databases["mastr"].connect() as conn:
-            katalogwerte = pd.read_sql_query(query, conn, index_col="Id")
+        katalogwerte = self.read_sql("mastr", query, index_col="Id")
 
         energietraeger = katalogwerte[
             katalogwerte["Name"].str.contains("Energieträger")
@@ -134,6 +258,19 @@ class InfrastructureInterface:
         plzs = self.plz_nuts["nuts3"].str.startswith(area)
         return list(self.plz_nuts.loc[plzs].index)
 
+    def get_area_plz_codes(self, area):
+        if isinstance(area, str) and area.startswith("DE"):
+            plz_codes = self.get_plz_codes(area)
+            if not plz_codes:
+                raise Exception("invalid areas")
+        else:
+            plz_codes = [area]
+
+        for plz in plz_codes:
+            if plz not in self.plz_nuts.index:
+                raise Exception("invalid plz code")
+        return plz_codes
+
     def aggregate_cchps(self, df):
         # CCHP Power Plant with Combination
         cchps = df[df["combination"] == 1]
@@ -227,32 +364,19 @@ class InfrastructureInterface:
         Returns:
             pandas.DataFrame: dataframe of power plants
         """
-        if isinstance(area, str) and area.startswith("DE"):
-            plz_codes = self.get_plz_codes(area)
-            if not plz_codes:
-                raise Exception("invalid areas")
-        else:
-            plz_codes = [area]
-
-        for plz in plz_codes:
-            if plz not in self.plz_nuts.index:
-                raise Exception("invalid plz code")
-
-        latitude, longitude = self.get_lat_lon_area(area)
 
         query = f"""
             SELECT ev."EinheitMastrNummer" as "unitID",
+            ev."Postleitzahl" as "plz",
             ev."Energietraeger" as "fuel",
-            COALESCE(ev."Laengengrad", {longitude}) as "lon",
-            COALESCE(ev."Breitengrad", {latitude}) as "lat",
+            ev."Laengengrad" as "lon",
+            ev."Breitengrad" as "lat",
             COALESCE(ev."Inbetriebnahmedatum", '2010-01-01') as "startDate",
             COALESCE(ev."DatumEndgueltigeStilllegung", '2050-01-01') as "endDate",
             ev."Nettonennleistung" as "maxPower",
             COALESCE(ev."Technologie", 839) as "turbineTyp",
             ev."GenMastrNummer" as "generatorID"
             """
-        plz_codes_str = "', '".join([str(x) for x in plz_codes])
-        plz_codes_str = f"('{plz_codes_str}')"
         if fuel_type != "nuclear":
             query += f"""
                 ,
@@ -261,22 +385,21 @@ class InfrastructureInterface:
                 ev."AnlageIstImKombibetrieb" as "combination"
                 FROM "EinheitenVerbrennung" ev
                 LEFT JOIN "AnlagenKwk" kwk ON kwk."KwkMastrNummer" = ev."KwkMastrNummer"
-                WHERE ev."Postleitzahl" in {plz_codes_str}
+                WHERE ev."Postleitzahl" in {{plz_codes}}
                 AND ev."Energietraeger" = {self.energietraeger_translated[fuel_type]}
                 AND ev."Nettonennleistung" > 5000 AND ev."EinheitBetriebsstatus" >= 35
                 """
         else:
             query += f"""
                 FROM "EinheitenKernkraft" ev
-                WHERE ev."Postleitzahl" in {plz_codes_str}
+                WHERE ev."Postleitzahl" in {{plz_codes}}
                 """
         if created_before:
             query += f"AND \"Inbetriebnahmedatum\" < '{created_before.isoformat()}' "
         if stopped_after:
             query += f'AND ("DatumEndgueltigeStilllegung" IS NULL OR "DatumEndgueltigeStilllegung"  > \'{stopped_after.isoformat()}\')'
 
-        with self.databases["mastr"].connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = self.read_area_sql("mastr", query, area)
 
         if df.empty:
             return df
@@ -327,26 +450,12 @@ class InfrastructureInterface:
     def get_solar_systems_in_area(
         self, area=520, solar_type="roof_top", created_before=None, stopped_after=None
     ):
-        if isinstance(area, str) and area.startswith("DE"):
-            plz_codes = self.get_plz_codes(area)
-            if not plz_codes:
-                raise Exception("invalid areas")
-        else:
-            plz_codes = [area]
-
-        for plz in plz_codes:
-            if plz not in self.plz_nuts.index:
-                raise Exception("invalid plz code")
-
-        latitude, longitude = self.get_lat_lon_area(area)
-        plz_codes_str = "', '".join([str(x) for x in plz_codes])
-        plz_codes_str = f"('{plz_codes_str}')"
-
         query = (
             f'SELECT "EinheitMastrNummer" as "unitID", '
+            f'"Postleitzahl" as "plz", '
             f'"Nettonennleistung" as "maxPower", '
-            f'COALESCE("Laengengrad", {longitude}) as "lon", '
-            f'COALESCE("Breitengrad", {latitude}) as "lat", '
+            f'"Laengengrad" as "lon", '
+            f'"Breitengrad" as "lat", '
             f'COALESCE("Hauptausrichtung", 699) as "azimuthCode", '
             f'"Leistungsbegrenzung" as "limited", '
             f'"Einspeisungsart" as "ownConsumption", '
@@ -355,7 +464,7 @@ class InfrastructureInterface:
             f'"InanspruchnahmeZahlungNachEeg" as "eeg" '
             f'FROM "EinheitenSolar" '
             f'INNER JOIN "AnlagenEegSolar" ON "EinheitMastrNummer" = "VerknuepfteEinheitenMastrNummern" '
-            f'WHERE "Postleitzahl" in {plz_codes_str} '
+            f'WHERE "Postleitzahl" in {{plz_codes}} '
             f'AND "Lage" = {mastr_solar_codes[solar_type]} '
             f'AND "EinheitBetriebsstatus" >= 35 '
         )
@@ -366,8 +475,7 @@ class InfrastructureInterface:
             query += f'AND ("DatumEndgueltigeStilllegung" IS NULL OR "DatumEndgueltigeStilllegung"  > \'{stopped_after.isoformat()}\')'
 
         # Get Data from Postgres
-        with self.databases["mastr"].connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = self.read_area_sql("mastr", query, area)
         # If the response Dataframe is not empty set technical parameter
         if df.empty:
             return df
@@ -444,26 +552,12 @@ class InfrastructureInterface:
     def get_wind_turbines_in_area(
         self, area=520, wind_type="on_shore", created_before=None, stopped_after=None
     ):
-        if isinstance(area, str) and area.startswith("DE"):
-            plz_codes = self.get_plz_codes(area)
-            if not plz_codes:
-                raise Exception("invalid areas")
-        else:
-            plz_codes = [area]
-
-        for plz in plz_codes:
-            if plz not in self.plz_nuts.index:
-                raise Exception("invalid plz code")
-
-        latitude, longitude = self.get_lat_lon_area(area)
-        plz_codes_str = "', '".join([str(x) for x in plz_codes])
-        plz_codes_str = f"('{plz_codes_str}')"
-
         query = (
             f'SELECT "EinheitMastrNummer" as "unitID", '
+            f'"Postleitzahl" as "plz", '
             f'"Nettonennleistung" as "maxPower", '
-            f'COALESCE("Laengengrad", {longitude}) as "lon", '
-            f'COALESCE("Breitengrad", {latitude}) as "lat", '
+            f'"Laengengrad" as "lon", '
+            f'"Breitengrad" as "lat", '
             f'"Typenbezeichnung" as "typ", '
             f'COALESCE("Hersteller", -1) as "manufacturer", '
             f'"Nabenhoehe" as "height", '
@@ -478,7 +572,7 @@ class InfrastructureInterface:
             f'AND "Lage" = {self.mastr_wind_type[wind_type]} '
         )
         if wind_type == "on_shore":
-            query += f' AND "Postleitzahl" in {plz_codes_str} '
+            query += f' AND "Postleitzahl" in {{plz_codes}} '
 
         if created_before:
             query += f"AND \"Inbetriebnahmedatum\" < '{created_before.isoformat()}' "
@@ -486,8 +580,7 @@ class InfrastructureInterface:
             query += f'AND ("DatumEndgueltigeStilllegung" IS NULL OR "DatumEndgueltigeStilllegung"  > \'{stopped_after.isoformat()}\')'
 
         # Get Data from Postgres
-        with self.databases["mastr"].connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = self.read_area_sql("mastr", query, area)
         # If the response Dataframe is not empty set technical parameter
         if df.empty:
             return df
@@ -524,31 +617,17 @@ class InfrastructureInterface:
     def get_biomass_systems_in_area(
         self, area=520, created_before=None, stopped_after=None
     ):
-        if isinstance(area, str) and area.startswith("DE"):
-            plz_codes = self.get_plz_codes(area)
-            if not plz_codes:
-                raise Exception("invalid areas")
-        else:
-            plz_codes = [area]
-
-        for plz in plz_codes:
-            if plz not in self.plz_nuts.index:
-                raise Exception("invalid plz code")
-
-        latitude, longitude = self.get_lat_lon_area(area)
-        plz_codes_str = "', '".join([str(x) for x in plz_codes])
-        plz_codes_str = f"('{plz_codes_str}')"
-
         # TODO: Add more Parameters, if the model get more complex
         query = (
             f'SELECT "EinheitMastrNummer" as "unitID", '
+            f'"Postleitzahl" as "plz", '
             f'COALESCE("Inbetriebnahmedatum", \'2018-01-01\') as "startDate", '
             f'COALESCE("DatumEndgueltigeStilllegung", \'2050-01-01\') as "endDate" '
             f'"Nettonennleistung" as "maxPower", '
-            f'COALESCE("Laengengrad", {longitude}) as "lon", '
-            f'COALESCE("Breitengrad", {latitude}) as "lat" '
+            f'"Laengengrad" as "lon", '
+            f'"Breitengrad" as "lat" '
             f'FROM "EinheitenBiomasse"'
-            f'WHERE "Postleitzahl" in {plz_codes_str} AND'
+            f'WHERE "Postleitzahl" in {{plz_codes}} AND'
             f'"EinheitBetriebsstatus" >= 35 '
         )
 
@@ -558,38 +637,23 @@ class InfrastructureInterface:
             query += f'AND ("DatumEndgueltigeStilllegung" IS NULL OR "DatumEndgueltigeStilllegung"  > \'{stopped_after.isoformat()}\')'
 
         # Get Data from Postgres
-        with self.databases["mastr"].connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = self.read_area_sql("mastr", query, area)
         # If the response Dataframe is not empty set technical parameter
         return df
 
     def get_run_river_systems_in_area(
         self, area=520, created_before=None, stopped_after=None
     ):
-        if isinstance(area, str) and area.startswith("DE"):
-            plz_codes = self.get_plz_codes(area)
-            if not plz_codes:
-                raise Exception("invalid areas")
-        else:
-            plz_codes = [area]
-
-        for plz in plz_codes:
-            if plz not in self.plz_nuts.index:
-                raise Exception("invalid plz code")
-
-        latitude, longitude = self.get_lat_lon_area(area)
-        plz_codes_str = "', '".join([str(x) for x in plz_codes])
-        plz_codes_str = f"('{plz_codes_str}')"
-
         query = (
             f'SELECT "EinheitMastrNummer" as "unitID", '
+            f'"Postleitzahl" as "plz", '
             f'COALESCE("Inbetriebnahmedatum", \'2018-01-01\') as "startDate", '
             'COALESCE("DatumEndgueltigeStilllegung", \'2050-01-01\') as "endDate" '
             f'"Nettonennleistung" as "maxPower", '
-            f'COALESCE("Laengengrad", {longitude}) as "lon", '
-            f'COALESCE("Breitengrad", {latitude}) as "lat" '
+            f'"Laengengrad" as "lon", '
+            f'"Breitengrad" as "lat" '
             f'FROM "EinheitenWasser" '
-            f'WHERE "Postleitzahl"::int in {plz_codes_str} AND '
+            f'WHERE "Postleitzahl"::int in {{plz_codes}} AND '
             f'"EinheitBetriebsstatus" >= 35 AND "ArtDerWasserkraftanlage" = 890 '
         )
 
@@ -599,31 +663,16 @@ class InfrastructureInterface:
             query += f'AND ("DatumEndgueltigeStilllegung" IS NULL OR "DatumEndgueltigeStilllegung"  > \'{stopped_after.isoformat()}\')'
 
         # Get Data from Postgres
-        with self.databases["mastr"].connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = self.read_area_sql("mastr", query, area)
 
         return df
 
     def get_water_storage_systems(
         self, area=800, created_before=None, stopped_after=None
     ):
-        if isinstance(area, str) and area.startswith("DE"):
-            plz_codes = self.get_plz_codes(area)
-            if not plz_codes:
-                raise Exception("invalid areas")
-        else:
-            plz_codes = [area]
-
-        for plz in plz_codes:
-            if plz not in self.plz_nuts.index:
-                raise Exception("invalid plz code")
-
-        latitude, longitude = self.get_lat_lon_area(area)
-        plz_codes_str = "', '".join([str(x) for x in plz_codes])
-        plz_codes_str = f"('{plz_codes_str}')"
-
         query = (
             f'SELECT "EinheitMastrNummer" as "unitID", '
+            f'"Postleitzahl" as "plz", '
             f'"LokationMastrNummer" as "locationID", '
             f'"SpeMastrNummer" as "storageID", '
             f'"NameStromerzeugungseinheit" as "name", '
@@ -631,11 +680,11 @@ class InfrastructureInterface:
             f'"Nettonennleistung" as "PMinus_max", '
             f'"NutzbareSpeicherkapazitaet" as "VMax", '
             f'"PumpbetriebLeistungsaufnahme" as "PPlus_max", '
-            f'COALESCE("Laengengrad", {longitude}) as "lon", '
-            f'COALESCE("Breitengrad", {latitude}) as "lat" '
+            f'"Laengengrad" as "lon", '
+            f'"Breitengrad" as "lat" '
             f'FROM "EinheitenStromSpeicher"'
             f'LEFT JOIN "AnlagenStromSpeicher" ON "EinheitMastrNummer" = "VerknuepfteEinheitenMastrNummern" '
-            f'WHERE "Postleitzahl"::int in {plz_codes_str} AND '
+            f'WHERE "Postleitzahl"::int in {{plz_codes}} AND '
             f'"EinheitBetriebsstatus" = 35 AND "Technologie" = 1537 AND "EinheitSystemstatus"=472 AND "Land"=84 '
             f'AND "Nettonennleistung" > 500'
         )
@@ -645,8 +694,7 @@ class InfrastructureInterface:
         if stopped_after:
             query += f'AND ("DatumEndgueltigeStilllegung" IS NULL OR "DatumEndgueltigeStilllegung"  > \'{stopped_after.isoformat()}\')'
         # Get Data from Postgres
-        with self.databases["mastr"].connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = self.read_area_sql("mastr", query, area)
 
         # If the response Dataframe is not empty set technical parameter
         if df.empty:
@@ -704,39 +752,38 @@ class InfrastructureInterface:
             return self.get_demand_in_area("DEB16")
         elif area == "DEB1D":
             return self.get_demand_in_area("DEB19")
+        if self.bulk_areas and area in self.bulk_areas:
+            query = f"""select nuts, sum(sector_consumption_residential) as household, sum(sector_consumption_retail) as business,
+                sum(sector_consumption_industrial) as industry, sum(sector_consumption_agricultural) as agriculture
+                from demand where version='v0.4.5' and ({self._bulk_nuts_filter("nuts")})
+                group by nuts
+                """
+            if query not in self._bulk_results:
+                self._bulk_results[query] = self.read_sql("oep", query)
+            df = self._bulk_results[query]
+            df = df[df["nuts"].str.startswith(area)].drop(columns="nuts")
+            df = pd.DataFrame([df.sum(min_count=1)])
+            # returned in GWh
+            return df * 1e3  # convert to MWh
+
         query = f"""select sum(sector_consumption_residential) as household, sum(sector_consumption_retail) as business,
                 sum(sector_consumption_industrial) as industry, sum(sector_consumption_agricultural) as agriculture
                 from demand where version='v0.4.5' and nuts LIKE '{area}%%'
                 """
-        with self.databases["oep"].connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = self.read_sql("oep", query)
         # returned in GWh
         return df * 1e3  # convert to MWh
 
     def get_solar_storage_systems_in_area(
         self, area, created_before=None, stopped_after=None
     ):
-        if isinstance(area, str) and area.startswith("DE"):
-            plz_codes = self.get_plz_codes(area)
-            if not plz_codes:
-                raise Exception("invalid areas")
-        else:
-            plz_codes = [area]
-
-        for plz in plz_codes:
-            if plz not in self.plz_nuts.index:
-                raise Exception("invalid plz code")
-
-        latitude, longitude = self.get_lat_lon_area(area)
-        plz_codes_str = "', '".join([str(x) for x in plz_codes])
-        plz_codes_str = f"('{plz_codes_str}')"
-
         query = (
             f'SELECT spe."LokationMastrNummer" as "unitID", '
+            f'so."Postleitzahl" as "plz", '
             f'so."Nettonennleistung" as "maxPower", '
             f'spe."Nettonennleistung" as "batPower", '
-            f'COALESCE(so."Laengengrad", {longitude}) as "lon", '
-            f'COALESCE(so."Breitengrad", {latitude}) as "lat", '
+            f'so."Laengengrad" as "lon", '
+            f'so."Breitengrad" as "lat", '
             f'COALESCE(so."Hauptausrichtung", 699) as "azimuthCode", '
             f'COALESCE(so."Leistungsbegrenzung", 802) as "limited", '
             f'COALESCE(so."Einspeisungsart", 689) as "ownConsumption", '
@@ -746,7 +793,7 @@ class InfrastructureInterface:
             f'FROM "EinheitenStromSpeicher" spe '
             f'INNER JOIN "EinheitenSolar" so ON spe."LokationMastrNummer" = so."LokationMastrNummer" '
             f'INNER JOIN "AnlagenStromSpeicher" an ON spe."SpeMastrNummer" = an."MastrNummer" '
-            f'WHERE so."Postleitzahl" in {plz_codes_str} '
+            f'WHERE so."Postleitzahl" in {{plz_codes}} '
             f'AND so."EinheitBetriebsstatus" >= 35 '
         )
 
@@ -756,8 +803,7 @@ class InfrastructureInterface:
             query += f'AND (so."DatumEndgueltigeStilllegung" IS NULL OR so."DatumEndgueltigeStilllegung" <= \'{stopped_after.isoformat()}\')'
 
         # Get Data from Postgres
-        with self.databases["mastr"].connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = self.read_area_sql("mastr", query, area)
 
         # If the response Dataframe is not empty set technical parameter
         if df.empty:
@@ -816,10 +862,7 @@ class InfrastructureInterface:
     ):
         """returns price of CO2 equivalents per ton from EU ETS trading"""
         query = f"SELECT date as time, eur_per_tco2 FROM eu_ets  WHERE date BETWEEN '{start.isoformat()}' AND '{end.isoformat()}'"
-        with self.databases["instrat_pl"].connect() as connection:
-            return pd.read_sql_query(query, connection, index_col="time")[
-                "eur_per_tco2"
-            ]
+        return self.read_sql("instrat_pl", query, index_col="time")["eur_per_tco2"]
 
     def get_coal_price(
         self,
@@ -828,10 +871,8 @@ class InfrastructureInterface:
     ):
         """returns coal price from instat_pl converted to €/kWh"""
         query = f"SELECT date as time, price_eur_per_kwh*1000 as price_eur_per_mwh FROM coal_price WHERE date BETWEEN '{start.isoformat()}' AND '{end.isoformat()}'"
-        with self.databases["instrat_pl"].connect() as connection:
-            return pd.read_sql_query(query, connection, index_col="time")[
-                "price_eur_per_mwh"
-            ]
+        df = self.read_sql("instrat_pl", query, index_col="time")
+        return df["price_eur_per_mwh"]
 
     def get_gas_price(
         self,
@@ -840,10 +881,8 @@ class InfrastructureInterface:
     ):
         """returns gas price from instrat_pl converted to €/MWh"""
         query = f"SELECT date as time, price_eur_per_kwh*1000 as price_eur_per_mwh FROM gas_price WHERE date BETWEEN '{start.isoformat()}' AND '{end.isoformat()}'"
-        with self.databases["instrat_pl"].connect() as connection:
-            return pd.read_sql_query(query, connection, index_col="time")[
-                "price_eur_per_mwh"
-            ]
+        df = self.read_sql("instrat_pl", query, index_col="time")
+        return df["price_eur_per_mwh"]
 
     def get_oil_price(
         self,
@@ -852,10 +891,7 @@ class InfrastructureInterface:
     ):
         """returns price of CO2 equivalents per ton from EU ETS trading"""
         query = f"SELECT date as time, euro_per_kwh*1000 as euro_per_mwh FROM opec WHERE date BETWEEN '{start.isoformat()}' AND '{end.isoformat()}'"
-        with self.databases["opec"].connect() as connection:
-            return pd.read_sql_query(query, connection, index_col="time")[
-                "euro_per_mwh"
-            ]
+        return self.read_sql("opec", query, index_col="time")["euro_per_mwh"]
 
     def get_weather_param(
         self,
@@ -866,14 +902,40 @@ class InfrastructureInterface:
     ):
         if isinstance(params, str):
             params = [params]
+        if self.bulk_areas and area in self.bulk_areas:
+            return self._get_bulk_weather_param(params, start, end, area)
         params = [f"avg({p}) as {p}" for p in params]
         selection = ", ".join(params)
         query = f"SELECT time, {selection} FROM ecmwf_eu  WHERE time BETWEEN '{start.isoformat()}' AND '{end.isoformat()}'"
         if area is not None:
             query += f" AND nuts_id LIKE '{area.upper()}%%'"
         query += "group by time order by time asc"
-        with self.databases["weather"].connect() as connection:
-            return pd.read_sql_query(query, connection, index_col="time")
+        return self.read_sql("weather", query, index_col="time")
+
+    def _get_bulk_weather_param(
+        self,
+        params: list[str],
+        start: datetime,
+        end: datetime,
+        area: str,
+    ):
+        # sums and counts per nuts area allow to average over any of the bulk areas
+        selection = ", ".join(
+            f"sum({p}) as {p}, count({p}) as {p}_count" for p in params
+        )
+        query = (
+            f"SELECT time, nuts_id, {selection} FROM ecmwf_eu "
+            f"WHERE time BETWEEN '{start.isoformat()}' AND '{end.isoformat()}' "
+            f"AND ({self._bulk_nuts_filter('nuts_id')}) "
+            "group by time, nuts_id"
+        )
+        if query not in self._bulk_results:
+            self._bulk_results[query] = self.read_sql("weather", query)
+        df = self._bulk_results[query]
+
+        df = df[df["nuts_id"].str.startswith(area.upper())]
+        sums = df.drop(columns="nuts_id").groupby("time").sum()
+        return pd.DataFrame({p: sums[p] / sums[f"{p}_count"] for p in params})
 
     def get_offshore_wind_series(self, start: datetime, end: datetime):
         area = "DEF02"
@@ -960,10 +1022,8 @@ WHERE
   index BETWEEN '{start}' AND '{end}' AND country = '{country}'
 ORDER BY 1
 """
-        with self.databases["entsoe"].connect() as connection:
-            return pd.read_sql_query(query, connection, index_col="time")[
-                "actual_load"
-            ].tz_localize(None)
+        df = self.read_sql("entsoe", query, index_col="time")
+        return df["actual_load"].tz_localize(None)
 
     def get_country_renewables(
         self,
@@ -983,8 +1043,7 @@ WHERE
   index BETWEEN '{start}' AND '{end}' AND country = '{country}'
 ORDER BY 1
 """
-        with self.databases["entsoe"].connect() as connection:
-            return pd.read_sql_query(query, connection, index_col="time")
+        return self.read_sql("entsoe", query, index_col="time")
 
     def get_grid_nodes(self):
         # get scigrid
@@ -994,84 +1053,102 @@ ORDER BY 1
         return {}
 
 
+def _sql_list(values) -> str:
+    values = "', '".join([str(x) for x in values])
+    return f"('{values}')"
+
+
 def get_wind_series(wind_systems: pd.DataFrame, weather_df: pd.DataFrame):
-    data = [
-        0.2 * np.ones(len(weather_df.index)),
-        weather_df["temp_air"],
-        weather_df["wind_speed"],
-    ]
-
-    # multiindex, second index is height of param
-    # TODO pressure could be added as well
-    columns = [["roughness_length", "temperature", "wind_speed"], [0, 2, 10]]
-    # temperature at 2m height
-    # and wind measured at 10m in ECMWF data
-    ww = pd.DataFrame(
-        np.asarray(data).T,
-        index=weather_df.index,
-        columns=columns,
-    )
+    """
+    Calculates the aggregated power of the wind turbines in kW.
+
+    All turbines use the standard power curve of an E-82 scaled to their nominal power,
+    so the turbines are grouped by hub height and the power curve is evaluated for all
+    hub heights at once. The wind speed at hub height follows the logarithmic profile
+    of the windpowerlib ModelChain with a roughness length of 0.2 m.
+
+    Args:
+        wind_systems (pd.DataFrame): The wind turbines with maxPower [kW], height and diameter.
+        weather_df (pd.DataFrame): The weather with wind speed measured at 10 m height.
+
+    Returns:
+        pd.Series: The aggregated wind power in kW.
+    """
+    wind_power = pd.Series(0.0, weather_df.index)
+    if wind_systems.empty:
+        return wind_power
 
-    wt = WindTurbine(82, turbine_type="E-82/2300")
     # todo get wind turbine types from database
-    wind_power = pd.Series(0, weather_df.index)
-    std_curve = wt.power_curve
-    std_curve["value"] = std_curve["value"] / wt.power_curve["value"].max()
-    for line, row in tqdm(wind_systems.iterrows(), total=len(wind_systems)):
-        max_power = row["maxPower"] * 1e3
-        diameter = float(row["diameter"])
-        height = float(row["height"])
-        if height <= 0:
-            # weird fix
-            height = max_power / 20
-
-        # small wind systems have no diameter set
-        if diameter <= 0:
-            diameter = height
-        if diameter / 2 > height:
-            diameter = height
-        p_curve = std_curve.copy()
-        p_curve["value"] = std_curve["value"] * max_power
-        wt = WindTurbine(
-            hub_height=height,
-            rotor_diameter=diameter,
-            nominal_power=max_power,
-            power_curve=p_curve,
-        )
-        mc = ModelChain(wt).run_model(ww)
-        wpower = mc.power_output / 1e3  # [W] -> [kW]
-        wind_power += wpower
+    wt = WindTurbine(82, turbine_type="E-82/2300")
+    curve_wind_speeds = wt.power_curve["wind_speed"].to_numpy(float)
+    curve_values = wt.power_curve["value"].to_numpy(float)
+    curve_values = curve_values / curve_values.max()
+
+    max_power = wind_systems["maxPower"].to_numpy(float) * 1e3
+    height = wind_systems["height"].to_numpy(float)
+    # weird fix
+    height = np.where(height <= 0, max_power / 20, height)
+
+    # the power curve model only depends on the hub height, the rotor diameter is not used
+    hub_heights, bucket = np.unique(height, return_inverse=True)
+    bucket_power = np.bincount(bucket, weights=max_power, minlength=len(hub_heights))
+
+    # wind measured at 10m in ECMWF data
+    roughness_length = 0.2
+    wind_speed = weather_df["wind_speed"].to_numpy(float)
+    wind_speed_hub = (
+        wind_speed[np.newaxis, :]
+        * np.log(hub_heights[:, np.newaxis] / roughness_length)
+        / np.log(10 / roughness_length)
+    )
+
+    # cut out above the highest wind speed of the power curve
+    power = np.interp(wind_speed_hub, curve_wind_speeds, curve_values, left=0, right=0)
+    wind_power[:] = bucket_power @ power / 1e3  # [W] -> [kW]
     return wind_power
 
 
 def get_solar_series(solar_systems: pd.DataFrame, weather_df: pd.DataFrame):
-    systems = []
-    solar_power = pd.Series(0, weather_df.index)
-    battery_power = pd.Series(0, weather_df.index)
+    """
+    Calculates the aggregated solar and battery power in kW.
+
+    The plane of array irradiance of all orientation groups is transposed in a single
+    array operation with the Hay-Davies model, as used by the PVSystem of pvlib.
+
+    Args:
+        solar_systems (pd.DataFrame): The solar systems with maxPower [kW], azimuth, tilt and optional batPower.
+        weather_df (pd.DataFrame): The weather with zenith, azimuth, dni, ghi and dhi.
+
+    Returns:
+        tuple[pd.Series, pd.Series]: The aggregated solar power and battery power in kW.
+    """
+    solar_power = pd.Series(0.0, weather_df.index)
+    battery_power = pd.Series(0.0, weather_df.index)
     if solar_systems.empty:
         return solar_power, battery_power
-    for info, group in tqdm(solar_systems.groupby(["azimuth", "tilt"])):
-        azimuth = int(info[0])
-        tilt = int(info[1])
-        maxPower = group["maxPower"].sum()  # in kW
-
-        if "batPower" in group.columns:
-            battery_power += group["batPower"].sum()
-        system = PVSystem(
-            surface_tilt=tilt,
-            surface_azimuth=azimuth,
-            module_parameters={"pdc0": maxPower},
-        )
-        systems.append(system)
-
-        ir = system.get_irradiance(
-            solar_zenith=weather_df["zenith"],
-            solar_azimuth=weather_df["azimuth"],
-            dni=weather_df["dni"],
-            ghi=weather_df["ghi"],
-            dhi=weather_df["dhi"],
-        )
-        solar_power += ir["poa_global"] * maxPower
+
+    groups = solar_systems.groupby(["azimuth", "tilt"])
+    max_power = groups["maxPower"].sum()  # in kW
+    if "batPower" in solar_systems.columns:
+        battery_power += groups["batPower"].sum().sum()
+
+    azimuth = max_power.index.get_level_values("azimuth").to_numpy(float).astype(int)
+    tilt = max_power.index.get_level_values("tilt").to_numpy(float).astype(int)
+
+    # orientations along the first axis, time along the second
+    ir = get_total_irradiance(
+        surface_tilt=tilt[:, np.newaxis],
+        surface_azimuth=azimuth[:, np.newaxis],
+        solar_zenith=weather_df["zenith"].to_numpy(float),
+        solar_azimuth=weather_df["azimuth"].to_numpy(float),
+        dni=weather_df["dni"].to_numpy(float),
+        ghi=weather_df["ghi"].to_numpy(float),
+        dhi=weather_df["dhi"].to_numpy(float),
+        dni_extra=get_extra_radiation(weather_df.index).to_numpy(float),
+        albedo=0.25,
+        model="haydavies",
+    )
+    solar_power[:] = max_power.to_numpy(float) @ ir["poa_global"]
     solar_power /= 1e3  # W -> kW
     return solar_power, battery_power
 
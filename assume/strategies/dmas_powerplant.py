@@ -13,6 +13,7 @@ from pyomo.environ import (
     Constraint,
     ConstraintList,
     Objective,
+    Param,
     Reals,
     Var,
     maximize,
@@ -27,6 +28,7 @@ from pyomo.opt import (
 )
 
 from assume.common.base import BaseStrategy, SupportsMinMax
+from assume.common.executors import get_executor
 from assume.common.market_objects import MarketConfig, Orderbook, Product
 
 logger = logging.getLogger(__name__)
@@ -49,13 +51,92 @@ def get_solver_factory(solvers_str=["appsi_highs", "gurobi", "glpk", "cbc", "cpl
     return SolverFactory(solvers[0])
 
 
+class _UnitParameters:
+    """
+    the technical parameters of a unit, which are needed to build the model in a worker process
+
+    Args:
+      unit(SupportsMinMax): unit to optimize
+      runtime(int): operation time at the start of the optimization
+      p0(float): power before the start of the optimization
+    """
+
+    attributes = [
+        "max_power",
+        "min_power",
+        "ramp_up",
+        "ramp_down",
+        "min_operating_time",
+        "min_down_time",
+        "efficiency",
+        "emission_factor",
+        "cold_start_cost",
+    ]
+
+    def __init__(self, unit: SupportsMinMax, runtime: int, p0: float):
+        for attribute in self.attributes:
+            setattr(self, attribute, getattr(unit, attribute))
+        self.runtime = runtime
+        self.p0 = p0
+
+    def get_operation_time(self, start: datetime) -> int:
+        return self.runtime
+
+    def get_output_before(self, start: datetime) -> float:
+        return self.p0
+
+
+_worker_strategy = None
+
+
+def _solve_step_in_worker(
+    unit: _UnitParameters,
+    start: datetime,
+    hour_count: int,
+    emission_prices: np.ndarray,
+    fuel_prices: np.ndarray,
+    power_prices: np.ndarray,
+) -> tuple:
+    """
+    solves the model of one price step in a worker process
+
+    Returns:
+      tuple: optimal flag, termination condition, power, start ups and objective value
+    """
+    global _worker_strategy
+    if _worker_strategy is None:
+        _worker_strategy = DmasPowerplantStrategy()
+
+    cashflow = _worker_strategy.build_model(
+        unit,
+        start,
+        hour_count,
+        emission_prices,
+        fuel_prices,
+        power_prices,
+        unit.runtime,
+        unit.p0,
+    )
+    _worker_strategy.model.obj = Objective(expr=quicksum(cashflow), sense=maximize)
+    return _worker_strategy._solve_model(hour_count)
+
+
 class DmasPowerplantStrategy(BaseStrategy):
-    def __init__(self, steps=[-10, -1, 0, 1, 10], *args, **kwargs):
+    def __init__(
+        self,
+        steps=[-10, -1, 0, 1, 10],
+        dmas_reuse_model: bool = True,
+        dmas_workers: int = 0,
+        *args,
+        **kwargs,
+    ):
         """
         Initializes the strategy
 
         Args:
             steps (list): list of steps to optimize
+            dmas_reuse_model (bool): build the model once per opening and only change the prices per step
+            dmas_workers (int): number of worker processes solving the steps, 0 solves them in this process
             *args (list): additional arguments
             **kwargs (dict): additional keyword arguments
         """
@@ -63,6 +144,8 @@ class DmasPowerplantStrategy(BaseStrategy):
         self.model = ConcreteModel("powerplant")
         self.opt = get_solver_factory()
         self.steps = steps
+        self.reuse_model = dmas_reuse_model
+        self.workers = int(dmas_workers)
         self.T = 24
         self.opt_results = {
             step: dict(
@@ -91,6 +174,7 @@ class DmasPowerplantStrategy(BaseStrategy):
         power_prices,
         runtime: int = None,
         p0: float = None,
+        mutable_prices: bool = False,
     ) -> None:
         """
         Builds the optimization model and returns the cashflow.
@@ -104,6 +188,7 @@ class DmasPowerplantStrategy(BaseStrategy):
             power_prices (numpy.ndarray): Power prices.
             runtime (int, optional): Runtime of the unit. Defaults to None.
             p0 (float, optional): Initial power. Defaults to None.
+            mutable_prices (bool, optional): Whether the power prices are a mutable parameter of the model. Defaults to False.
 
         Returns:
             np.array: Cashflow.
@@ -113,6 +198,13 @@ class DmasPowerplantStrategy(BaseStrategy):
         self.model.clear()
         tr = np.arange(hour_count)
 
+        if mutable_prices:
+            # the power prices can be changed without building the model again
+            self.model.power_price = Param(
+                tr, initialize={t: float(power_prices[t]) for t in tr}, mutable=True
+            )
+            power_prices = self.model.power_price
+
         delta = unit.max_power - unit.min_power
 
         self.model.p_out = Var(tr, bounds=(0, unit.max_power), within=Reals)
@@ -221,6 +313,108 @@ class DmasPowerplantStrategy(BaseStrategy):
 
         return cashflow
 
+    def _solve_model(self, hour_count: int) -> tuple:
+        """
+        solves the current model and returns its results
+
+        Args:
+            hour_count(int): number of hours to optimize
+
+        Returns:
+            tuple: optimal flag, termination condition, power, start ups and objective value
+        """
+        r = self.opt.solve(self.model)
+        optimal = (r.solver.status == SolverStatus.ok) and (
+            r.solver.termination_condition == TerminationCondition.optimal
+        )
+        if not optimal:
+            return False, r.solver.termination_condition, None, None, 0
+
+        tr = np.arange(hour_count)
+        power = np.asarray([self.model.p_out[t].value for t in tr])
+        start_ups = np.asarray([self.model.v[t].value for t in tr])
+        obj = value(self.model.obj)
+        return True, r.solver.termination_condition, power, start_ups, obj
+
+    def _solve_steps(
+        self,
+        unit: SupportsMinMax,
+        start: datetime,
+        hour_count: int,
+        emission_prices,
+        fuel_prices,
+        base_price,
+        steps,
+    ) -> dict[int, tuple]:
+        """
+        solves the model for all price steps
+
+        The steps are either fanned out to worker processes, solved with a model which is built once
+        and only gets its power prices changed per step, or solved with a newly built model per step.
+
+        Args:
+            unit(SupportsMinMax): unit to optimize
+            start(datetime.datetime): start time
+            hour_count(int): number of hours to optimize
+            emission_prices(numpy.ndarray): emission prices
+            fuel_prices(numpy.ndarray): fuel prices
+            base_price(numpy.ndarray): power prices without step
+            steps(tuple): steps to optimize
+
+        Returns:
+            dict[int, tuple]: the results of _solve_model for each step
+        """
+        base_price = np.asarray(base_price[:hour_count], dtype=float)
+
+        if self.workers > 0:
+            unit_parameters = _UnitParameters(
+                unit, unit.get_operation_time(start), unit.get_output_before(start)
+            )
+            futures = {
+                step: get_executor(self.workers).submit(
+                    _solve_step_in_worker,
+                    unit_parameters,
+                    start,
+                    hour_count,
+                    np.asarray(emission_prices, dtype=float),
+                    np.asarray(fuel_prices, dtype=float),
+                    base_price + step,
+                )
+                for step in steps
+            }
+            return {step: future.result() for step, future in futures.items()}
+
+        results = {}
+        if self.reuse_model:
+            cashflow = self.build_model(
+                unit,
+                start,
+                hour_count,
+                emission_prices,
+                fuel_prices,
+                base_price,
+                mutable_prices=True,
+            )
+            self.model.obj = Objective(expr=quicksum(cashflow), sense=maximize)
+            for step in steps:
+                for t, price in enumerate(base_price + step):
+                    self.model.power_price[t] = float(price)
+                results[step] = self._solve_model(hour_count)
+            return results
+
+        for step in steps:
+            cashflow = self.build_model(
+                unit,
+                start,
+                hour_count,
+                emission_prices,
+                fuel_prices,
+                base_price + step,
+            )
+            self.model.obj = Objective(expr=quicksum(cashflow), sense=maximize)
+            results[step] = self._solve_model(hour_count)
+        return results
+
     def _set_results(
         self,
         unit: SupportsMinMax,
@@ -230,6 +424,9 @@ class DmasPowerplantStrategy(BaseStrategy):
         start: datetime,
         step: int,
         hour_count: int,
+        power: np.ndarray,
+        start_ups: np.ndarray,
+        obj: float,
     ) -> None:
         """
         sets the results of the optimization
@@ -242,13 +439,14 @@ class DmasPowerplantStrategy(BaseStrategy):
             start(datetime.datetime): start time
             step(int): step
             hour_count(int): number of hours to optimize
+            power(numpy.ndarray): optimized output power
+            start_ups(numpy.ndarray): optimized start ups
+            obj(float): objective value
         Returns:
             None: None
 
         """
         # -> output power
-        tr = np.arange(hour_count)
-        power = np.asarray([self.model.p_out[t].value for t in tr])
         self.opt_results[step]["power"] = power
         # TODO rounding really needed?
         self.opt_results[step]["power"][power < 0.1] = 0
@@ -260,13 +458,11 @@ class DmasPowerplantStrategy(BaseStrategy):
         # -> fuel costs
         self.opt_results[step]["fuel"] = power / unit.efficiency * fuel_prices
         # -> start costs
-        self.opt_results[step]["start"] = np.asarray(
-            [self.model.v[t].value * unit.cold_start_cost for t in tr]
-        )
+        self.opt_results[step]["start"] = start_ups * unit.cold_start_cost
         # -> profit
         self.opt_results[step]["profit"] = power_prices * power
         # -> sum cashflow
-        self.opt_results[step]["obj"] = value(self.model.obj)
+        self.opt_results[step]["obj"] = obj
 
         if step == 0:
             end = start + unit.index.freq * (hour_count - 1)
@@ -317,21 +513,20 @@ class DmasPowerplantStrategy(BaseStrategy):
             logger.error(f"no price for {unit.fuel_type=} with {steps=} and {start=}")
             raise Exception(f"No Fuel prices given for fuel {unit.fuel_type}")
 
+        step_results = self._solve_steps(
+            unit,
+            start,
+            hour_count,
+            emission_prices.iloc[:hour_count],
+            fuel_prices.iloc[:hour_count],
+            base_price,
+            steps,
+        )
+
         for step in steps:
             adjusted_price = base_price[:hour_count] + step
-            cashflow = self.build_model(
-                unit,
-                start,
-                hour_count,
-                emission_prices.iloc[:hour_count],
-                fuel_prices.iloc[:hour_count],
-                adjusted_price,
-            )
-            self.model.obj = Objective(expr=quicksum(cashflow), sense=maximize)
-            r = self.opt.solve(self.model)
-            if (r.solver.status == SolverStatus.ok) and (
-                r.solver.termination_condition == TerminationCondition.optimal
-            ):
+            optimal, termination_condition, power, start_ups, obj = step_results[step]
+            if optimal:
                 logger.debug("find optimal solution in step: %s", step)
 
                 self._set_results(
@@ -342,6 +537,9 @@ class DmasPowerplantStrategy(BaseStrategy):
                     start=start,
                     step=step,
                     hour_count=hour_count,
+                    power=power,
+                    start_ups=start_ups,
+                    obj=obj,
                 )
 
                 if self.opt_results[step]["power"][-1] == 0 and step == 0:
@@ -411,10 +609,10 @@ class DmasPowerplantStrategy(BaseStrategy):
                         )
 
             else:
-                if r.solver.termination_condition == TerminationCondition.infeasible:
+                if termination_condition == TerminationCondition.infeasible:
                     logger.error(f"infeasible model in step: {step}")
                 else:
-                    logger.error(f"{step} - {r.solver}")
+                    logger.error(f"{step} - {termination_condition}")
                 for key in ["power", "emission", "fuel", "start", "profit"]:
                     self.opt_results[step][key] = np.zeros(self.T)
                 self.opt_results[step]["obj"] = 0
@@ -737,14 +935,11 @@ class DmasPowerplantStrategy(BaseStrategy):
             )
 
             # -> volume and price which is already in orderbook
-            normal_volume = df.loc[:, df.index.get_level_values("hour").isin(hours), :][
-                "volume"
-            ]
-            normal_price = df.loc[:, df.index.get_level_values("hour").isin(hours), :][
-                "price"
-            ]
+            in_hours = df.index.get_level_values("hour").isin(hours)
+            normal_volume = df["volume"][in_hours]
+            normal_price = df["price"][in_hours]
             # -> drop volume and price in these hours and build new orders
-            df = df.loc[~df.index.get_level_values("hour").isin(hours)]
+            df = df[~in_hours]
             # -> get last block to link on
             last_block = (
                 max(df.index.get_level_values("block_id").values) if len(df) > 0 else -1
@@ -763,9 +958,10 @@ class DmasPowerplantStrategy(BaseStrategy):
                 )
             last_block = block_number
             block_number += 1
-            for index in normal_volume.index:
-                vol = normal_volume.loc[index] - unit.min_power
-                prc = normal_price.loc[index]
+            for index, vol, prc in zip(
+                normal_volume.index, normal_volume.values, normal_price.values
+            ):
+                vol -= unit.min_power
                 _, hour, _ = index
                 if vol > 0:
                     prev_order[(block_number, hour, unit.id)] = (
@@ -786,12 +982,11 @@ class DmasPowerplantStrategy(BaseStrategy):
             df.loc[df["price"] < -500 / 1e3, "price"] = -500 / 1e3
         if not df.empty:
             df = df.reset_index()
-            df["start_time"] = df.apply(
-                lambda o: start + timedelta(hours=o["hour"]), axis=1
-            )
-            df["end_time"] = df.apply(
-                lambda o: start + timedelta(hours=o["hour"]) + unit.index.freq, axis=1
-            )
+            start_times = [start + timedelta(hours=int(hour)) for hour in df["hour"]]
+            df["start_time"] = start_times
+            df["end_time"] = [
+                start_time + unit.index.freq for start_time in start_times
+            ]
             del df["hour"]
             df["exclusive_id"] = None
         df["unit_id"] = unit.id
@@ -7,10 +7,75 @@ from datetime import datetime, timedelta
 import numpy as np
 
 from assume.common.base import BaseStrategy, SupportsMinMax
+from assume.common.fast_pandas import FastSeries
 from assume.common.market_objects import MarketConfig, Orderbook, Product
 from assume.common.utils import get_products_index, parse_duration
 
 
+class ForesightIndex:
+    """
+    Rolling window sums of a forecast, calculated from its prefix sums.
+
+    The sums over the foresight of all products of an opening are a single array lookup
+    instead of one slice and reduction per product.
+
+    Args:
+        series (FastSeries): The forecast series.
+    """
+
+    def __init__(self, series: FastSeries):
+        self.series = series
+        self.index = series.index
+        self.prefix_sum = np.concatenate(
+            ([0.0], np.cumsum(np.asarray(series.data, dtype=float)))
+        )
+
+    def window_sums(
+        self, starts: list[datetime], before: timedelta, after: timedelta
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the sums and lengths of the windows around the given start times.
+
+        The windows include both ends and are clipped to the index of the forecast.
+
+        Args:
+            starts (list[datetime.datetime]): The start times of the products.
+            before (datetime.timedelta): The duration before the start included in the window.
+            after (datetime.timedelta): The duration after the start included in the window.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The window sums and the number of values per window.
+        """
+        positions = np.array([self.index._get_idx_from_date(t) for t in starts])
+        first = np.maximum(positions - before // self.index.freq, 0)
+        last = (
+            np.minimum(positions + after // self.index.freq, len(self.index) - 1) + 1
+        )
+
+        return self.prefix_sum[last] - self.prefix_sum[first], last - first
+
+
+def get_foresight_index(
+    cache: dict[str, ForesightIndex], key: str, series: FastSeries
+) -> ForesightIndex:
+    """
+    Returns the foresight index of a series and creates it if the series has changed.
+
+    Args:
+        cache (dict[str, ForesightIndex]): The foresight indices of a strategy.
+        key (str): The key of the series, e.g. the market id.
+        series (FastSeries): The forecast series.
+
+    Returns:
+        ForesightIndex: The foresight index of the series.
+    """
+    foresight_index = cache.get(key)
+    if foresight_index is None or foresight_index.series is not series:
+        foresight_index = ForesightIndex(series)
+        cache[key] = foresight_index
+    return foresight_index
+
+
 class flexableEOM(BaseStrategy):
     """
     A strategy that bids on the EOM-market.
@@ -28,6 +93,7 @@ class flexableEOM(BaseStrategy):
 
         # check if kwargs contains eom_foresight argument
         self.foresight = parse_duration(kwargs.get("eom_foresight", "12h"))
+        self.foresight_indices = {}
 
     def calculate_bids(
         self,
@@ -64,9 +130,22 @@ class flexableEOM(BaseStrategy):
 
         op_time = unit.get_operation_time(start)
 
+        # sum of the price forecast within the foresight of each product
+        price_sums, window_lengths = get_foresight_index(
+            self.foresight_indices,
+            market_config.market_id,
+            unit.forecaster[f"price_{market_config.market_id}"],
+        ).window_sums(
+            [product[0] for product in product_tuples], timedelta(), self.foresight
+        )
+
         bids = []
-        for product, min_power, max_power in zip(
-            product_tuples, min_power_values, max_power_values
+        for product, min_power, max_power, price_sum, window_length in zip(
+            product_tuples,
+            min_power_values,
+            max_power_values,
+            price_sums,
+            window_lengths,
         ):
             bid_quantity_inflex, bid_price_inflex = 0, 0
             bid_quantity_flex, bid_price_flex = 0, 0
@@ -110,6 +189,7 @@ class flexableEOM(BaseStrategy):
                     marginal_cost_flex=marginal_cost_flex,
                     bid_quantity_inflex=bid_quantity_inflex,
                     foresight=self.foresight,
+                    possible_revenue=price_sum - marginal_cost_flex * window_length,
                 )
             else:
                 bid_price_inflex = calculate_EOM_price_if_off(
@@ -259,6 +339,7 @@ class flexablePosCRM(BaseStrategy):
 
         # check if kwargs contains crm_foresight argument
         self.foresight = parse_duration(kwargs.get("crm_foresight", "4h"))
+        self.foresight_indices = {}
 
     def calculate_bids(
         self,
@@ -291,8 +372,19 @@ class flexablePosCRM(BaseStrategy):
             start, end, market_config.product_type
         )  # get max_power for the product type
 
+        # sum of the price forecast within the foresight of each product
+        price_sums, window_lengths = get_foresight_index(
+            self.foresight_indices,
+            market_config.market_id,
+            unit.forecaster[f"price_{market_config.market_id}"],
+        ).window_sums(
+            [product[0] for product in product_tuples], timedelta(), self.foresight
+        )
+
         bids = []
-        for product, max_power in zip(product_tuples, max_power_values):
+        for product, max_power, price_sum, window_length in zip(
+            product_tuples, max_power_values, price_sums, window_lengths
+        ):
             start = product[0]
             op_time = unit.get_operation_time(start)
 
@@ -311,12 +403,7 @@ class flexablePosCRM(BaseStrategy):
                 previous_power + bid_quantity,
             )
             # Specific revenue if power was offered on the energy market
-            specific_revenue = get_specific_revenue(
-                price_forecast=unit.forecaster[f"price_{market_config.market_id}"],
-                marginal_cost=marginal_cost,
-                t=start,
-                foresight=self.foresight,
-            )
+            specific_revenue = price_sum - marginal_cost * window_length
 
             if specific_revenue >= 0:
                 capacity_price = specific_revenue
@@ -374,6 +461,7 @@ class flexableNegCRM(BaseStrategy):
 
         # check if kwargs contains crm_foresight argument
         self.foresight = parse_duration(kwargs.get("crm_foresight", "4h"))
+        self.foresight_indices = {}
 
     def calculate_bids(
         self,
@@ -402,8 +490,19 @@ class flexableNegCRM(BaseStrategy):
         previous_power = unit.get_output_before(start)
         min_power_values, _ = unit.calculate_min_max_power(start, end)
 
+        # sum of the price forecast within the foresight of each product
+        price_sums, window_lengths = get_foresight_index(
+            self.foresight_indices,
+            market_config.market_id,
+            unit.forecaster[f"price_{market_config.market_id}"],
+        ).window_sums(
+            [product[0] for product in product_tuples], timedelta(), self.foresight
+        )
+
         bids = []
-        for product, min_power in zip(product_tuples, min_power_values):
+        for product, min_power, price_sum, window_length in zip(
+            product_tuples, min_power_values, price_sums, window_lengths
+        ):
             start = product[0]
             op_time = unit.get_operation_time(start)
             current_power = unit.outputs["energy"].at[start]
@@ -422,12 +521,7 @@ class flexableNegCRM(BaseStrategy):
             )
 
             # Specific revenue if power was offered on the energy market
-            specific_revenue = get_specific_revenue(
-                price_forecast=unit.forecaster[f"price_{market_config.market_id}"],
-                marginal_cost=marginal_cost,
-                t=start,
-                foresight=self.foresight,
-            )
+            specific_revenue = price_sum - marginal_cost * window_length
 
             if specific_revenue < 0:
                 capacity_price = (
@@ -517,6 +611,7 @@ def calculate_EOM_price_if_on(
     marginal_cost_flex,
     bid_quantity_inflex,
     foresight,
+    possible_revenue: float | None = None,
 ):
     """
     The powerplant is currently on and calculates a price reduction to prevent shutdowns.
@@ -535,6 +630,7 @@ def calculate_EOM_price_if_on(
         marginal_cost_flex (float): The marginal cost of the unit.
         bid_quantity_inflex (float): The bid quantity of the unit.
         foresight (datetime.timedelta): The foresight of the unit.
+        possible_revenue (float, optional): The specific revenue within the foresight, calculated if not given.
 
     Returns:
         float: The inflexible bid price of the unit.
@@ -556,12 +652,13 @@ def calculate_EOM_price_if_on(
     else:
         heat_gen_cost = 0.0
 
-    possible_revenue = get_specific_revenue(
-        price_forecast=unit.forecaster[f"price_{market_id}"],
-        marginal_cost=marginal_cost_flex,
-        t=start,
-        foresight=foresight,
-    )
+    if possible_revenue is None:
+        possible_revenue = get_specific_revenue(
+            price_forecast=unit.forecaster[f"price_{market_id}"],
+            marginal_cost=marginal_cost_flex,
+            t=start,
+            foresight=foresight,
+        )
     if (
         possible_revenue >= 0
         and unit.forecaster[f"price_{market_id}"].at[start] < marginal_cost_flex
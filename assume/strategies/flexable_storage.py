@@ -9,6 +9,7 @@ import numpy as np
 from assume.common.base import BaseStrategy, SupportsMinMaxCharge
 from assume.common.market_objects import MarketConfig, Orderbook, Product
 from assume.common.utils import parse_duration
+from assume.strategies.flexable import get_foresight_index
 
 
 class flexableEOMStorage(BaseStrategy):
@@ -32,6 +33,7 @@ class flexableEOMStorage(BaseStrategy):
         super().__init__(*args, **kwargs)
 
         self.foresight = parse_duration(kwargs.get("eom_foresight", "12h"))
+        self.foresight_indices = {}
 
     def calculate_bids(
         self,
@@ -65,8 +67,17 @@ class flexableEOMStorage(BaseStrategy):
         theoretic_SOC = unit.outputs["soc"].at[start]
         previous_power = unit.get_output_before(start)
 
+        price_forecast = unit.forecaster[f"price_{market_config.market_id}"]
+        # average price within the foresight around each product
+        price_sums, window_lengths = get_foresight_index(
+            self.foresight_indices, market_config.market_id, price_forecast
+        ).window_sums(
+            [product[0] for product in product_tuples], self.foresight, self.foresight
+        )
+        average_prices = price_sums / window_lengths
+
         bids = []
-        for product in product_tuples:
+        for product, average_price in zip(product_tuples, average_prices):
             start, end = product[0], product[1]
 
             current_power = unit.outputs["energy"].at[start]
@@ -119,14 +130,6 @@ class flexableEOMStorage(BaseStrategy):
                 current_power_charge,
                 min_power_charge,
             )
-            price_forecast = unit.forecaster[f"price_{market_config.market_id}"]
-
-            # calculate average price
-            average_price = calculate_price_average(
-                current_time=start,
-                foresight=self.foresight,
-                price_forecast=price_forecast,
-            )
 
             # if price is higher than average price, discharge
             # if price is lower than average price, charge
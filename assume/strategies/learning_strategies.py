@@ -11,9 +11,9 @@ import torch as th
 
 from assume.common.base import LearningStrategy, SupportsMinMax, SupportsMinMaxCharge
 from assume.common.market_objects import MarketConfig, Orderbook, Product
-from assume.common.utils import min_max_scale
 from assume.reinforcement_learning.algorithms import actor_architecture_aliases
 from assume.reinforcement_learning.learning_utils import NormalActionNoise
+from assume.reinforcement_learning.observation_engine import ObservationEngine
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,10 @@ class BaseLearningStrategy(LearningStrategy):
         # float_type = kwargs.get("float_type", "float32")
         self.float_type = th.float
 
+        # precomputes forecast windows and price history, can be shared between the
+        # strategies of a units operator to gather all observations at once
+        self.observation_engine = None
+
         if self.learning_mode or self.evaluation_mode:
             self.collect_initial_experience_mode = bool(
                 kwargs.get("episodes_collecting_initial_experience", True)
@@ -95,27 +99,34 @@ class BaseLearningStrategy(LearningStrategy):
         self.actor.load_state_dict(params["actor"])
         self.actor.eval()  # set the actor to evaluation mode
 
-    def prepare_observations(self, unit, market_id):
-        # scaling factors for the observations
-        upper_scaling_factor_price = max(unit.forecaster[f"price_{market_id}"])
-        lower_scaling_factor_price = min(unit.forecaster[f"price_{market_id}"])
-        upper_scaling_factor_res_load = max(
-            unit.forecaster[f"residual_load_{market_id}"]
-        )
-        lower_scaling_factor_res_load = min(
-            unit.forecaster[f"residual_load_{market_id}"]
-        )
+    def get_observation_slot(self, unit, market_id: str) -> int:
+        """
+        Registers the unit in the observation engine and returns its slot.
 
-        self.scaled_res_load_obs = min_max_scale(
-            unit.forecaster[f"residual_load_{market_id}"],
-            lower_scaling_factor_res_load,
-            upper_scaling_factor_res_load,
-        )
+        If no engine was assigned by the units operator, a private one is created.
+
+        Args:
+            unit (BaseUnit): The unit to register.
+            market_id (str): The id of the market the observations are created for.
 
-        self.scaled_prices_obs = min_max_scale(
-            unit.forecaster[f"price_{market_id}"],
-            lower_scaling_factor_price,
-            upper_scaling_factor_price,
+        Returns:
+            int: The slot of the unit in the observation engine.
+        """
+        if self.observation_engine is None:
+            self.observation_engine = ObservationEngine(
+                foresight=self.foresight,
+                float_type=self.float_type,
+                device=self.device,
+            )
+
+        return self.observation_engine.register(
+            unit_id=unit.id,
+            market_id=market_id,
+            index=unit.index,
+            residual_load=unit.forecaster[f"residual_load_{market_id}"],
+            price=unit.forecaster[f"price_{market_id}"],
+            accepted_price=unit.outputs["energy_accepted_price"],
+            max_bid_price=self.max_bid_price,
         )
 
 
@@ -416,72 +427,10 @@ class RLStrategy(BaseLearningStrategy):
         the total capacity and marginal cost, scaled by maximum power and bid price, respectively.
         """
 
-        # check if scaled observations are already available and if not prepare them
-        if not hasattr(self, "scaled_res_load_obs") or not hasattr(
-            self, "scaled_prices_obs"
-        ):
-            self.prepare_observations(unit, market_id)
-
-        # get the forecast length depending on the tme unit considered in the modelled unit
-        forecast_len = (self.foresight - 1) * unit.index.freq
-
-        # =============================================================================
-        # 1.1 Get the Observations, which are the basis of the action decision
-        # =============================================================================
-
-        # checks if we are at end of simulation horizon, since we need to change the forecast then
-        # for residual load and price forecast and scale them
-        if start + forecast_len > self.scaled_res_load_obs.index[-1]:
-            scaled_res_load_forecast = self.scaled_res_load_obs.loc[start:]
-
-            scaled_res_load_forecast = np.concatenate(
-                [
-                    scaled_res_load_forecast,
-                    self.scaled_res_load_obs.iloc[
-                        : self.foresight - len(scaled_res_load_forecast)
-                    ],
-                ]
-            )
-
-        else:
-            scaled_res_load_forecast = self.scaled_res_load_obs.loc[
-                start : start + forecast_len
-            ]
-
-        if start + forecast_len > self.scaled_prices_obs.index[-1]:
-            scaled_price_forecast = self.scaled_prices_obs.loc[start:]
-            scaled_price_forecast = np.concatenate(
-                [
-                    scaled_price_forecast,
-                    self.scaled_prices_obs.iloc[
-                        : self.foresight - len(scaled_price_forecast)
-                    ],
-                ]
-            )
-
-        else:
-            scaled_price_forecast = self.scaled_prices_obs.loc[
-                start : start + forecast_len
-            ]
-
-        # collect historical past market clearing prices
-        actual_price = unit.outputs["energy_accepted_price"]
-        if start - forecast_len < actual_price.index[0]:
-            # Not enough historical data, use available actual prices and prepend forecasted values for missing past data
-            actual_price_history = actual_price.loc[:start] / self.max_bid_price
-            missing_values = self.foresight - len(actual_price_history)
-
-            if missing_values > 0:
-                forecasted_prices = self.scaled_prices_obs.iloc[:missing_values]
-                actual_price_history = np.concatenate(
-                    [forecasted_prices, actual_price_history]
-                )
-
-        else:
-            # Sufficient historical data exists, collect past actual prices
-            actual_price_history = (
-                actual_price.loc[start - forecast_len : start] / self.max_bid_price
-            )
+        # get the slot of the unit in the observation engine, which precomputes the
+        # forecast windows and keeps the history of accepted prices
+        slot = self.get_observation_slot(unit, market_id)
+        t = self.observation_engine.timestep(slot, start)
 
         # get last accepted bid volume and the current marginal costs of the unit
         current_volume = unit.get_output_before(start)
@@ -494,21 +443,11 @@ class RLStrategy(BaseLearningStrategy):
         # marginal cost
         scaled_marginal_cost = current_costs / self.max_bid_price
 
-        # concat all obsverations into one array
-        observation = np.concatenate(
-            [
-                scaled_res_load_forecast,
-                scaled_price_forecast,
-                actual_price_history,
-                np.array([scaled_total_dispatch, scaled_marginal_cost]),
-            ]
+        # concat forecast windows, price history and unit state into one tensor
+        observation = self.observation_engine.observation(
+            slot, t, [scaled_total_dispatch, scaled_marginal_cost]
         )
 
-        # transfer array to GPU for NN processing
-        observation = th.as_tensor(
-            observation, dtype=self.float_type, device=self.device
-        ).flatten()
-
         return observation
 
     def calculate_reward(
@@ -1089,90 +1028,18 @@ class StorageRLStrategy(BaseLearningStrategy):
         the agent's action selection.
         """
 
-        # check if scaled observations are already available and if not prepare them
-        if not hasattr(self, "scaled_res_load_obs") or not hasattr(
-            self, "scaled_prices_obs"
-        ):
-            self.prepare_observations(unit, market_id)
-
-        # get the forecast length depending on the tme unit considered in the modelled unit
-        forecast_len = (self.foresight - 1) * unit.index.freq
-
-        # =============================================================================
-        # 1.1 Get the Observations, which are the basis of the action decision
-        # =============================================================================
-
-        # checks if we are at end of simulation horizon, since we need to change the forecast then
-        # for residual load and price forecast and scale them
-        if start + forecast_len > self.scaled_res_load_obs.index[-1]:
-            scaled_res_load_forecast = self.scaled_res_load_obs.loc[start:]
-
-            scaled_res_load_forecast = np.concatenate(
-                [
-                    scaled_res_load_forecast,
-                    self.scaled_res_load_obs.iloc[
-                        : self.foresight - len(scaled_res_load_forecast)
-                    ],
-                ]
-            )
-
-        else:
-            scaled_res_load_forecast = self.scaled_res_load_obs.loc[
-                start : start + forecast_len
-            ]
-
-        if start + forecast_len > self.scaled_prices_obs.index[-1]:
-            scaled_price_forecast = self.scaled_prices_obs.loc[start:]
-            scaled_price_forecast = np.concatenate(
-                [
-                    scaled_price_forecast,
-                    self.scaled_prices_obs.iloc[
-                        : self.foresight - len(scaled_price_forecast)
-                    ],
-                ]
-            )
-
-        else:
-            scaled_price_forecast = self.scaled_prices_obs.loc[
-                start : start + forecast_len
-            ]
-
-        # collect historical past market clearing prices
-        actual_price = unit.outputs["energy_accepted_price"]
-        if start - forecast_len < actual_price.index[0]:
-            # Not enough historical data, use available actual prices and prepend forecasted values for missing past data
-            actual_price_history = actual_price.loc[:start] / self.max_bid_price
-            missing_values = self.foresight - len(actual_price_history)
-
-            if missing_values > 0:
-                forecasted_prices = self.scaled_prices_obs.iloc[:missing_values]
-                actual_price_history = np.concatenate(
-                    [forecasted_prices, actual_price_history]
-                )
-
-        else:
-            # Sufficient historical data exists, collect past actual prices
-            actual_price_history = (
-                actual_price.loc[start - forecast_len : start] / self.max_bid_price
-            )
+        # get the slot of the unit in the observation engine, which precomputes the
+        # forecast windows and keeps the history of accepted prices
+        slot = self.get_observation_slot(unit, market_id)
+        t = self.observation_engine.timestep(slot, start)
 
         # get the current soc value
         soc_scaled = unit.outputs["soc"].at[start] / unit.max_soc
         energy_cost_scaled = unit.outputs["energy_cost"].at[start] / self.max_bid_price
 
-        # concat all obsverations into one array
-        observation = np.concatenate(
-            [
-                scaled_res_load_forecast,
-                scaled_price_forecast,
-                actual_price_history,
-                np.array([soc_scaled, energy_cost_scaled]),
-            ]
+        # concat forecast windows, price history and unit state into one tensor
+        observation = self.observation_engine.observation(
+            slot, t, [soc_scaled, energy_cost_scaled]
         )
 
-        # transfer array to GPU for NN processing
-        observation = th.as_tensor(
-            observation, dtype=self.float_type, device=self.device
-        ).flatten()
-
         return observation
@@ -159,19 +159,19 @@ class Building(DSMFlex, SupportsMinMax):
         """
         self.model.electricity_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.electricity_price)},
+            initialize=self.time_series_values(self.electricity_price),
         )
         self.model.natural_gas_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.natural_gas_price)},
+            initialize=self.time_series_values(self.natural_gas_price),
         )
         self.model.heat_demand = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.heat_demand)},
+            initialize=self.time_series_values(self.heat_demand),
         )
         self.model.inflex_demand = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.inflex_demand)},
+            initialize=self.time_series_values(self.inflex_demand),
         )
 
     def define_variables(self):
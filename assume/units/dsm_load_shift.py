@@ -2,10 +2,16 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import hashlib
 import logging
+import multiprocessing
+import os
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
+import numpy as np
 import pyomo.environ as pyo
 from pyomo.opt import (
     SolverFactory,
@@ -37,10 +43,30 @@ class DSMFlex:
     }
     big_M = 10000000
 
-    def __init__(self, components, **kwargs):
+    def __init__(
+        self,
+        components,
+        optimal_operation: dict | None = None,
+        cache_path: str | None = None,
+        horizon_window: int = 0,
+        horizon_overlap: int = 0,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
 
         self.components = components
+        # results of a previous solve, e.g. from presolve_dsm_units, which are used instead of solving again
+        self.presolved_operation = optimal_operation
+        self.result_cache = get_result_cache(cache_path) if cache_path else None
+        self.cache_key = None
+
+        # rolling horizon mode, a window of 0 solves the whole index at once
+        self.horizon_window = int(horizon_window)
+        self.horizon_overlap = int(horizon_overlap)
+        # time steps of the current model, the committed ones and their share of the whole index
+        self.model_time_steps = None
+        self.committed_time_steps = None
+        self.horizon_share = 1.0
 
         self.initialize_solver()
 
@@ -61,6 +87,7 @@ class DSMFlex:
             self.solver_options = {"output_flag": False, "log_to_console": False}
         else:
             self.solver_options = {}
+        self.solver_name = solver
         self.solver = SolverFactory(solver)
 
     def initialize_components(self):
@@ -105,6 +132,61 @@ class DSMFlex:
         # along with optimal and flexibility constraints
         # and the objective functions
 
+        # in rolling horizon mode the models are built per window when solving
+        if self.horizon_window:
+            if self.result_cache is not None:
+                # the cache key covers the parameters of a model spanning the whole index
+                logger.warning(
+                    "The DSM result cache is not used for %s, as it is solved with a rolling horizon.",
+                    self.id,
+                )
+                self.result_cache = None
+            self.setup_rolling_horizon(presolve)
+            return
+
+        # hash the component parameters before they are replaced by the component instances
+        components_hash = hashlib.sha256()
+        _update_hash(components_hash, self.components)
+
+        self.build_model()
+
+        if self.result_cache is not None:
+            self.cache_key = self.calculate_cache_key(components_hash.hexdigest())
+
+        # Solve the model to determine the optimal operation without flexibility
+        # and store the results to be used in the flexibility mode later
+        if presolve and self.presolved_operation is not None:
+            self.set_optimal_operation(self.presolved_operation)
+        elif presolve:
+            self.determine_optimal_operation_without_flex(switch_flex_off=False)
+
+        self.add_flexibility_measure()
+
+    def build_model(
+        self,
+        time_steps: range | None = None,
+        committed_time_steps: range | None = None,
+    ) -> None:
+        """
+        Builds the Pyomo model with the optimal constraints and objective.
+
+        Aggregated demands are split according to the share of the committed time steps
+        and only enforced on them, see :meth:`demand_time_steps`.
+
+        Args:
+            time_steps (range, optional): The positions in the index covered by the model. Defaults to the whole index.
+            committed_time_steps (range, optional): The positions whose results are kept. Defaults to the time steps.
+        """
+        if committed_time_steps is None:
+            committed_time_steps = time_steps
+        self.model_time_steps = time_steps
+        self.committed_time_steps = committed_time_steps
+        self.horizon_share = (
+            1.0
+            if committed_time_steps is None
+            else len(committed_time_steps) / len(self.index)
+        )
+
         self.model = pyo.ConcreteModel()
         self.define_sets()
         self.define_parameters()
@@ -116,11 +198,21 @@ class DSMFlex:
         self.define_constraints()
         self.define_objective_opt()
 
-        # Solve the model to determine the optimal operation without flexibility
-        # and store the results to be used in the flexibility mode later
-        if presolve:
-            self.determine_optimal_operation_without_flex(switch_flex_off=False)
+    def demand_time_steps(self):
+        """
+        Returns the time steps of the current model on which aggregated demands are enforced.
+
+        In a rolling horizon, the results of the overlap at the end of a window are
+        discarded, so the share of the demand of a window has to be met before it.
+        """
+        if self.committed_time_steps is None:
+            return self.model.time_steps
+        return self.committed_time_steps
 
+    def add_flexibility_measure(self) -> None:
+        """
+        Adds the constraints and the objective of the flexibility measure to the model.
+        """
         # Modify the model to include the flexibility measure constraints
         # as well as add a new objective function to the model
         # to maximize the flexibility measure
@@ -129,13 +221,236 @@ class DSMFlex:
         else:
             raise ValueError(f"Unknown flexibility measure: {self.flexibility_measure}")
 
+    def setup_rolling_horizon(self, presolve=True) -> None:
+        """
+        Prepares the rolling horizon mode and solves the optimal operation window by window.
+
+        Instead of one model spanning the whole index, models of ``horizon_window`` time steps
+        are built and solved consecutively. Consecutive windows overlap by ``horizon_overlap``
+        time steps, of which only the results of the earlier window are discarded.
+
+        Args:
+            presolve (bool, optional): Whether the optimal operation is determined. Defaults to True.
+        """
+        if not 0 <= self.horizon_overlap < self.horizon_window:
+            raise ValueError(
+                f"The horizon overlap {self.horizon_overlap} must be smaller than the horizon window {self.horizon_window}."
+            )
+        if "hydrogen_seasonal_storage" in self.components:
+            raise ValueError(
+                "Seasonal storages require the whole horizon and cannot be solved with a rolling horizon."
+            )
+
+        # keep the component parameters, as the components are replaced by their instances
+        self.component_data = {
+            technology: dict(data) for technology, data in self.components.items()
+        }
+
+        if presolve and self.presolved_operation is None:
+            self.determine_optimal_operation_without_flex()
+            return
+
+        if presolve:
+            self.set_optimal_operation(self.presolved_operation)
+        # the model of the first window describes the structure of the unit
+        self.components = dict(self.component_data)
+        n_steps = len(self.index)
+        end = min(self.horizon_window, n_steps)
+        committed_end = end if end == n_steps else end - self.horizon_overlap
+        self.build_model(range(end), range(committed_end))
+
+    def solve_rolling_horizon(self, with_flex: bool = False) -> None:
+        """
+        Solves the operation of the unit with consecutive models of the rolling horizon.
+
+        The state of charge of storages, the operational status of components and how long
+        they have been in this status at the last committed time step are carried over as
+        initial state of the next window. Aggregated demands are split over the windows
+        according to their committed length and only enforced on the committed time steps.
+
+        Args:
+            with_flex (bool, optional): Whether the operation with the flexibility measure is solved. Defaults to False.
+        """
+        n_steps = len(self.index)
+        step = self.horizon_window - self.horizon_overlap
+        power = np.zeros(n_steps)
+        variable_cost = np.zeros(n_steps)
+        state = {}
+
+        for start in range(0, n_steps, step):
+            end = min(start + self.horizon_window, n_steps)
+            committed_end = end if end == n_steps else start + step
+
+            self.components = {
+                technology: {**data, **state.get(technology, {})}
+                for technology, data in self.component_data.items()
+            }
+            self.build_model(range(start, end), range(start, committed_end))
+
+            if with_flex:
+                self.add_flexibility_measure()
+                instance = self.switch_to_flex(self.model.create_instance())
+                self._solve_instance(instance, instance.obj_rule_flex)
+            else:
+                instance = self.model.create_instance()
+                self._solve_instance(instance, instance.obj_rule_opt)
+
+            for t in range(start, committed_end):
+                power[t] = pyo.value(instance.total_power_input[t])
+                if with_flex:
+                    power[t] += pyo.value(instance.load_shift_pos[t]) - pyo.value(
+                        instance.load_shift_neg[t]
+                    )
+                variable_cost[t] = pyo.value(instance.variable_cost[t])
+
+            state = self._get_component_state(instance, start, committed_end - 1, state)
+
+            if end == n_steps:
+                break
+
+        if with_flex:
+            self.flex_power_requirement = FastSeries(index=self.index, value=power)
+            self.flex_variable_cost_series = FastSeries(
+                index=self.index, value=variable_cost
+            )
+        else:
+            self.opt_power_requirement = FastSeries(index=self.index, value=power)
+            self.variable_cost_series = FastSeries(
+                index=self.index, value=variable_cost
+            )
+            self.total_cost = float(variable_cost.sum())
+
+    def _get_component_state(
+        self, instance, start: int, t: int, previous_state: dict[str, dict]
+    ) -> dict[str, dict]:
+        """
+        Returns the state of the components at a time step as initial parameters of the next window.
+
+        Besides the operational status, the number of consecutive time steps the component
+        has been in this status is returned as ``initial_run_steps``, so that minimum up and
+        down times span the window boundaries. It is None if the run started before the
+        first window, where the initial status is assumed to be held long enough.
+
+        Args:
+            instance (pyomo.ConcreteModel): The solved instance of the window.
+            start (int): The first time step of the window.
+            t (int): The last committed time step of the window.
+            previous_state (dict[str, dict]): The initial state of the window.
+        """
+        state = {}
+        for technology in self.component_data:
+            block = instance.dsm_blocks[technology]
+            component_state = {}
+            if hasattr(block, "soc") and pyo.value(block.max_capacity) > 0:
+                component_state["initial_soc"] = pyo.value(block.soc[t]) / pyo.value(
+                    block.max_capacity
+                )
+            if hasattr(block, "operational_status"):
+                status = round(pyo.value(block.operational_status[t]))
+                run_steps = 0
+                k = t
+                while (
+                    k >= start
+                    and round(pyo.value(block.operational_status[k])) == status
+                ):
+                    run_steps += 1
+                    k -= 1
+
+                if k < start:
+                    # the run started before this window
+                    previous = previous_state.get(technology, {})
+                    initial_status = previous.get(
+                        "initial_operational_status",
+                        self.component_data[technology].get(
+                            "initial_operational_status", 1
+                        ),
+                    )
+                    if initial_status == status:
+                        previous_run = previous.get("initial_run_steps")
+                        run_steps = (
+                            None if previous_run is None else previous_run + run_steps
+                        )
+
+                component_state["initial_operational_status"] = status
+                component_state["initial_run_steps"] = run_steps
+            state[technology] = component_state
+        return state
+
+    def time_series_values(self, series) -> dict[int, float]:
+        """
+        Returns the values of a series for the time steps of the current model.
+
+        Args:
+            series (FastSeries | pandas.Series | list): The series covering the whole index.
+
+        Returns:
+            dict[int, float]: The values keyed by the time steps of the model.
+        """
+        values = series.data if isinstance(series, FastSeries) else np.asarray(series)
+        return {t: values[t] for t in self.model.time_steps}
+
+    def calculate_cache_key(self, components_hash: str) -> str:
+        """
+        Calculates the key of the optimal operation in the result cache.
+
+        The key covers the unit class, the component parameters, the solver and its options,
+        the time index and the values of all parameters of the optimisation model, which
+        contain the price and demand series the unit is optimised against. The settings
+        of the unit and the names of the active constraints and variables are included as
+        well, as settings like ``is_prosumer`` change the structure of the model.
+
+        Args:
+            components_hash (str): The hash of the component parameters.
+
+        Returns:
+            str: The hex digest identifying the optimisation problem.
+        """
+        key = hashlib.sha256()
+        _update_hash(
+            key,
+            (
+                type(self).__qualname__,
+                components_hash,
+                self.solver_name,
+                self.solver_options,
+                self.objective,
+                self.index[0],
+                self.index.freq,
+                len(self.index),
+            ),
+        )
+        _update_hash(
+            key,
+            tuple(
+                (name, getattr(self, name, None))
+                for name in (
+                    "is_prosumer",
+                    "flexibility_measure",
+                    "cost_tolerance",
+                    "congestion_threshold",
+                    "peak_load_cap",
+                )
+            ),
+        )
+        for component in self.model.component_objects(
+            (pyo.Constraint, pyo.Var), active=True, descend_into=True
+        ):
+            _update_hash(key, component.name)
+        for param in self.model.component_data_objects(pyo.Param, descend_into=True):
+            _update_hash(key, (param.name, pyo.value(param, exception=False)))
+
+        return key.hexdigest()
+
     def define_sets(self) -> None:
         """
         Defines the sets for the Pyomo model.
         """
-        self.model.time_steps = pyo.Set(
-            initialize=[idx for idx, _ in enumerate(self.index)]
+        time_steps = (
+            range(len(self.index))
+            if self.model_time_steps is None
+            else self.model_time_steps
         )
+        self.model.time_steps = pyo.Set(initialize=list(time_steps), ordered=True)
 
     def define_objective_opt(self):
         """
@@ -268,7 +583,7 @@ class DSMFlex:
         # Generate the congestion indicator dictionary based on the threshold
         congestion_indicator_dict = {
             i: int(value > self.congestion_threshold)
-            for i, value in enumerate(self.congestion_signal)
+            for i, value in self.time_series_values(self.congestion_signal).items()
         }
 
         # Define the cost tolerance parameter
@@ -503,32 +818,24 @@ class DSMFlex:
         """
         Determines the optimal operation of the steel plant without considering flexibility.
         """
+        if self.cache_key is not None:
+            results = self.result_cache.get(self.cache_key)
+            if results is not None:
+                logger.debug("Using cached optimal operation of %s.", self.id)
+                self.set_optimal_operation(results)
+                return
+
+        if self.horizon_window:
+            self.solve_rolling_horizon(with_flex=False)
+            return
+
         # create an instance of the model
         instance = self.model.create_instance()
         # switch the instance to the optimal mode by deactivating the flexibility constraints and objective
         if switch_flex_off:
             instance = self.switch_to_opt(instance)
         # solve the instance
-        results = self.solver.solve(instance, options=self.solver_options)
-
-        # Check solver status and termination condition
-        if (results.solver.status == SolverStatus.ok) and (
-            results.solver.termination_condition == TerminationCondition.optimal
-        ):
-            logger.debug("The model was solved optimally.")
-
-            # Display the Objective Function Value
-            objective_value = instance.obj_rule_opt()
-            logger.debug("The value of the objective function is %s.", objective_value)
-
-        elif results.solver.termination_condition == TerminationCondition.infeasible:
-            logger.debug("The model is infeasible.")
-
-        else:
-            logger.debug("Solver Status: ", results.solver.status)
-            logger.debug(
-                "Termination Condition: ", results.solver.termination_condition
-            )
+        self._solve_instance(instance, instance.obj_rule_opt)
 
         opt_power_requirement = [
             pyo.value(instance.total_power_input[t]) for t in instance.time_steps
@@ -547,35 +854,30 @@ class DSMFlex:
         ]
         self.variable_cost_series = FastSeries(index=self.index, value=variable_cost)
 
+        if self.cache_key is not None:
+            self.result_cache.set(
+                self.cache_key,
+                {
+                    "opt_power_requirement": np.asarray(opt_power_requirement),
+                    "variable_cost": np.asarray(variable_cost),
+                    "total_cost": self.total_cost,
+                },
+            )
+
     def determine_optimal_operation_with_flex(self):
         """
         Determines the optimal operation of the steel plant without considering flexibility.
         """
+        if self.horizon_window:
+            self.solve_rolling_horizon(with_flex=True)
+            return
+
         # create an instance of the model
         instance = self.model.create_instance()
         # switch the instance to the flexibility mode by deactivating the optimal constraints and objective
         instance = self.switch_to_flex(instance)
         # solve the instance
-        results = self.solver.solve(instance, options=self.solver_options)
-
-        # Check solver status and termination condition
-        if (results.solver.status == SolverStatus.ok) and (
-            results.solver.termination_condition == TerminationCondition.optimal
-        ):
-            logger.debug("The model was solved optimally.")
-
-            # Display the Objective Function Value
-            objective_value = instance.obj_rule_flex()
-            logger.debug("The value of the objective function is %s.", objective_value)
-
-        elif results.solver.termination_condition == TerminationCondition.infeasible:
-            logger.debug("The model is infeasible.")
-
-        else:
-            logger.debug("Solver Status: ", results.solver.status)
-            logger.debug(
-                "Termination Condition: ", results.solver.termination_condition
-            )
+        self._solve_instance(instance, instance.obj_rule_flex)
 
         # Compute adjusted total power input with load shift applied
         adjusted_total_power_input = []
@@ -601,6 +903,80 @@ class DSMFlex:
             index=self.index, value=flex_variable_cost
         )
 
+    def _solve_instance(self, instance, objective) -> None:
+        """
+        Solves an instance of the model and logs the solver status.
+
+        Args:
+            instance (pyomo.ConcreteModel): The instance of the Pyomo model.
+            objective (pyomo.Objective): The active objective of the instance.
+        """
+        results = self.solver.solve(instance, options=self.solver_options)
+
+        # Check solver status and termination condition
+        if (results.solver.status == SolverStatus.ok) and (
+            results.solver.termination_condition == TerminationCondition.optimal
+        ):
+            logger.debug("The model was solved optimally.")
+
+            # Display the Objective Function Value
+            objective_value = objective()
+            logger.debug("The value of the objective function is %s.", objective_value)
+
+        elif results.solver.termination_condition == TerminationCondition.infeasible:
+            logger.debug("The model is infeasible.")
+
+        else:
+            logger.debug("Solver Status: ", results.solver.status)
+            logger.debug(
+                "Termination Condition: ", results.solver.termination_condition
+            )
+
+    def get_optimal_operation(self) -> dict[str, np.ndarray | float]:
+        """
+        Returns the solved operation of the unit as plain arrays.
+
+        Returns:
+            dict[str, numpy.ndarray | float]: The optimal power requirement, variable costs and total cost,
+            as well as the flexible power requirement and costs if they were determined.
+        """
+        results = {
+            "opt_power_requirement": np.asarray(self.opt_power_requirement.data),
+            "variable_cost": np.asarray(self.variable_cost_series.data),
+            "total_cost": self.total_cost,
+        }
+        if hasattr(self, "flex_power_requirement"):
+            results["flex_power_requirement"] = np.asarray(
+                self.flex_power_requirement.data
+            )
+            results["flex_variable_cost"] = np.asarray(
+                self.flex_variable_cost_series.data
+            )
+        return results
+
+    def set_optimal_operation(self, results: dict[str, np.ndarray | float]) -> None:
+        """
+        Populates the operation of the unit from arrays returned by :meth:`get_optimal_operation`.
+
+        Args:
+            results (dict[str, numpy.ndarray | float]): The solved operation of the unit.
+        """
+        self.opt_power_requirement = FastSeries(
+            index=self.index, value=results["opt_power_requirement"]
+        )
+        self.variable_cost_series = FastSeries(
+            index=self.index, value=results["variable_cost"]
+        )
+        self.total_cost = results["total_cost"]
+
+        if "flex_power_requirement" in results:
+            self.flex_power_requirement = FastSeries(
+                index=self.index, value=results["flex_power_requirement"]
+            )
+            self.flex_variable_cost_series = FastSeries(
+                index=self.index, value=results["flex_variable_cost"]
+            )
+
     def switch_to_opt(self, instance):
         """
         Switches the instance to solve a cost based optimisation problem by deactivating the flexibility constraints and objective.
@@ -644,7 +1020,13 @@ class DSMFlex:
         # fix values of model.total_power_input
         for t in instance.time_steps:
             instance.total_power_input[t].fix(self.opt_power_requirement.iloc[t])
-        instance.total_cost = self.total_cost
+        if self.horizon_window:
+            # the cost tolerance of a window refers to the optimal costs within the window
+            instance.total_cost = sum(
+                self.variable_cost_series.data[t] for t in instance.time_steps
+            )
+        else:
+            instance.total_cost = self.total_cost
 
         return instance
 
@@ -691,3 +1073,204 @@ class DSMFlex:
         )
 
         return unit_dict
+
+
+def _update_hash(hash_object, value) -> None:
+    """
+    Feeds a nested structure of parameters and series into a hash object.
+    """
+    if isinstance(value, dict):
+        hash_object.update(b"{")
+        for key in sorted(value, key=str):
+            _update_hash(hash_object, key)
+            _update_hash(hash_object, value[key])
+        hash_object.update(b"}")
+    elif isinstance(value, list | tuple):
+        hash_object.update(b"(")
+        for item in value:
+            _update_hash(hash_object, item)
+        hash_object.update(b")")
+    elif isinstance(value, FastSeries):
+        _update_hash(hash_object, np.asarray(value.data))
+    elif isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        hash_object.update(f"{array.dtype}{array.shape}".encode())
+        hash_object.update(array.tobytes())
+    elif hasattr(value, "to_numpy"):
+        _update_hash(hash_object, value.to_numpy())
+    else:
+        hash_object.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+class DSMResultCache:
+    """
+    A persistent cache of the optimal operation of DSM units.
+
+    Results are stored as one ``.npz`` file per cache key in the given directory and are
+    additionally kept in memory, so that identical units of one simulation and repeated
+    simulations reuse the solved profiles instead of invoking the solver.
+
+    Args:
+        path (str): The directory of the cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._results: dict[str, dict[str, np.ndarray | float]] = {}
+
+    def get(self, key: str) -> dict[str, np.ndarray | float] | None:
+        """
+        Returns the cached results for a key or None if the problem was not solved yet.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            dict[str, numpy.ndarray | float] | None: The cached results.
+        """
+        if key in self._results:
+            return self._results[key]
+
+        file = self.path / f"{key}.npz"
+        if not file.exists():
+            return None
+
+        try:
+            with np.load(file) as data:
+                results = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable DSM cache file %s", file)
+            return None
+
+        results["total_cost"] = float(results["total_cost"])
+        self._results[key] = results
+        return results
+
+    def set(self, key: str, results: dict[str, np.ndarray | float]) -> None:
+        """
+        Stores results in the cache.
+
+        The file is written to a temporary name first, so that concurrent workers never
+        read partially written results.
+
+        Args:
+            key (str): The cache key.
+            results (dict[str, numpy.ndarray | float]): The results to store.
+        """
+        self._results[key] = results
+
+        file = self.path / f"{key}.npz"
+        tmp_file = self.path / f"{key}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(f, **results)
+        os.replace(tmp_file, file)
+
+
+_result_caches: dict[str, DSMResultCache] = {}
+
+
+def get_result_cache(path: str) -> DSMResultCache:
+    """
+    Returns the result cache of a directory, which is shared by all units of the process.
+
+    Args:
+        path (str): The directory of the cache.
+
+    Returns:
+        DSMResultCache: The result cache.
+    """
+    path = str(Path(path).resolve())
+    if path not in _result_caches:
+        _result_caches[path] = DSMResultCache(path)
+    return _result_caches[path]
+
+
+# forecasters shared by all tasks of a presolve worker process
+_worker_forecasters = []
+
+
+def _init_presolve_worker(forecasters: list) -> None:
+    global _worker_forecasters
+    _worker_forecasters = forecasters
+
+
+def _presolve_dsm_unit(
+    unit_class: type[DSMFlex],
+    unit_id: str,
+    unit_operator: str,
+    unit_params: dict,
+    forecaster_position: int,
+    with_flex: bool,
+) -> dict[str, np.ndarray | float]:
+    unit = unit_class(
+        id=unit_id,
+        unit_operator=unit_operator,
+        forecaster=_worker_forecasters[forecaster_position],
+        **unit_params,
+    )
+    if with_flex:
+        unit.determine_optimal_operation_with_flex()
+    return unit.get_optimal_operation()
+
+
+def presolve_dsm_units(
+    units: list[dict],
+    unit_types: dict[str, type],
+    max_workers: int | None = None,
+    with_flex: bool = False,
+) -> None:
+    """
+    Solves the optimal operation of independent DSM units in a process pool.
+
+    Each unit is created and solved in a worker process and only the resulting arrays are sent back.
+    They are stored as ``optimal_operation`` in the unit parameters, so that the unit created
+    afterwards populates ``opt_power_requirement`` (and ``flex_power_requirement``) without
+    invoking the solver again. Units which are no DSM units are skipped. The workers are
+    started with spawn, as forking a process with torch or a running event loop can deadlock.
+
+    Args:
+        units (list[dict]): The units as created by read_units, with id, unit_type, unit_operator_id, unit_params and forecaster.
+        unit_types (dict[str, type]): The available unit classes keyed by unit type.
+        max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        with_flex (bool, optional): Whether the operation with flexibility is solved as well. Defaults to False.
+    """
+    dsm_units = [
+        unit
+        for unit in units
+        if issubclass(unit_types.get(unit["unit_type"], object), DSMFlex)
+    ]
+    if not dsm_units:
+        return
+
+    forecasters = []
+    forecaster_positions = {}
+    for unit in dsm_units:
+        if id(unit["forecaster"]) not in forecaster_positions:
+            forecaster_positions[id(unit["forecaster"])] = len(forecasters)
+            forecasters.append(unit["forecaster"])
+
+    logger.info(
+        "Presolving %s DSM units with %s workers", len(dsm_units), max_workers or "all"
+    )
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_presolve_worker,
+        initargs=(forecasters,),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _presolve_dsm_unit,
+                unit_types[unit["unit_type"]],
+                unit["id"],
+                unit["unit_operator_id"],
+                # strategies are not needed for the optimisation and not picklable in general
+                {**unit["unit_params"], "bidding_strategies": {}},
+                forecaster_positions[id(unit["forecaster"])],
+                with_flex,
+            )
+            for unit in dsm_units
+        ]
+        for unit, future in zip(dsm_units, futures):
+            unit["unit_params"]["optimal_operation"] = future.result()
@@ -144,6 +144,7 @@ class HeatPump:
             add_min_up_down_time_constraints(
                 model_block=model_block,
                 time_steps=self.time_steps,
+                initial_run_steps=self.kwargs.get("initial_run_steps"),
             )
 
         return model_block
@@ -354,6 +355,7 @@ class Boiler:
             add_min_up_down_time_constraints(
                 model_block=model_block,
                 time_steps=self.time_steps,
+                initial_run_steps=self.kwargs.get("initial_run_steps"),
             )
 
         return model_block
@@ -625,9 +627,9 @@ class PVPlant:
 
         # Predefined power profile constraint
         if self.power_profile is not None:
-            if len(self.time_steps) != len(self.power_profile.index):
+            if max(self.time_steps) >= len(self.power_profile.index):
                 raise ValueError(
-                    "The length of the `time_steps` list must match the length of the `power_profile` index."
+                    "The `power_profile` index must cover all `time_steps`."
                 )
 
             @model_block.Constraint(self.time_steps)
@@ -639,9 +641,9 @@ class PVPlant:
 
         # Availability profile constraints
         if self.availability_profile is not None:
-            if len(self.time_steps) != len(self.availability_profile.index):
+            if max(self.time_steps) >= len(self.availability_profile.index):
                 raise ValueError(
-                    "The length of the `time_steps` list must match the length of the `availability_profile` index."
+                    "The `availability_profile` index must cover all `time_steps`."
                 )
 
             @model_block.Constraint(self.time_steps)
@@ -801,6 +803,7 @@ class Electrolyser:
             add_min_up_down_time_constraints(
                 model_block=model_block,
                 time_steps=self.time_steps,
+                initial_run_steps=self.kwargs.get("initial_run_steps"),
             )
 
         return model_block
@@ -1057,6 +1060,7 @@ class DRIPlant:
             add_min_up_down_time_constraints(
                 model_block=model_block,
                 time_steps=self.time_steps,
+                initial_run_steps=self.kwargs.get("initial_run_steps"),
             )
 
         return model_block
@@ -1249,6 +1253,7 @@ class ElectricArcFurnace:
             add_min_up_down_time_constraints(
                 model_block=model_block,
                 time_steps=self.time_steps,
+                initial_run_steps=self.kwargs.get("initial_run_steps"),
             )
 
         return model_block
@@ -1356,10 +1361,8 @@ class ElectricVehicle(GenericStorage):
 
         # Apply availability profile constraints if provided
         if self.availability_profile is not None:
-            if len(self.availability_profile) != len(self.time_steps):
-                raise ValueError(
-                    "Length of `availability_profile` must match the number of `time_steps`."
-                )
+            if max(self.time_steps) >= len(self.availability_profile):
+                raise ValueError("`availability_profile` must cover all `time_steps`.")
 
             @model_block.Constraint(self.time_steps)
             def discharge_availability_constraint(b, t):
@@ -1373,10 +1376,8 @@ class ElectricVehicle(GenericStorage):
 
         # Apply predefined charging profile constraints if provided
         if self.charging_profile is not None:
-            if len(self.charging_profile) != len(self.time_steps):
-                raise ValueError(
-                    "Length of `charging_profile` must match the number of `time_steps`."
-                )
+            if max(self.time_steps) >= len(self.charging_profile):
+                raise ValueError("`charging_profile` must cover all `time_steps`.")
 
             @model_block.Constraint(self.time_steps)
             def charging_profile_constraint(b, t):
@@ -1680,7 +1681,7 @@ def add_ramping_constraints(model_block, time_steps):
     return model_block
 
 
-def add_min_up_down_time_constraints(model_block, time_steps):
+def add_min_up_down_time_constraints(model_block, time_steps, initial_run_steps=None):
     model_block.operational_status = pyo.Var(time_steps, within=pyo.Binary)
 
     # Power constraints based on operational status
@@ -1736,11 +1737,10 @@ def add_min_up_down_time_constraints(model_block, time_steps):
             def min_operating_time_constraint(b, t):
                 if t < model_block.min_operating_steps:
                     return pyo.Constraint.Skip
+                # a window of a rolling horizon only contains its own time steps
+                first = max(t - model_block.min_operating_steps + 1, time_steps.first())
                 return (
-                    sum(
-                        b.start_up[i]
-                        for i in range(t - model_block.min_operating_steps + 1, t + 1)
-                    )
+                    sum(b.start_up[i] for i in range(first, t + 1))
                     <= b.operational_status[t]
                 )
 
@@ -1765,12 +1765,28 @@ def add_min_up_down_time_constraints(model_block, time_steps):
             def min_downtime_constraint(b, t):
                 if t < model_block.min_down_steps:
                     return pyo.Constraint.Skip
+                # a window of a rolling horizon only contains its own time steps
+                first = max(t - model_block.min_down_steps + 1, time_steps.first())
                 return (
-                    sum(
-                        b.shut_down[i]
-                        for i in range(t - model_block.min_down_steps + 1, t + 1)
-                    )
+                    sum(b.shut_down[i] for i in range(first, t + 1))
                     <= 1 - b.operational_status[t]
                 )
 
+    # a window of a rolling horizon continues the run of the previous window
+    # the initial status is kept until the minimum up or down time of this run is reached
+    if initial_run_steps is not None:
+        initial_status = pyo.value(model_block.initial_operational_status)
+        if initial_status:
+            min_steps = pyo.value(model_block.min_operating_steps)
+        else:
+            min_steps = pyo.value(model_block.min_down_steps)
+        held_until = time_steps.first() + min_steps - initial_run_steps
+        held_steps = [t for t in time_steps if t < held_until]
+
+        if held_steps:
+
+            @model_block.Constraint(held_steps)
+            def initial_run_constraint(b, t):
+                return b.operational_status[t] == initial_status
+
     return model_block
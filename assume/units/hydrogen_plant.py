@@ -111,9 +111,11 @@ class HydrogenPlant(DSMFlex, SupportsMinMax):
     def define_parameters(self):
         self.model.electricity_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.electricity_price)},
+            initialize=self.time_series_values(self.electricity_price),
+        )
+        self.model.absolute_hydrogen_demand = pyo.Param(
+            initialize=self.demand * self.horizon_share
         )
-        self.model.absolute_hydrogen_demand = pyo.Param(initialize=self.demand)
 
     def define_variables(self):
         self.model.total_power_input = pyo.Var(
@@ -212,7 +214,7 @@ class HydrogenPlant(DSMFlex, SupportsMinMax):
                     pyo.quicksum(
                         m.dsm_blocks["electrolyser"].hydrogen_out[t]
                         + m.dsm_blocks["hydrogen_seasonal_storage"].discharge[t]
-                        for t in m.time_steps
+                        for t in self.demand_time_steps()
                     )
                     == m.absolute_hydrogen_demand
                 )
@@ -221,7 +223,7 @@ class HydrogenPlant(DSMFlex, SupportsMinMax):
                 return (
                     pyo.quicksum(
                         m.dsm_blocks["electrolyser"].hydrogen_out[t]
-                        for t in m.time_steps
+                        for t in self.demand_time_steps()
                     )
                     == m.absolute_hydrogen_demand
                 )
@@ -113,8 +113,20 @@ class PowerPlant(SupportsMinMax):
             self.index.freq / timedelta(hours=1)
         )
 
+        # running operation time counter and the index position it belongs to
+        self._operation_time_position = -1
+        self._operation_time = 0
+
         self.init_marginal_cost()
 
+    def reset(self) -> None:
+        """
+        Resets the power plant for a new episode including its running operation time counter.
+        """
+        super().reset()
+        self._operation_time_position = -1
+        self._operation_time = 0
+
     def init_marginal_cost(self):
         """
         Initializes the marginal cost of the unit using calc_cimple_marginal_cost().
@@ -142,25 +154,31 @@ class PowerPlant(SupportsMinMax):
             np.array: The volume of the unit within the given time range.
         """
         start = max(start, self.index[0])
+        execute_powerplant_fleet_dispatch([self], start, end)
 
-        max_power_values = (
-            self.forecaster.get_availability(self.id).loc[start:end] * self.max_power
-        )
+        return self.outputs["energy"].loc[start:end]
 
-        for t, max_power in zip(self.index[start:end], max_power_values):
-            current_power = self.outputs["energy"].at[t]
-            previous_power = self.get_output_before(t)
-            op_time = self.get_operation_time(t)
+    def get_operation_time(self, start: datetime) -> int:
+        """
+        Returns the time the unit is operating (positive) or shut down (negative).
 
-            current_power = self.calculate_ramp(op_time, previous_power, current_power)
+        The running counter updated by the dispatch is used if it belongs to the given
+        start, otherwise the operation time is determined from the history of the outputs.
 
-            if current_power > 0:
-                current_power = min(current_power, max_power)
-                current_power = max(current_power, self.min_power)
+        Args:
+            start (datetime.datetime): The start time.
 
-            self.outputs["energy"].at[t] = current_power
+        Returns:
+            int: The operation time as a positive integer if operating, or negative if shut down.
+        """
+        if start > self.index[0]:
+            position = self.index._get_idx_from_date(start)
+            if position == self._operation_time_position:
+                previous_on = self.outputs["energy"].data[position - 1] > 0
+                if previous_on == (self._operation_time > 0):
+                    return self._operation_time
 
-        return self.outputs["energy"].loc[start:end]
+        return super().get_operation_time(start)
 
     def calc_simple_marginal_cost(
         self,
@@ -334,3 +352,161 @@ class PowerPlant(SupportsMinMax):
         )
 
         return unit_dict
+
+
+def dispatch_powerplant_kernel(
+    power: np.ndarray,
+    max_power_available: np.ndarray,
+    previous_power: np.ndarray,
+    operation_time: np.ndarray,
+    first_position: int,
+    min_power: np.ndarray,
+    max_power: np.ndarray,
+    ramp_up: np.ndarray,
+    ramp_down: np.ndarray,
+    min_operating_time: np.ndarray,
+    min_down_time: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Applies the ramping and availability constraints to the dispatch of one or many power plants.
+
+    The ramp of a step depends on the executed power of the previous step, so the window is
+    processed step by step while all power plants are handled at once. The operation time is
+    kept as a running counter instead of being recounted from the history in every step.
+
+    Args:
+        power (numpy.ndarray): The planned power of shape (plants, steps).
+        max_power_available (numpy.ndarray): The available maximum power of shape (plants, steps).
+        previous_power (numpy.ndarray): The power before the window of shape (plants,).
+        operation_time (numpy.ndarray): The operation time at the first step of shape (plants,).
+        first_position (int): The index position of the first step.
+        min_power (numpy.ndarray): The minimum power of shape (plants,).
+        max_power (numpy.ndarray): The maximum power of shape (plants,).
+        ramp_up (numpy.ndarray): The ramp up rate, NaN if not limited, of shape (plants,).
+        ramp_down (numpy.ndarray): The ramp down rate, NaN if not limited, of shape (plants,).
+        min_operating_time (numpy.ndarray): The minimum operating time of shape (plants,).
+        min_down_time (numpy.ndarray): The minimum down time of shape (plants,).
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The executed power of shape (plants, steps) and the
+        operation time of shape (plants,) at the step following the window.
+    """
+    power = np.array(power, dtype=float, ndmin=2)
+    max_power_available = np.array(max_power_available, dtype=float, ndmin=2)
+    previous_power = np.array(previous_power, dtype=float)
+    operation_time = np.array(operation_time, dtype=float)
+
+    limit_ramp_up = ~np.isnan(ramp_up)
+    limit_ramp_down = ~np.isnan(ramp_down)
+    has_ramp = limit_ramp_up | limit_ramp_down
+    max_time = np.maximum(np.maximum(min_operating_time, min_down_time), 1)
+
+    for k in range(power.shape[1]):
+        current_power = power[:, k]
+
+        # was off before, but should be on now and min_down_time is not reached
+        keep_off = (
+            (current_power > 0)
+            & (operation_time < 0)
+            & (operation_time > -min_down_time)
+        )
+        # was on before, but should be off now and min_operating_time is not reached
+        keep_on = (
+            ~keep_off
+            & (current_power == 0)
+            & (operation_time > 0)
+            & (operation_time < min_operating_time)
+        )
+        ramped = np.where(keep_off, 0, np.where(keep_on, min_power, current_power))
+
+        running = ramped != 0
+        ramped = np.where(
+            running & limit_ramp_up,
+            np.minimum(ramped, np.minimum(previous_power + ramp_up, max_power)),
+            ramped,
+        )
+        ramped = np.where(
+            running & limit_ramp_down,
+            np.maximum(ramped, np.maximum(previous_power - ramp_down, min_power)),
+            ramped,
+        )
+        current_power = np.where(has_ramp, ramped, current_power)
+
+        on = current_power > 0
+        current_power = np.where(
+            on,
+            np.maximum(
+                np.minimum(current_power, max_power_available[:, k]), min_power
+            ),
+            current_power,
+        )
+        power[:, k] = current_power
+
+        # the first step of the index has no history, so the run starts from zero
+        run = operation_time if first_position + k > 0 else np.zeros_like(operation_time)
+        operation_time = np.where(
+            on,
+            np.where(run > 0, run + 1, 1),
+            np.where(run < 0, run - 1, -1),
+        )
+        operation_time = np.clip(operation_time, -max_time, max_time)
+        previous_power = current_power
+
+    return power, operation_time
+
+
+def execute_powerplant_fleet_dispatch(
+    plants: list[PowerPlant], start: datetime, end: datetime
+) -> None:
+    """
+    Executes the current dispatch of many power plants with one kernel call.
+
+    All power plants need to share the same index. The executed power is written to the
+    outputs and the running operation time counter of every power plant is updated.
+
+    Args:
+        plants (list[PowerPlant]): The power plants to dispatch.
+        start (datetime.datetime): The start time of the dispatch.
+        end (datetime.datetime): The end time of the dispatch.
+    """
+    if not plants:
+        return
+
+    index = plants[0].index
+    start = max(start, index[0])
+    first = index._get_idx_from_date(start)
+    last = min(index._get_idx_from_date(end, round_up=False) + 1, len(index))
+    if last <= first:
+        return
+
+    def optional(value):
+        return np.nan if value is None else value
+
+    power, operation_time = dispatch_powerplant_kernel(
+        power=np.stack([plant.outputs["energy"].data[first:last] for plant in plants]),
+        max_power_available=np.stack(
+            [
+                plant.forecaster.get_availability(plant.id).data[first:last]
+                * plant.max_power
+                for plant in plants
+            ]
+        ),
+        previous_power=np.array([plant.get_output_before(start) for plant in plants]),
+        operation_time=np.array([plant.get_operation_time(start) for plant in plants]),
+        first_position=first,
+        min_power=np.array([plant.min_power for plant in plants], dtype=float),
+        max_power=np.array([plant.max_power for plant in plants], dtype=float),
+        ramp_up=np.array([optional(plant.ramp_up) for plant in plants], dtype=float),
+        ramp_down=np.array(
+            [optional(plant.ramp_down) for plant in plants], dtype=float
+        ),
+        min_operating_time=np.array(
+            [plant.min_operating_time for plant in plants], dtype=float
+        ),
+        min_down_time=np.array([plant.min_down_time for plant in plants], dtype=float),
+    )
+
+    for i, plant in enumerate(plants):
+        plant.outputs["energy"].data[first:last] = power[i]
+        plant._operation_time_position = last
+        plant._operation_time = int(operation_time[i])
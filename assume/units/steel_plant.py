@@ -134,7 +134,7 @@ class SteelPlant(DSMFlex, SupportsMinMax):
         """
         self.model.electricity_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.electricity_price)},
+            initialize=self.time_series_values(self.electricity_price),
         )
 
         if self.components["dri_plant"]["fuel_type"] in ["natural_gas", "both"]:
@@ -147,9 +147,7 @@ class SteelPlant(DSMFlex, SupportsMinMax):
             else:
                 self.model.hydrogen_price = pyo.Param(
                     self.model.time_steps,
-                    initialize={
-                        t: value for t, value in enumerate(self.hydrogen_price)
-                    },
+                    initialize=self.time_series_values(self.hydrogen_price),
                 )
 
         elif self.components["dri_plant"]["fuel_type"] in ["hydrogen", "both"]:
@@ -161,33 +159,33 @@ class SteelPlant(DSMFlex, SupportsMinMax):
             else:
                 self.model.hydrogen_price = pyo.Param(
                     self.model.time_steps,
-                    initialize={
-                        t: value for t, value in enumerate(self.hydrogen_price)
-                    },
+                    initialize=self.time_series_values(self.hydrogen_price),
                 )
 
         self.model.natural_gas_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.natural_gas_price)},
+            initialize=self.time_series_values(self.natural_gas_price),
+        )
+        self.model.steel_demand = pyo.Param(
+            initialize=self.steel_demand * self.horizon_share
         )
-        self.model.steel_demand = pyo.Param(initialize=self.steel_demand)
         self.model.steel_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.steel_price)},
+            initialize=self.time_series_values(self.steel_price),
             within=pyo.NonNegativeReals,
         )
         self.model.co2_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.co2_price)},
+            initialize=self.time_series_values(self.co2_price),
         )
         self.model.lime_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.lime_price)},
+            initialize=self.time_series_values(self.lime_price),
             within=pyo.NonNegativeReals,
         )
         self.model.iron_ore_price = pyo.Param(
             self.model.time_steps,
-            initialize={t: value for t, value in enumerate(self.iron_ore_price)},
+            initialize=self.time_series_values(self.iron_ore_price),
             within=pyo.NonNegativeReals,
         )
 
@@ -328,7 +326,10 @@ class SteelPlant(DSMFlex, SupportsMinMax):
             by the total production over the entire time horizon.
             """
             return (
-                sum(m.dsm_blocks["eaf"].steel_output[t] for t in m.time_steps)
+                sum(
+                    m.dsm_blocks["eaf"].steel_output[t]
+                    for t in self.demand_time_steps()
+                )
                 == m.steel_demand
             )
 
@@ -4,7 +4,6 @@
 
 import logging
 from datetime import datetime, timedelta
-from functools import lru_cache
 
 import numpy as np
 
@@ -159,6 +158,13 @@ class Storage(SupportsMinMaxCharge):
         self.warm_start_cost = warm_start_cost * max_power_discharge
         self.cold_start_cost = cold_start_cost * max_power_discharge
 
+    def reset(self) -> None:
+        """
+        Resets the storage for a new episode and restores its initial state of charge.
+        """
+        super().reset()
+        self.outputs["soc"].data[:] = self.initial_soc
+
     def execute_current_dispatch(self, start: datetime, end: datetime) -> np.array:
         """
         Executes the current dispatch of the unit based on the provided timestamps.
@@ -174,54 +180,10 @@ class Storage(SupportsMinMaxCharge):
             np.array: The volume of the unit within the given time range.
         """
         start = max(start, self.index[0])
-        time_delta = self.index.freq / timedelta(hours=1)
-
-        for t in self.index[start:end]:
-            current_power = self.outputs["energy"].at[t]
-
-            # adjust power to constraints of the unit
-            if current_power > self.max_power_discharge:
-                current_power = self.max_power_discharge
-            elif current_power < self.max_power_charge:
-                current_power = self.max_power_charge
-            elif (
-                current_power < self.min_power_discharge
-                and current_power > self.min_power_charge
-                and current_power != 0
-            ):
-                current_power = 0
-
-            # calculate the change in state of charge
-            delta_soc = 0
-            soc = self.outputs["soc"].at[t]
-
-            # discharging
-            if current_power > 0:
-                max_soc_discharge = self.calculate_soc_max_discharge(soc)
-
-                if current_power > max_soc_discharge:
-                    current_power = max_soc_discharge
-
-                delta_soc = -current_power * time_delta / self.efficiency_discharge
-
-            # charging
-            elif current_power < 0:
-                max_soc_charge = self.calculate_soc_max_charge(soc)
-
-                if current_power < max_soc_charge:
-                    current_power = max_soc_charge
-
-                delta_soc = -current_power * time_delta * self.efficiency_charge
-
-            # update the values of the state of charge and the energy
-            next_freq = t + self.index.freq
-            if next_freq in self.index:
-                self.outputs["soc"].at[next_freq] = soc + delta_soc
-            self.outputs["energy"].at[t] = current_power
+        execute_storage_fleet_dispatch([self], start, end)
 
         return self.outputs["energy"].loc[start:end]
 
-    @lru_cache(maxsize=256)
     def calculate_marginal_cost(
         self,
         start: datetime,
@@ -240,15 +202,9 @@ class Storage(SupportsMinMaxCharge):
         """
 
         if power > 0:
-            additional_cost = self.additional_cost_discharge
-            efficiency = self.efficiency_discharge
-        else:
-            additional_cost = self.additional_cost_charge
-            efficiency = self.efficiency_charge
-
-        marginal_cost = additional_cost / efficiency
+            return self.additional_cost_discharge / self.efficiency_discharge
 
-        return marginal_cost
+        return self.additional_cost_charge / self.efficiency_charge
 
     def calculate_soc_max_discharge(self, soc) -> float:
         """
@@ -489,3 +445,160 @@ class Storage(SupportsMinMaxCharge):
         )
 
         return unit_dict
+
+
+def dispatch_storage_kernel(
+    power: np.ndarray,
+    soc: np.ndarray,
+    max_power_charge: np.ndarray,
+    max_power_discharge: np.ndarray,
+    min_power_charge: np.ndarray,
+    min_power_discharge: np.ndarray,
+    min_soc: np.ndarray,
+    max_soc: np.ndarray,
+    efficiency_charge: np.ndarray,
+    efficiency_discharge: np.ndarray,
+    time_delta: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Applies the power and state of charge limits to the dispatch of one or many storages.
+
+    The power of a whole window is clipped against the charge and discharge limits at once.
+    The state of charge is then resolved with a cumulative sum. Only where the state of charge
+    bounds are hit, the power of the first violating step is limited like in the sequential
+    dispatch and the cumulative sum is continued from there.
+
+    Args:
+        power (numpy.ndarray): The planned power of shape (storages, steps).
+        soc (numpy.ndarray): The state of charge at the start of the window of shape (storages,).
+        max_power_charge (numpy.ndarray): The maximum charging power (negative) of shape (storages,).
+        max_power_discharge (numpy.ndarray): The maximum discharging power of shape (storages,).
+        min_power_charge (numpy.ndarray): The minimum charging power (negative) of shape (storages,).
+        min_power_discharge (numpy.ndarray): The minimum discharging power of shape (storages,).
+        min_soc (numpy.ndarray): The minimum state of charge of shape (storages,).
+        max_soc (numpy.ndarray): The maximum state of charge of shape (storages,).
+        efficiency_charge (numpy.ndarray): The charging efficiency of shape (storages,).
+        efficiency_discharge (numpy.ndarray): The discharging efficiency of shape (storages,).
+        time_delta (float): The duration of one step in hours.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The executed power of shape (storages, steps) and the
+        state of charge of shape (storages, steps + 1), starting with the given state of charge.
+    """
+    power = np.array(power, dtype=float, ndmin=2)
+    n_storages, n_steps = power.shape
+
+    def column(value):
+        return np.broadcast_to(np.asarray(value, dtype=float), (n_storages,))[:, None]
+
+    max_power_charge, max_power_discharge = column(max_power_charge), column(
+        max_power_discharge
+    )
+    min_power_charge, min_power_discharge = column(min_power_charge), column(
+        min_power_discharge
+    )
+    min_soc, max_soc = column(min_soc), column(max_soc)
+    efficiency_charge, efficiency_discharge = column(efficiency_charge), column(
+        efficiency_discharge
+    )
+
+    # adjust power to the technical constraints of the unit
+    power = np.clip(power, max_power_charge, max_power_discharge)
+    power[
+        (power < min_power_discharge) & (power > min_power_charge) & (power != 0)
+    ] = 0
+
+    soc_start = np.broadcast_to(np.asarray(soc, dtype=float), (n_storages,))
+    soc = np.empty((n_storages, n_steps + 1))
+    # steps before first_open are already resolved and are not checked again
+    first_open = np.zeros(n_storages, dtype=int)
+    rows = np.arange(n_storages)
+    steps = np.arange(n_steps)
+
+    while rows.size:
+        p = power[rows]
+        delta_soc = np.where(
+            p > 0,
+            -p * time_delta / efficiency_discharge[rows],
+            -p * time_delta * efficiency_charge[rows],
+        )
+        # cumulative sum starting from the initial soc gives the same rounding as the sequential update
+        soc[rows] = np.cumsum(
+            np.concatenate([soc_start[rows, None], delta_soc], axis=1), axis=1
+        )
+
+        current_soc = soc[rows, :-1]
+        max_soc_discharge = np.maximum(
+            0, (current_soc - min_soc[rows]) * efficiency_discharge[rows] / time_delta
+        )
+        max_soc_charge = np.minimum(
+            0, (current_soc - max_soc[rows]) / efficiency_charge[rows] / time_delta
+        )
+        violated = ((p > 0) & (p > max_soc_discharge)) | (
+            (p < 0) & (p < max_soc_charge)
+        )
+        violated &= steps >= first_open[rows, None]
+
+        has_violation = violated.any(axis=1)
+        rows, violated = rows[has_violation], violated[has_violation]
+        if not rows.size:
+            break
+
+        # limit the first violating step of each storage sequentially
+        k = violated.argmax(axis=1)
+        p_k = power[rows, k]
+        power[rows, k] = np.where(
+            p_k > 0,
+            np.minimum(p_k, max_soc_discharge[has_violation, k]),
+            np.maximum(p_k, max_soc_charge[has_violation, k]),
+        )
+        first_open[rows] = k + 1
+
+    return power, soc
+
+
+def execute_storage_fleet_dispatch(
+    storages: list[Storage], start: datetime, end: datetime
+) -> None:
+    """
+    Executes the current dispatch of many storages with one kernel call.
+
+    All storages need to share the same index. The executed power and the resulting state of
+    charge are written to the outputs of the storages.
+
+    Args:
+        storages (list[Storage]): The storages to dispatch.
+        start (datetime.datetime): The start time of the dispatch.
+        end (datetime.datetime): The end time of the dispatch.
+    """
+    if not storages:
+        return
+
+    index = storages[0].index
+    start = max(start, index[0])
+    first = index._get_idx_from_date(start)
+    last = min(index._get_idx_from_date(end, round_up=False) + 1, len(index))
+    if last <= first:
+        return
+
+    power, soc = dispatch_storage_kernel(
+        power=np.stack([unit.outputs["energy"].data[first:last] for unit in storages]),
+        soc=np.array([unit.outputs["soc"].data[first] for unit in storages]),
+        max_power_charge=np.array([unit.max_power_charge for unit in storages]),
+        max_power_discharge=np.array([unit.max_power_discharge for unit in storages]),
+        min_power_charge=np.array([unit.min_power_charge for unit in storages]),
+        min_power_discharge=np.array([unit.min_power_discharge for unit in storages]),
+        min_soc=np.array([unit.min_soc for unit in storages]),
+        max_soc=np.array([unit.max_soc for unit in storages]),
+        efficiency_charge=np.array([unit.efficiency_charge for unit in storages]),
+        efficiency_discharge=np.array(
+            [unit.efficiency_discharge for unit in storages]
+        ),
+        time_delta=index.freq / timedelta(hours=1),
+    )
+
+    # the soc after the last step is only stored if it is still within the index
+    soc_last = min(last + 1, len(index))
+    for i, unit in enumerate(storages):
+        unit.outputs["energy"].data[first:last] = power[i]
+        unit.outputs["soc"].data[first + 1 : soc_last] = soc[i, 1 : soc_last - first]
@@ -6,6 +6,7 @@ import asyncio
 import logging
 import sys
 import time
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
@@ -20,7 +21,6 @@ from mango import (
 )
 from mango.container.core import Container
 from mango.util.clock import ExternalClock
-from mango.util.distributed_clock import DistributedClockAgent, DistributedClockManager
 from mango.util.termination_detection import tasks_complete_or_sleeping
 from sqlalchemy import create_engine, make_url
 from sqlalchemy.exc import OperationalError
@@ -34,7 +34,17 @@ from assume.common import (
     WriteOutput,
     mango_codec_factory,
 )
-from assume.common.base import LearningConfig
+from assume.common.base import (
+    BaseStrategy,
+    LearningConfig,
+    OutputBlock,
+    UnitOutputs,
+)
+from assume.common.clock import (
+    AcknowledgingClockAgent,
+    AcknowledgingClockManager,
+    FastForwardClock,
+)
 from assume.common.utils import datetime2timestamp, timestamp2datetime
 from assume.markets import MarketRole, clearing_mechanisms
 from assume.strategies import LearningStrategy, bidding_strategies
@@ -66,6 +76,8 @@ class World:
             - `None` (default): Runs independently without subprocesses.
         export_csv_path (str, optional): Path for exporting CSV data.
         log_level (str, optional): The logging level for the world instance.
+        codec (str, optional): The name of the message codec used by the container.
+        fast_forward (bool, optional): Whether the clock jumps over timestamps without waiting tasks.
         db_uri (sqlalchemy.engine.URL, optional): The processed database URI.
         db (sqlalchemy.engine.base.Engine, optional): The database connection engine.
         container (mango.Container, optional): The container for the world instance.
@@ -98,6 +110,8 @@ class World:
         export_csv_path (str, optional): Path for exporting CSV data. Defaults to `""`.
         log_level (str, optional): Logging level. Defaults to `"INFO"`.
         distributed_role (bool, optional): Defines the world’s role in distributed execution. Defaults to `None`.
+        codec (str, optional): The message codec of the container, `"json"` or the binary `"msgpack"`. Defaults to `"json"`.
+        fast_forward (bool, optional): Skip timestamps at which no task is waiting anymore. Defaults to `False`.
     """
 
     def __init__(
@@ -107,11 +121,15 @@ class World:
         export_csv_path: str = "",
         log_level: str = "INFO",
         distributed_role: bool | None = None,
+        codec: str = "json",
+        fast_forward: bool = False,
     ) -> None:
         logging.getLogger("assume").setLevel(log_level)
         self.addr = addr
         self.container: Container = None
         self.distributed_role = distributed_role
+        self.codec = codec
+        self.fast_forward = fast_forward
 
         self.export_csv_path = export_csv_path
         # initialize db connection at beginning of simulation
@@ -153,6 +171,9 @@ class World:
         self.market_operators: dict[str, RoleAgent] = {}
         self.markets: dict[str, MarketConfig] = {}
         self.unit_operators: dict[str, UnitsOperator] = {}
+        # units kept by reset_episode and the strategy names to recreate their strategies
+        self.episode_units: dict[str, list[BaseUnit]] = {}
+        self.unit_strategy_params: dict[str, dict] = {}
         self.unit_types = unit_types
         self.dst_components = demand_side_technologies
 
@@ -206,7 +227,7 @@ class World:
             None
         """
 
-        self.clock = ExternalClock(0)
+        self.clock = FastForwardClock(0) if self.fast_forward else ExternalClock(0)
         self.simulation_id = simulation_id
         self.start = start
         self.end = end
@@ -253,7 +274,7 @@ class World:
             container_kwargs.update(**kwargs)
 
         self.container = container_func(
-            codec=mango_codec_factory(),
+            codec=mango_codec_factory(self.codec),
             clock=self.clock,
             **container_kwargs,
         )
@@ -266,7 +287,7 @@ class World:
         if self.distributed_role is False:
             # if distributed_role is False - we are a ChildContainer
             # and only connect to the manager_address, which can set/sync our clock
-            self.clock_agent = DistributedClockAgent()
+            self.clock_agent = AcknowledgingClockAgent()
             self.output_agent_addr = addr(manager_address, "export_agent_1")
 
             # # when the clock_agent is stopped, we should gracefully shutdown our container
@@ -280,7 +301,7 @@ class World:
                 episode=episode,
                 eval_episode=eval_episode,
             )
-            self.clock_manager = DistributedClockManager(
+            self.clock_manager = AcknowledgingClockManager(
                 receiver_clock_addresses=self.addresses
             )
             self.container.register(self.clock_manager)
@@ -378,7 +399,7 @@ class World:
                     suggested_aid=output_aid,
                 )
                 agent.suspendable_tasks = False
-                container.register(DistributedClockAgent(), "clock_agent")
+                container.register(AcknowledgingClockAgent(), "clock_agent")
 
             self.container.as_agent_process_lazy(agent_creator=creator)
         else:
@@ -462,6 +483,8 @@ class World:
             unit_operator_agent._role_context.data.update(
                 {
                     "learning_agent_addr": self.learning_agent_addr,
+                    # gives access to the shared replay buffer of the learning role
+                    "learning_role": self.learning_role,
                     "train_start": self.start,
                     "train_end": self.end,
                     "train_freq": self.learning_config.get("train_freq", "24h"),
@@ -511,7 +534,9 @@ class World:
             )
             unit_operator_agent.suspendable_tasks = False
             unit_operator_agent._role_context.data.update(data_update_dict)
-            container.register(DistributedClockAgent(), suggested_aid=clock_agent_name)
+            container.register(
+                AcknowledgingClockAgent(), suggested_aid=clock_agent_name
+            )
 
         self.container.as_agent_process_lazy(agent_creator=creator)
 
@@ -522,11 +547,26 @@ class World:
         unit_operator_id: str,
         unit_params: dict,
         forecaster: Forecaster,
+        shared_strategies: dict[str, BaseStrategy] | None = None,
+        configured_operator_id: str | None = None,
     ) -> BaseUnit:
         # provided unit type does not exist yet
         unit_class: type[BaseUnit] = self.unit_types.get(unit_type)
 
-        bidding_strategies = self._prepare_bidding_strategies(unit_params, id)
+        # keep the strategy names to create new strategies if the unit is reused in another episode
+        self.unit_strategy_params[id] = {
+            key: unit_params[key]
+            for key in ("bidding_strategies", "bidding_params")
+            if key in unit_params
+        }
+        # learning units are moved to Operator-RL, keep the configured operator as well
+        self.unit_strategy_params[id]["unit_operator"] = (
+            configured_operator_id or unit_operator_id
+        )
+
+        bidding_strategies = self._prepare_bidding_strategies(
+            unit_params, id, shared_strategies
+        )
         # if we have learning strategy we need to assign the powerplant to one unit_operator handling all learning units
         unit_params["bidding_strategies"] = bidding_strategies
 
@@ -552,13 +592,19 @@ class World:
                     self.learning_role.rl_strats[unit.id] = strategy
                     break
 
-    def _prepare_bidding_strategies(self, unit_params, unit_id):
+    def _prepare_bidding_strategies(
+        self, unit_params, unit_id, shared_strategies=None
+    ):
         """
         Prepare bidding strategies for the unit based on the specified parameters.
 
+        Strategies without an own ``__init__`` do not keep any state per unit. If a dict of
+        shared strategies is given, their instances are taken from it and reused by all units.
+
         Args:
             unit_params (dict): Parameters for configuring the unit.
             unit_id (str): The identifier for the unit.
+            shared_strategies (dict[str, BaseStrategy], optional): Instances of stateless strategies shared between units. Defaults to None.
 
         Returns:
             dict[str, BaseStrategy]: The bidding strategies for the unit.
@@ -584,9 +630,21 @@ class World:
                     the bidding strategy or register the bidding strategy in the world.bidding_strategies dict."""
                 )
 
+            strategy_class = self.bidding_strategies[strategy]
+            if (
+                shared_strategies is not None
+                and strategy_class.__init__ is BaseStrategy.__init__
+            ):
+                if strategy not in shared_strategies:
+                    shared_strategies[strategy] = strategy_class(
+                        unit_id=unit_id,
+                        **bidding_params,
+                    )
+                strategy_instances[strategy] = shared_strategies[strategy]
+
             if strategy not in strategy_instances:
                 # Create and cache the strategy instance if not already created
-                strategy_instances[strategy] = self.bidding_strategies[strategy](
+                strategy_instances[strategy] = strategy_class(
                     unit_id=unit_id,
                     **bidding_params,
                 )
@@ -671,10 +729,7 @@ class World:
         self.markets[f"{market_config.market_id}"] = market_config
 
     async def _step(self, container):
-        if self.distributed_role:
-            # TODO find better way than sleeping
-            # we need to wait, until the last step is executed correctly
-            await asyncio.sleep(0.04)
+        # in distributed mode, the clock agents acknowledge each step once they are done
         if self.distributed_role is not False:
             next_activity = await self.clock_manager.distribute_time()
         else:
@@ -758,6 +813,60 @@ class World:
         self.unit_operators = {}
         self.forecast_providers = {}
 
+    def reset_episode(self) -> None:
+        """
+        Reset the world for another episode of the same scenario while keeping the units.
+
+        All units are reset in place and kept, so that the next setup adds them to the new
+        unit operators with :meth:`add_episode_units` instead of creating them again.
+        Their forecasts and other inputs are reused by reference. Units of operators
+        in subprocesses cannot be kept and are created again.
+
+        Returns:
+            None
+        """
+        self.episode_units = {}
+        if self.distributed_role is not True:
+            for operator_id, units_operator in self.unit_operators.items():
+                units_operator.reset()
+                self.episode_units[operator_id] = list(units_operator.units.values())
+
+        self.reset()
+
+    def add_episode_units(self) -> None:
+        """
+        Add the units kept by :meth:`reset_episode` to new unit operators.
+
+        The bidding strategies of the units are created again, as they depend on the
+        learning and evaluation mode of the current episode. Without learning mode, the
+        units are added to their configured operators again instead of Operator-RL.
+
+        Returns:
+            None
+        """
+        units_per_operator = defaultdict(list)
+        for operator_id, units in self.episode_units.items():
+            for unit in units:
+                if not self.learning_mode:
+                    operator_id = self.unit_strategy_params[unit.id]["unit_operator"]
+                units_per_operator[operator_id].append(unit)
+
+        shared_strategies = {}
+        for operator_id, units in units_per_operator.items():
+            if operator_id == "Operator-RL" and self.learning_mode:
+                self.add_rl_unit_operator(id=operator_id)
+            else:
+                self.add_unit_operator(id=operator_id)
+
+            for unit in units:
+                unit.unit_operator = operator_id
+                unit.bidding_strategies = self._prepare_bidding_strategies(
+                    self.unit_strategy_params[unit.id], unit.id, shared_strategies
+                )
+                self.unit_operators[operator_id].add_unit(unit)
+
+        self.episode_units = {}
+
     def add_unit(
         self,
         id: str,
@@ -789,3 +898,50 @@ class World:
         )
 
         self.unit_operators[unit_operator_id].add_unit(unit)
+
+    def add_units_bulk(self, units: list[dict]) -> None:
+        """
+        Add many units to the World instance at once.
+
+        The whole batch is validated before any unit is created. Instances of stateless
+        bidding strategies are shared between all units of the batch and the outputs of
+        units with the same index are preallocated in one :class:`OutputBlock`.
+
+        Args:
+            units (list[dict]): The units, each given by the keyword arguments of :meth:`add_unit`.
+        """
+        if not units:
+            return
+
+        invalid_operators = {unit["unit_operator_id"] for unit in units}
+        invalid_operators -= self.unit_operators.keys()
+        if invalid_operators:
+            raise ValueError(f"Invalid unit operator: {sorted(invalid_operators)}")
+
+        invalid_types = {unit["unit_type"] for unit in units} - self.unit_types.keys()
+        if invalid_types:
+            raise ValueError(f"Invalid unit type: {sorted(invalid_types)}")
+
+        added_units = set()
+        for unit in units:
+            key = (unit["unit_operator_id"], unit["id"])
+            if key in added_units or self.unit_operators[key[0]].units.get(key[1]):
+                raise ValueError(f"Unit {unit['id']} already exists")
+            added_units.add(key)
+
+        shared_strategies = {}
+        created_units = [
+            self.create_unit(**unit, shared_strategies=shared_strategies)
+            for unit in units
+        ]
+
+        units_per_index = {}
+        for unit in created_units:
+            units_per_index.setdefault(id(unit.index), []).append(unit)
+        for index_units in units_per_index.values():
+            block = OutputBlock(index_units[0].index, len(index_units))
+            for row, unit in enumerate(index_units):
+                unit.outputs = UnitOutputs(block, row, unit.outputs)
+
+        for unit_dict, unit in zip(units, created_units):
+            self.unit_operators[unit_dict["unit_operator_id"]].add_unit(unit)
@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Compares the throughput of the mango message codecs on typical ASSUME payloads.
+
+Usage:
+    python benchmarks/codec_benchmark.py --orders 1000 --repeat 50
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from assume.common.mango_serializer import mango_codec_factory
+
+
+def create_orderbook(n_orders: int) -> dict:
+    start = datetime(2019, 1, 1)
+    orderbook = [
+        {
+            "start_time": start + timedelta(hours=i % 24),
+            "end_time": start + timedelta(hours=i % 24 + 1),
+            "only_hours": None,
+            "price": float(np.random.uniform(-500, 3000)),
+            "volume": float(np.random.uniform(-1000, 1000)),
+            "node": "node0",
+            "bid_id": f"unit_{i}_1",
+            "unit_id": f"unit_{i}",
+            "agent_addr": ["world", f"Operator {i % 10}"],
+        }
+        for i in range(n_orders)
+    ]
+    return {"context": "submit_bids", "market_id": "EOM", "orderbook": orderbook}
+
+
+def create_dispatch(n_units: int, n_steps: int) -> dict:
+    return {
+        "context": "write_results",
+        "type": "unit_dispatch",
+        "data": {
+            "time": np.arange(n_steps, dtype=np.int64),
+            "power": np.random.rand(n_units, n_steps),
+            "soc": np.random.rand(n_units, n_steps),
+        },
+    }
+
+
+def create_rl_data(n_steps: int, n_units: int, obs_dim: int, act_dim: int) -> dict:
+    return {
+        "context": "rl_training",
+        "type": "save_buffer_and_update",
+        "data": (
+            np.random.rand(n_steps, n_units, obs_dim).astype(np.float32),
+            np.random.rand(n_steps, n_units, act_dim).astype(np.float32),
+            np.random.rand(n_steps, n_units),
+        ),
+    }
+
+
+def benchmark_codec(codec_name: str, payload: dict, repeat: int) -> dict:
+    codec = mango_codec_factory(codec_name)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encoded = codec.encode(payload)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        codec.decode(encoded)
+    decode_time = time.perf_counter() - start
+
+    return {
+        "codec": codec_name,
+        "bytes": len(encoded),
+        "encode_msgs_per_s": repeat / encode_time,
+        "decode_msgs_per_s": repeat / decode_time,
+        "roundtrip_mb_per_s": len(encoded) * repeat / (encode_time + decode_time) / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--units", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--codecs", nargs="+", default=["json", "msgpack"])
+    parser.add_argument("--output", help="optional path of a JSON result file")
+    args = parser.parse_args()
+
+    payloads = {
+        "orderbook": create_orderbook(args.orders),
+        "unit_dispatch": create_dispatch(args.units, args.steps),
+        "rl_data": create_rl_data(args.steps, args.units, obs_dim=38, act_dim=2),
+    }
+
+    results = []
+    for payload_name, payload in payloads.items():
+        for codec_name in args.codecs:
+            result = benchmark_codec(codec_name, payload, args.repeat)
+            result["payload"] = payload_name
+            results.append(result)
+            print(
+                f"{payload_name:>14} {codec_name:>8}: {result['bytes'] / 1e3:10.1f} kB "
+                f"encode {result['encode_msgs_per_s']:10.1f} msg/s "
+                f"decode {result['decode_msgs_per_s']:10.1f} msg/s "
+                f"{result['roundtrip_mb_per_s']:8.1f} MB/s"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
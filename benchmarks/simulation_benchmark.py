@@ -0,0 +1,389 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Throughput benchmark of ASSUME simulations on synthetic CSV scenarios.
+
+Each configuration (number of agents x horizon) runs in its own process, so that the
+peak RSS is measured per configuration. The time of every phase is recorded:
+scenario generation, World init, load_scenario_folder, bidding, clearing, output
+flushing and the whole simulation run. Results are written as JSON and can be
+compared against a stored baseline to flag regressions.
+
+Usage:
+    python benchmarks/simulation_benchmark.py --agents 10 100 1000 --days 7 30 \\
+        --output bench.json --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+PHASES = [
+    "scenario_generation",
+    "world_init",
+    "load_scenario",
+    "bidding",
+    "clearing",
+    "output_flush",
+    "run",
+]
+
+
+def generate_scenario(
+    path: Path,
+    num_agents: int,
+    days: int,
+    time_step: str = "1h",
+    seed: int = 42,
+    scenario: str = "synthetic",
+    study_case: str = "base",
+) -> Path:
+    """
+    Writes a synthetic CSV scenario with the given number of demand agents.
+
+    Demand profiles are drawn from a daily load shape with random scaling and noise,
+    so that no external data download is needed.
+
+    Args:
+        path (Path): The inputs path the scenario folder is created in.
+        num_agents (int): The number of demand units.
+        days (int): The simulated horizon in days.
+        time_step (str, optional): The resolution of the simulation. Defaults to "1h".
+        seed (int, optional): The seed of the random generator. Defaults to 42.
+        scenario (str, optional): The name of the scenario folder. Defaults to "synthetic".
+        study_case (str, optional): The name of the study case. Defaults to "base".
+
+    Returns:
+        Path: The folder of the generated scenario.
+    """
+    rng = np.random.default_rng(seed)
+    scenario_path = path / scenario
+    scenario_path.mkdir(parents=True, exist_ok=True)
+
+    start = datetime(2022, 1, 1)
+    end = start + timedelta(days=days) - pd.Timedelta(time_step)
+    index = pd.date_range(start, end, freq=time_step)
+
+    pd.DataFrame(
+        {
+            "name": ["nuclear", "lignite", "gas", "oil", "wind", "solar"],
+            "technology": ["nuclear", "lignite", "natural gas", "oil", "wind", "solar"],
+            "bidding_EOM": ["naive_eom"] * 6,
+            "fuel_type": ["uranium", "lignite", "natural gas", "oil", "wind", "solar"],
+            "emission_factor": [0.0, 0.4, 0.2, 0.3, 0.0, 0.0],
+            "max_power": [num_agents * 2.0] * 6,
+            "min_power": [0.0] * 6,
+            "efficiency": [0.35, 0.4, 0.55, 0.35, 1.0, 1.0],
+            "additional_cost": [1, 2, 3, 4, 0, 0],
+            "unit_operator": [f"Operator {i + 1}" for i in range(6)],
+        }
+    ).to_csv(scenario_path / "powerplant_units.csv", index=False)
+
+    fuel_prices = pd.DataFrame(
+        {
+            "fuel": ["uranium", "lignite", "natural gas", "oil", "co2"],
+            "price": [5, 3, 30, 40, 25],
+        }
+    )
+    fuel_prices.T.to_csv(scenario_path / "fuel_prices_df.csv", header=False)
+
+    names = [f"demand_{i}" for i in range(num_agents)]
+    pd.DataFrame(
+        {
+            "name": names,
+            "technology": ["inflex_demand"] * num_agents,
+            "bidding_EOM": ["naive_eom"] * num_agents,
+            "max_power": [10.0] * num_agents,
+            "min_power": [0.0] * num_agents,
+            "unit_operator": ["eom_de"] * num_agents,
+            "price": [3000.0] * num_agents,
+        }
+    ).to_csv(scenario_path / "demand_units.csv", index=False)
+
+    hours = index.hour.to_numpy() + index.minute.to_numpy() / 60
+    daily_shape = 0.6 + 0.4 * np.sin((hours - 6) / 24 * 2 * np.pi).clip(min=0)
+    scale = rng.uniform(0.5, 1.5, size=num_agents)
+    noise = rng.normal(1.0, 0.05, size=(len(index), num_agents))
+    demand = daily_shape[:, None] * scale[None, :] * noise
+    pd.DataFrame(demand, index=index, columns=names).to_csv(
+        scenario_path / "demand_df.csv", index_label="datetime"
+    )
+
+    config = {
+        study_case: {
+            "start_date": str(start),
+            "end_date": str(index[-1]),
+            "time_step": time_step,
+            "save_frequency_hours": 24,
+            "markets_config": {
+                "EOM": {
+                    "operator": "EOM_operator",
+                    "product_type": "energy",
+                    "opening_frequency": "24h",
+                    "opening_duration": "1h",
+                    "products": [
+                        {"duration": "1h", "count": 24, "first_delivery": "1h"}
+                    ],
+                    "volume_unit": "MWh",
+                    "price_unit": "EUR/MWh",
+                    "market_mechanism": "pay_as_clear",
+                    "maximum_bid_volume": 1e6,
+                    "maximum_bid_price": 3000,
+                    "minimum_bid_price": -500,
+                }
+            },
+        }
+    }
+    with open(scenario_path / "config.yaml", "w") as file:
+        yaml.dump(config, file, sort_keys=False)
+
+    return scenario_path
+
+
+@contextmanager
+def instrument(cls: type, method_name: str, timings: dict, phase: str):
+    """
+    Temporarily wraps a method of a class to accumulate its run time into a phase.
+
+    Coroutine functions are awaited inside the wrapper, so that the time of the
+    awaited work is measured as well.
+    """
+    original = getattr(cls, method_name)
+
+    if asyncio.iscoroutinefunction(original):
+
+        @functools.wraps(original)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                timings[phase] += time.perf_counter() - start
+
+    else:
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                timings[phase] += time.perf_counter() - start
+
+    setattr(cls, method_name, wrapper)
+    try:
+        yield
+    finally:
+        setattr(cls, method_name, original)
+
+
+def peak_rss_mb() -> float:
+    """Returns the peak resident set size of the current process in MB."""
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+        return max_rss / 1e6 if sys.platform == "darwin" else max_rss / 1e3
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1e6
+    return float("nan")
+
+
+def run_benchmark(num_agents: int, days: int, time_step: str, db_uri: str) -> dict:
+    """
+    Generates, loads and runs one synthetic scenario and times every phase.
+
+    Args:
+        num_agents (int): The number of demand units.
+        days (int): The simulated horizon in days.
+        time_step (str): The resolution of the simulation.
+        db_uri (str): The database the outputs are written to, empty to disable outputs.
+
+    Returns:
+        dict: The timings of all phases in seconds, the peak RSS and the configuration.
+    """
+    from assume.common.outputs import WriteOutput
+    from assume.common.units_operator import UnitsOperator
+    from assume.markets.base_market import MarketRole
+    from assume.scenario.loader_csv import load_scenario_folder
+    from assume.world import World
+
+    timings = defaultdict(float)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs_path = Path(tmp)
+
+        start = time.perf_counter()
+        generate_scenario(inputs_path, num_agents, days, time_step)
+        timings["scenario_generation"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        world = World(database_uri=db_uri, log_level="WARNING")
+        timings["world_init"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load_scenario_folder(
+            world,
+            inputs_path=str(inputs_path),
+            scenario="synthetic",
+            study_case="base",
+        )
+        timings["load_scenario"] = time.perf_counter() - start
+
+        with (
+            instrument(UnitsOperator, "formulate_bids", timings, "bidding"),
+            instrument(MarketRole, "clear_market", timings, "clearing"),
+            instrument(WriteOutput, "store_dfs", timings, "output_flush"),
+        ):
+            start = time.perf_counter()
+            world.run()
+            timings["run"] = time.perf_counter() - start
+
+    steps = len(pd.date_range(world.start, world.end, freq=time_step))
+    return {
+        "agents": num_agents,
+        "days": days,
+        "time_step": time_step,
+        "timings": {phase: timings.get(phase, 0.0) for phase in PHASES},
+        "agent_steps_per_s": num_agents * steps / max(timings["run"], 1e-9),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare_to_baseline(
+    results: list[dict], baseline: list[dict], tolerance: float
+) -> list[str]:
+    """
+    Compares the phase timings and memory against a baseline.
+
+    Args:
+        results (list[dict]): The current benchmark results.
+        baseline (list[dict]): The stored baseline results.
+        tolerance (float): The relative slowdown which is still accepted.
+
+    Returns:
+        list[str]: A description of every regression found.
+    """
+    reference = {(b["agents"], b["days"], b["time_step"]): b for b in baseline}
+    regressions = []
+
+    for result in results:
+        key = (result["agents"], result["days"], result["time_step"])
+        if key not in reference:
+            continue
+        base = reference[key]
+
+        measures = {
+            **{f"{phase} [s]": t for phase, t in result["timings"].items()},
+            "peak_rss [MB]": result["peak_rss_mb"],
+        }
+        base_measures = {
+            **{f"{phase} [s]": t for phase, t in base["timings"].items()},
+            "peak_rss [MB]": base["peak_rss_mb"],
+        }
+        for name, value in measures.items():
+            base_value = base_measures.get(name)
+            # very short phases are dominated by noise
+            if not base_value or base_value < 0.05:
+                continue
+            if value > base_value * (1 + tolerance):
+                regressions.append(
+                    f"agents={key[0]} days={key[1]} {name}: "
+                    f"{value:.3f} > {base_value:.3f} (+{value / base_value - 1:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--agents", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--days", type=int, nargs="+", default=[7])
+    parser.add_argument("--time-step", default="1h")
+    parser.add_argument("--db-uri", default="", help="database for outputs")
+    parser.add_argument("--output", help="path of the JSON result file")
+    parser.add_argument("--baseline", help="JSON result file to compare against")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store the results as new baseline instead of comparing",
+    )
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    # every configuration runs in a fresh process to measure its own peak memory
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for days in args.days:
+        for num_agents in args.agents:
+            with context.Pool(1) as pool:
+                result = pool.apply(
+                    run_benchmark, (num_agents, days, args.time_step, args.db_uri)
+                )
+            results.append(result)
+            phases = " ".join(
+                f"{phase}={t:.2f}s" for phase, t in result["timings"].items()
+            )
+            print(
+                f"agents={num_agents:>6} days={days:>4} {phases} "
+                f"throughput={result['agent_steps_per_s']:.0f} agent-steps/s "
+                f"peak_rss={result['peak_rss_mb']:.0f}MB"
+            )
+
+    report = {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
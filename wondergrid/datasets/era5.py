@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import geopandas as gpd
 import pyproj
+import shapely
 import xarray as xr
 import humanize
 
@@ -13,7 +14,7 @@ from typing import Sequence
 from numpy.typing import NDArray
 from pandas import Timestamp, DataFrame
 from geopandas import GeoDataFrame
-from shapely import Polygon, MultiPolygon, Point
+from shapely import Polygon, MultiPolygon, Point, STRtree
 from pyproj import CRS
 from xarray import Dataset
 
@@ -31,20 +32,72 @@ class ERA5Dataset(Dataset):
     self.points = points
     self.tiles = tiles
     self.proj_crs = CRS.from_user_input(proj_crs)
+    self._tree = None
+
+  @property
+  def tree(self) -> STRtree:
+    # spatial index of the tiles, built once on first use
+    if self._tree is None:
+      self._tree = STRtree(np.asarray(self.tiles.geometry.values, dtype=object))
+    return self._tree
+
+  def get_tile_positions(self, locations) -> NDArray:
+    # positions of the tiles containing the locations, all locations are queried at once
+    locations = np.asarray(locations, dtype=object)
+    location_positions, tile_positions = self.tree.query(locations, predicate='within')
+    # locations on the border of several tiles are assigned to the first one
+    positions = np.full(len(locations), len(self.tiles))
+    np.minimum.at(positions, location_positions, tile_positions)
+    if np.any(positions == len(self.tiles)):
+      raise ValueError(f'{np.sum(positions == len(self.tiles))} locations are outside of the era5 tiles')
+    return positions
+
+  def get_tile_weights(self, shapes) -> tuple[NDArray, NDArray, NDArray]:
+    # sparse area weights of the tiles intersecting the shapes as (shape positions, tile positions, weights)
+    shapes = np.asarray(shapes, dtype=object)
+    shape_positions, tile_positions = self.tree.query(shapes, predicate='intersects')
+    areas = shapely.area(shapely.intersection(self.tree.geometries[tile_positions], shapes[shape_positions]))
+    total_areas = np.bincount(shape_positions, weights=areas, minlength=len(shapes))[shape_positions]
+    weights = np.divide(areas, total_areas, out=np.zeros_like(areas), where=total_areas > 0)
+    return shape_positions, tile_positions, weights
+
+  def _select_tiles(self, tile_positions: NDArray, dim: str) -> xr.Dataset:
+    # lazy pointwise selection of the tiles along a new dimension
+    tiles = self.tiles.index[tile_positions]
+    latitudes = xr.DataArray(tiles.get_level_values(0).to_numpy(), dims=dim)
+    longitudes = xr.DataArray(tiles.get_level_values(1).to_numpy(), dims=dim)
+    return self.data.sel(latitude=latitudes, longitude=longitudes)
 
   def get_weather_for_shape(self, shape: Polygon | MultiPolygon) -> DataFrame:
-    areas = self.tiles.intersection(shape).area
-    areas = areas / areas.sum()
-    weights = xr.DataArray.from_series(areas)
-    weather = self.data.weighted(weights.fillna(0)).sum(dim=('latitude', 'longitude'))
+    weather = self.get_weather_for_shapes([shape]).isel(shape=0, drop=True)
     return weather.to_dataframe()
-  
+
+  def get_weather_for_shapes(self, shapes) -> xr.Dataset:
+    # area weighted weather of many shapes as a lazy dataset with a 'shape' dimension
+    shape_positions, tile_positions, weights = self.get_tile_weights(shapes)
+    tiles, tile_index = np.unique(tile_positions, return_inverse=True)
+    weight_matrix = np.zeros((len(shapes), len(tiles)))
+    weight_matrix[shape_positions, tile_index] = weights
+    weights = xr.DataArray(weight_matrix, dims=('shape', 'tile'))
+    weather = self._select_tiles(tiles, dim='tile').drop_vars(['latitude', 'longitude', 'x', 'y'], errors='ignore')
+    # missing tile values are skipped like in a weighted sum
+    weather = weather.fillna(0).map(xr.dot, args=(weights,))
+    if isinstance(shapes, pd.Series):
+      weather = weather.assign_coords(shape=shapes.index.to_numpy())
+    return weather
+
   def get_weather_for_location(self, location: Point) -> DataFrame:
-    selection = self.tiles.contains(location)
-    lat, lon = self.tiles[selection].index[0]
+    lat, lon = self.tiles.index[self.get_tile_positions([location])[0]]
     weather = self.data.sel(latitude=lat, longitude=lon, drop=True)
     return weather.to_dataframe()
 
+  def get_weather_for_locations(self, locations) -> xr.Dataset:
+    # weather of the tiles containing many locations as a lazy dataset with a 'location' dimension
+    weather = self._select_tiles(self.get_tile_positions(locations), dim='location')
+    if isinstance(locations, pd.Series):
+      weather = weather.assign_coords(location=locations.index.to_numpy())
+    return weather
+
 
 
 class ERA5DatasetBuilder(DatasetBuilder):
@@ -1,14 +1,19 @@
 import datetime
+import itertools
+import os
+import time
 import numpy as np
 import pandas as pd
 import geopandas as gpd
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import pvlib
+import scipy.optimize
 import dotenv
 
 dotenv.load_dotenv()
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pandas import DataFrame, Series, DatetimeIndex, Period
 
 from wondergrid.datasets.era5 import ERA5Dataset, ERA5DatasetBuilder
@@ -136,6 +141,28 @@ class SimplePVSystemModel(PVSystemModel):
 
         return pv_power_simulated
 
+    def simulate_pv_power_candidates(self, timeline: DatetimeIndex, efficiency_size, surface_azimuth, surface_tilt, irradiance=None) -> np.ndarray:
+        # simulates the pv power of many parameter candidates at once as a (candidates x time) array
+        # the solar position and irradiance can be passed in to reuse them between calls
+        if irradiance is None:
+            irradiance = self.irradiancemodel.simulate_irradiance(timeline)
+        solarposition, irradiance = irradiance
+
+        poa_irradiance = pvlib.irradiance.get_total_irradiance(
+            surface_tilt=np.asarray(surface_tilt, dtype=float)[:, np.newaxis],
+            surface_azimuth=np.asarray(surface_azimuth, dtype=float)[:, np.newaxis],
+            solar_zenith=solarposition['apparent_zenith'].to_numpy(dtype=float),
+            solar_azimuth=solarposition['azimuth'].to_numpy(dtype=float),
+            dni=irradiance['dni'].to_numpy(dtype=float),
+            ghi=irradiance['ghi'].to_numpy(dtype=float),
+            dhi=irradiance['dhi'].to_numpy(dtype=float),
+            model='isotropic'
+        )
+
+        pv_power_simulated = np.asarray(poa_irradiance['poa_global']) * np.asarray(efficiency_size, dtype=float)[:, np.newaxis]
+
+        return pv_power_simulated
+
 
 class SimplePVSystemModelWithTemperature(SimplePVSystemModel):
 
@@ -165,68 +192,153 @@ class SimplePVSystemModelWithTemperature(SimplePVSystemModel):
         pv_power_simulated = super().simulate_pv_power(timeline) * temp_factor
         return pv_power_simulated
 
+    def simulate_pv_power_candidates(self, timeline: DatetimeIndex, efficiency_size, surface_azimuth, surface_tilt, irradiance=None) -> np.ndarray:
+        temperature = self.weathermodel.simulate_temperature(timeline).to_numpy(dtype=float)
+        temp_factor = (1.0 + self.temp_coefficient * (self.temp_baseline - temperature))
+        pv_power_simulated = super().simulate_pv_power_candidates(timeline, efficiency_size, surface_azimuth, surface_tilt, irradiance) * temp_factor
+        return pv_power_simulated
+
+    def simulate_pv_power_temp_coefficients(self, timeline: DatetimeIndex, temp_coefficient) -> np.ndarray:
+        # simulates the pv power for many temperature coefficients at once as a (candidates x time) array
+        temperature = self.weathermodel.simulate_temperature(timeline).to_numpy(dtype=float)
+        temp_factor = (1.0 + np.asarray(temp_coefficient, dtype=float)[:, np.newaxis] * (self.temp_baseline - temperature))
+        pv_power_simulated = SimplePVSystemModel.simulate_pv_power(self, timeline).to_numpy(dtype=float) * temp_factor
+        return pv_power_simulated
+
+
+def evaluate_pv_candidates(pv_power_simulated: np.ndarray, feedin: Series, lower_tolerance: float = 0.1, upper_tolerance: float = 0.1):
+    # returns the rmse and validity of every row of a (candidates x time) array of simulated pv power
+    feedin_power_measured = feedin.to_numpy(dtype=float)
+
+    error = np.sqrt(np.nanmean(np.square(feedin_power_measured - pv_power_simulated), axis=1))
+
+    # daily maximum of each candidate, the days start at the first timestamp as with resample('24h', origin='start')
+    day = np.asarray((feedin.index - feedin.index[0]) // pd.Timedelta('24h'))
+    new_day = np.concatenate(([True], day[1:] != day[:-1]))
+    pv_power_simulated_max = np.fmax.reduceat(pv_power_simulated, np.flatnonzero(new_day), axis=1)[:, np.cumsum(new_day) - 1]
+
+    check_lower_threshold = (pv_power_simulated < lower_tolerance * pv_power_simulated_max)
+    check_upper_threshold = (pv_power_simulated + upper_tolerance * pv_power_simulated_max > feedin_power_measured)
+
+    valid = np.all(check_lower_threshold | check_upper_threshold, axis=1)
+
+    return error, valid
+
 
-def fit_pv_parameters_main(pvmodel: SimplePVSystemModel, profile: DataFrame, verbose: bool = False):
+def fit_pv_parameters_main(pvmodel: SimplePVSystemModel, profile: DataFrame, verbose: bool = False, refine: bool = False):
     results = []
 
     lower_tolerance = 0.1
     upper_tolerance = 0.1
 
-    pv_power_simulated_base = pvmodel.simulate_pv_power(profile.index).max()
+    # the solar position and irradiance do not depend on the parameters and are only simulated once
+    irradiance = pvmodel.irradiancemodel.simulate_irradiance(profile.index)
+
+    pv_power_simulated_base = np.nanmax(pvmodel.simulate_pv_power_candidates(profile.index, [pvmodel.efficiency_size], [pvmodel.surface_azimuth], [pvmodel.surface_tilt], irradiance))
     feedin_power_measured_max = profile['feedin'].max()
     efficiency_range = feedin_power_measured_max / pv_power_simulated_base * 3
 
-    for efficiency_size in np.linspace(0, efficiency_range, 5):
-        for surface_azimuth in np.linspace(0, 360, 7):
-            for surface_tilt in np.linspace(0, 90, 7):
+    efficiency_sizes = np.linspace(0, efficiency_range, 5)
+    orientations = list(itertools.product(np.linspace(0, 360, 7), np.linspace(0, 90, 7)))
+    surface_azimuths, surface_tilts = np.array(orientations).T
 
-                pvmodel.efficiency_size = efficiency_size
-                pvmodel.surface_azimuth = surface_azimuth
-                pvmodel.surface_tilt = surface_tilt
-                
-                pv_power_simulated = pvmodel.simulate_pv_power(profile.index)
+    # the pv power is proportional to the efficiency size, so the irradiance is only simulated per orientation
+    pv_power_simulated_orientations = pvmodel.simulate_pv_power_candidates(profile.index, np.ones(len(orientations)), surface_azimuths, surface_tilts, irradiance)
+    pv_power_simulated_candidates = (efficiency_sizes[:, np.newaxis, np.newaxis] * pv_power_simulated_orientations).reshape(-1, len(profile.index))
 
-                error = np.sqrt(np.square(np.subtract(profile['feedin'], pv_power_simulated)).mean())
+    errors, valids = evaluate_pv_candidates(pv_power_simulated_candidates, profile['feedin'], lower_tolerance, upper_tolerance)
 
-                pv_power_simulated_max = pv_power_simulated.resample('24h', origin='start').transform('max')
+    for i, (efficiency_size, (surface_azimuth, surface_tilt)) in enumerate(itertools.product(efficiency_sizes, orientations)):
 
-                check_lower_threshold = (pv_power_simulated < lower_tolerance * pv_power_simulated_max)
-                check_upper_threshold = (pv_power_simulated + upper_tolerance * pv_power_simulated_max > profile['feedin'])
+        pvmodel.efficiency_size = efficiency_size
+        pvmodel.surface_azimuth = surface_azimuth
+        pvmodel.surface_tilt = surface_tilt
 
-                valid = np.all(check_lower_threshold | check_upper_threshold)
+        pv_power_simulated = Series(pv_power_simulated_candidates[i], index=profile.index)
+        error = errors[i]
+        valid = valids[i]
 
-                results.append((pvmodel.params.copy(), pv_power_simulated, error, valid))
+        results.append((pvmodel.params.copy(), pv_power_simulated, error, valid))
 
-                if verbose:
-                    print(f"eval_main:\tk={efficiency_size:.2%}\tazimuth={surface_azimuth}°\ttilt={surface_tilt}°\tpv_power_simulated={pv_power_simulated.mean():.2f}W\tfeedin_power_measured={profile['feedin'].mean():.2f}W\terror={error:.2f}W\tvalid={valid}")
+        if verbose:
+            print(f"eval_main:\tk={efficiency_size:.2%}\tazimuth={surface_azimuth}°\ttilt={surface_tilt}°\tpv_power_simulated={pv_power_simulated.mean():.2f}W\tfeedin_power_measured={profile['feedin'].mean():.2f}W\terror={error:.2f}W\tvalid={valid}")
 
     best_valid_result = min(filter(lambda result: result[3], results), key=lambda result: result[2], default=None)
 
+    if refine and best_valid_result:
+        step = (efficiency_range / 8, 30.0, 7.5)
+        best_valid_result = refine_pv_parameters_main(pvmodel, profile, best_valid_result, step, irradiance, lower_tolerance, upper_tolerance, verbose)
+        results.append(best_valid_result)
+
     return results, best_valid_result
 
 
+def refine_pv_parameters_main(pvmodel: SimplePVSystemModel, profile: DataFrame, result, step, irradiance=None, lower_tolerance: float = 0.1, upper_tolerance: float = 0.1, verbose: bool = False):
+    # continues the grid search with a local optimisation of (efficiency_size, surface_azimuth, surface_tilt)
+    # starting from a valid result, invalid parameters are rejected by an infinite error
+    if irradiance is None:
+        irradiance = pvmodel.irradiancemodel.simulate_irradiance(profile.index)
+
+    params, _, _, _ = result
+
+    def evaluate(x):
+        efficiency_size, surface_azimuth, surface_tilt = x
+        pv_power_simulated = pvmodel.simulate_pv_power_candidates(profile.index, [efficiency_size], [surface_azimuth % 360], [surface_tilt], irradiance)
+        error, valid = evaluate_pv_candidates(pv_power_simulated, profile['feedin'], lower_tolerance, upper_tolerance)
+        return pv_power_simulated[0], error[0], valid[0]
+
+    def objective(x):
+        _, error, valid = evaluate(x)
+        return error if valid else np.inf
+
+    x0 = np.array([params['efficiency_size'], params['surface_azimuth'], params['surface_tilt']], dtype=float)
+    upper_bound = np.array([np.inf, np.inf, 90.0])
+    # the initial simplex spans one step per parameter, pointing away from the upper bound
+    step = np.where(x0 + np.asarray(step, dtype=float) > upper_bound, -np.asarray(step, dtype=float), step)
+    initial_simplex = np.vstack([x0, x0 + np.diag(step)])
+
+    solution = scipy.optimize.minimize(objective, x0, method='Nelder-Mead', bounds=[(0, None), (None, None), (0, 90)], options={'initial_simplex': initial_simplex})
+
+    pv_power_simulated, error, valid = evaluate(solution.x)
+
+    if not valid or error > result[2]:
+        return result
+
+    efficiency_size, surface_azimuth, surface_tilt = solution.x
+
+    pvmodel.efficiency_size = efficiency_size
+    pvmodel.surface_azimuth = surface_azimuth % 360
+    pvmodel.surface_tilt = surface_tilt
+
+    pv_power_simulated = Series(pv_power_simulated, index=profile.index)
+
+    if verbose:
+        print(f"refine_main:\tk={efficiency_size:.2%}\tazimuth={surface_azimuth % 360:.1f}°\ttilt={surface_tilt:.1f}°\tpv_power_simulated={pv_power_simulated.mean():.2f}W\tfeedin_power_measured={profile['feedin'].mean():.2f}W\terror={error:.2f}W\tvalid={valid}")
+
+    return (pvmodel.params.copy(), pv_power_simulated, error, valid)
+
+
 def fit_pv_parameters_temperature(pvmodel: SimplePVSystemModelWithTemperature, profile: DataFrame, verbose: bool = False):
     results = []
 
     lower_tolerance = 0.1
     upper_tolerance = 0.1
 
-    for temp_coefficient in np.arange(0.003, 0.007, 0.0001):
+    temp_coefficients = np.arange(0.003, 0.007, 0.0001)
 
-        pvmodel.temp_coefficient = temp_coefficient
+    pv_power_simulated_candidates = pvmodel.simulate_pv_power_temp_coefficients(profile.index, temp_coefficients)
 
-        pv_power_simulated = pvmodel.simulate_pv_power(profile.index)
+    errors, valids = evaluate_pv_candidates(pv_power_simulated_candidates, profile['feedin'], lower_tolerance, upper_tolerance)
 
-        error = np.sqrt(np.square(np.subtract(profile['feedin'], pv_power_simulated)).mean())
+    for i, temp_coefficient in enumerate(temp_coefficients):
 
-        pv_power_simulated_max = pv_power_simulated.resample('24h', origin='start').transform('max')
-
-        check_lower_threshold = (pv_power_simulated < lower_tolerance * pv_power_simulated_max)
-        check_upper_threshold = (pv_power_simulated + upper_tolerance * pv_power_simulated_max > profile['feedin'])
+        pvmodel.temp_coefficient = temp_coefficient
 
-        valid = np.all(check_lower_threshold | check_upper_threshold)
+        pv_power_simulated = Series(pv_power_simulated_candidates[i], index=profile.index)
+        error = errors[i]
+        valid = valids[i]
 
-        results.append((pvmodel.params, pv_power_simulated, error, valid))
+        results.append((pvmodel.params.copy(), pv_power_simulated, error, valid))
 
         if verbose:
             print(f"eval_temp:\ttemp_baseline={pvmodel.params['temp_baseline']:.2f}°C\ttemp_coefficient={pvmodel.params['temp_coefficient']:.2%}\tpv_power_simulated={pv_power_simulated.mean():.2f}W\tfeedin_power_measured={profile['feedin'].mean():.2f}W\terror={error:.2f}W\tvalid={valid}")
@@ -414,3 +526,125 @@ def estimate_pv_production(smartmeterdataset: SmartMeterDataset, era5dataset: ER
                 print(f'result_temp:\tnone')
     
         break
+
+
+def estimate_pv_parameters(profile: DataFrame, metadata: dict, era5data: DataFrame, use_temperature_optimization: bool = False, refine: bool = False) -> dict:
+    # fits the pv parameters of a single profile without any plotting and returns them with the error metrics
+    profile = profile * 1000 # from kilowatt to watt
+
+    latitude = metadata['latitude']
+    longitude = metadata['longitude']
+
+    cls_irradiancemodel = ClearSkyIrradianceModel(latitude, longitude)
+    cls_pvmodel = SimplePVSystemModel(latitude, longitude, cls_irradiancemodel)
+
+    _, best_valid_result = fit_pv_parameters_main(cls_pvmodel, profile, refine=refine)
+
+    row = {'latitude': latitude, 'longitude': longitude, 'valid': best_valid_result is not None}
+
+    if not best_valid_result:
+        return row
+
+    params, pv_power_simulated, error, valid = best_valid_result
+
+    era5_irradiancemodel = ERA5IrradianceModel(latitude, longitude, era5data)
+    era5_pvmodel = SimplePVSystemModel(latitude, longitude, era5_irradiancemodel, **params)
+    pv_power_simulated_era5 = era5_pvmodel.simulate_pv_power(profile.index)
+
+    row.update(params)
+    row['error_feedin'] = error
+    row['error_production'] = np.sqrt(np.square(np.subtract(profile['production'], pv_power_simulated)).mean())
+    row['error_production_era5'] = np.sqrt(np.square(np.subtract(profile['production'], pv_power_simulated_era5)).mean())
+
+    if use_temperature_optimization:
+
+        weathermodel = ERA5WeatherModel(era5data)
+
+        pv_power_simulated_max = pv_power_simulated.groupby(pv_power_simulated.index.date).transform('max')
+        closest_point_in_time = (pv_power_simulated_max - profile['feedin']).abs().idxmin()
+        temp_baseline = weathermodel.simulate_temperature(closest_point_in_time)
+
+        pvmodel_with_temp = SimplePVSystemModelWithTemperature(latitude, longitude, cls_irradiancemodel, weathermodel, **params, temp_baseline=temp_baseline)
+
+        _, best_valid_result_temp = fit_pv_parameters_temperature(pvmodel_with_temp, profile)
+
+        if best_valid_result_temp:
+            params_temp, _, error_temp, _ = best_valid_result_temp
+            row['temp_coefficient'] = params_temp['temp_coefficient']
+            row['temp_baseline'] = params_temp['temp_baseline']
+            row['error_feedin_temp'] = error_temp
+
+    return row
+
+
+def _estimate_pv_parameters_for_tile(tile, era5data: DataFrame, profiles: list, use_temperature_optimization: bool, refine: bool) -> list[dict]:
+    rows = []
+    for (id, profile, metadata) in profiles:
+        row = estimate_pv_parameters(profile, metadata, era5data, use_temperature_optimization, refine)
+        row['id'] = id
+        row['tile_latitude'], row['tile_longitude'] = tile
+        rows.append(row)
+    return rows
+
+
+def group_profiles_by_era5_tile(smartmeterdataset: SmartMeterDataset, era5dataset: ERA5Dataset) -> dict:
+    # assigns every profile to the era5 tile containing its location with a single spatial index query
+    ids = smartmeterdataset.locations.index.to_numpy()
+    tile_positions = era5dataset.get_tile_positions(smartmeterdataset.locations['location'].values)
+
+    groups = {}
+    for id, tile_position in zip(ids, tile_positions):
+        tile = era5dataset.tiles.index[tile_position]
+        groups.setdefault(tile, []).append(id)
+
+    return groups
+
+
+def estimate_pv_production_batch(smartmeterdataset: SmartMeterDataset, era5dataset: ERA5Dataset, use_temperature_optimization: bool = False, refine: bool = False, max_workers: int = None, chunk_size: int = 16, output_path: str = None, verbose: bool = True) -> DataFrame:
+    # estimates the pv parameters of all profiles of a dataset
+    # the weather is extracted once per era5 tile and shared by all profiles within it
+    # the fits are spread over a process pool in chunks of profiles of the same tile
+    start = time.perf_counter()
+
+    groups = group_profiles_by_era5_tile(smartmeterdataset, era5dataset)
+    n_profiles = sum(len(ids) for ids in groups.values())
+
+    if verbose:
+        print(f'estimating pv parameters of {n_profiles} profiles in {len(groups)} era5 tiles ...')
+
+    rows = []
+    n_done = 0
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = []
+        for tile, ids in groups.items():
+            latitude, longitude = tile
+            era5data = era5dataset.data.sel(latitude=latitude, longitude=longitude, drop=True).to_dataframe()
+            for i in range(0, len(ids), chunk_size):
+                profiles = [smartmeterdataset.get_profile(id) for id in ids[i:i + chunk_size]]
+                futures.append(executor.submit(_estimate_pv_parameters_for_tile, tile, era5data, profiles, use_temperature_optimization, refine))
+
+        for future in as_completed(futures):
+            result = future.result()
+            rows.extend(result)
+            n_done += len(result)
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f'estimated {n_done}/{n_profiles} profiles ({n_done / elapsed:.2f} profiles/s)')
+
+    elapsed = time.perf_counter() - start
+
+    results = DataFrame(rows)
+    if not results.empty:
+        results = results.set_index('id').sort_index()
+    results.attrs['profiles_per_second'] = n_profiles / elapsed if elapsed > 0 else float('nan')
+
+    if verbose:
+        print(f'estimated {n_profiles} profiles in {elapsed:.1f}s ({results.attrs["profiles_per_second"]:.2f} profiles/s)')
+
+    if output_path:
+        results.to_csv(output_path)
+        if verbose:
+            print(f'saved estimated pv parameters to {output_path}')
+
+    return results